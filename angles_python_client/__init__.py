@@ -5,8 +5,15 @@ Public API mirrors `angles-javascript-client`:
 - A singleton reporter (`angles_reporter`) similar to the JS default export.
 - Request classes: BuildRequests, TeamRequests, EnvironmentRequests, ScreenshotRequests,
   ExecutionRequests, BaselineRequests, MetricRequests, AnglesRequests.
+- ``ContextLocalReporter`` / ``AsyncContextLocalReporter`` for tests running concurrently on
+  threads or asyncio tasks of one process.
+- asyncio counterparts: AsyncAnglesHttpClient, AsyncAnglesReporter and the ``Async*Requests``
+  classes in ``angles_python_client.async_requests``.
 """
 
+from .async_http import AsyncAnglesHttpClient
+from .async_reporter import AsyncAnglesReporter
+from .context_reporter import AsyncContextLocalReporter, ContextLocalReporter
 from .http import AnglesHttpClient
 from .reporter import AnglesReporter, angles_reporter
 from .requests import (
@@ -23,6 +30,10 @@ from .requests import (
 __all__ = [
     "AnglesHttpClient",
     "AnglesReporter",
+    "AsyncAnglesHttpClient",
+    "AsyncAnglesReporter",
+    "AsyncContextLocalReporter",
+    "ContextLocalReporter",
     "angles_reporter",
     "BuildRequests",
     "TeamRequests",
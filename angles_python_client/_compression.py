@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Any, Iterable, Iterator, Mapping, Optional, Tuple
+
+try:  # optional: zstd request bodies
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - depends on environment
+    _zstd = None
+
+IDENTITY = "identity"
+
+
+def available_codecs() -> Tuple[str, ...]:
+    return ("gzip", "zstd") if _zstd is not None else ("gzip",)
+
+
+def _check(codec: str) -> None:
+    if codec == "zstd" and _zstd is None:
+        raise ImportError("zstd compression requires zstandard: pip install zstandard")
+    if codec not in ("gzip", "zstd"):
+        raise ValueError(f"Unsupported compression codec: {codec!r}")
+
+
+def compress(data: bytes, codec: str = "gzip", *, level: int = 6) -> bytes:
+    _check(codec)
+    if codec == "zstd":
+        return _zstd.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks: Iterable[bytes], codec: str = "gzip", *, level: int = 6) -> Iterator[bytes]:
+    """Compress an iterable of byte chunks incrementally."""
+    _check(codec)
+    if codec == "zstd":
+        compressor: Any = _zstd.ZstdCompressor(level=level).compressobj()
+        finish = compressor.flush
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+        finish = compressor.flush
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield finish()
+
+
+def choose_codec(path_or_url: str, default: Optional[str], endpoints: Optional[Mapping[str, Optional[str]]]) -> Optional[str]:
+    """Pick the request codec for ``path_or_url``.
+
+    ``endpoints`` maps path prefixes (relative to the API base, e.g. ``"execution"``) to a codec,
+    or to ``None``/``"identity"`` to disable compression; the longest matching prefix wins.
+    """
+    codec = default
+    if endpoints:
+        path = path_or_url.lstrip("/")
+        best = -1
+        for prefix, value in endpoints.items():
+            prefix = prefix.lstrip("/")
+            if path.startswith(prefix) and len(prefix) > best:
+                best, codec = len(prefix), value
+    return None if codec in (None, IDENTITY) else codec
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from .results import ItemResult
+
+
+def bounded_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    *,
+    max_workers: int = 8,
+    thread_name_prefix: str = "angles",
+) -> Iterator[ItemResult]:
+    """Run ``fn`` over ``items`` on a thread pool, yielding results as they complete.
+
+    ``items`` is consumed lazily with at most ``max_workers`` calls in flight, so arbitrarily long
+    iterables never materialise in memory. Exceptions are captured per item, never raised.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    it = iter(enumerate(items))
+    in_flight: Dict[Future, Tuple[int, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix) as pool:
+
+        def _fill() -> None:
+            while len(in_flight) < max_workers:
+                try:
+                    index, item = next(it)
+                except StopIteration:
+                    return
+                in_flight[pool.submit(fn, item)] = (index, item)
+
+        _fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                index, item = in_flight.pop(fut)
+                error = fut.exception()
+                yield ItemResult(index=index, item=item, result=None if error else fut.result(), error=error)
+            _fill()
+
+
+def ordered_map(fn: Callable[[Any], Any], items: Iterable[Any], *, max_workers: int = 8) -> List[ItemResult]:
+    """Like :func:`bounded_map` but returns every result, in input order."""
+    results = list(bounded_map(fn, items, max_workers=max_workers))
+    results.sort(key=lambda r: r.index)
+    return results
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    if size < 1:
+        raise ValueError("size must be >= 1")
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def chunk_by_length(items: Iterable[Any], budget: int, length: Callable[[Any], int], max_items: int = 0) -> Iterator[List[Any]]:
+    """Split ``items`` into runs whose summed ``length`` stays within ``budget``.
+
+    An item longer than ``budget`` on its own still gets a chunk of its own. ``max_items`` > 0
+    also caps the number of items per chunk.
+    """
+    batch: List[Any] = []
+    used = 0
+    for item in items:
+        size = length(item)
+        if batch and (used + size > budget or (max_items and len(batch) >= max_items)):
+            yield batch
+            batch, used = [], 0
+        batch.append(item)
+        used += size
+    if batch:
+        yield batch
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+import uuid
+from typing import Any, BinaryIO, Dict, List, Optional
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+class MultipartFileEncoder:
+    """Streaming ``multipart/form-data`` body with plain fields followed by one file part.
+
+    Behaves as a read-only file object with a known length, so ``requests`` sends it with a
+    ``Content-Length`` header while reading the file ``chunk_size`` bytes at a time instead of
+    buffering the whole upload in memory.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Any],
+        file_field: str,
+        file_path: str,
+        *,
+        file_name: Optional[str] = None,
+        file_content_type: Optional[str] = None,
+        boundary: Optional[str] = None,
+    ) -> None:
+        self.file_path = file_path
+        self.boundary = boundary or uuid.uuid4().hex
+        file_name = file_name or os.path.basename(file_path)
+        file_content_type = file_content_type or mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+        head = bytearray()
+        for name, value in fields.items():
+            head += (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{_quote(str(name))}"\r\n\r\n'
+            ).encode("utf-8")
+            head += str(value).encode("utf-8") + b"\r\n"
+        head += (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(file_field)}"; filename="{_quote(file_name)}"\r\n'
+            f"Content-Type: {file_content_type}\r\n\r\n"
+        ).encode("utf-8")
+
+        self._head = bytes(head)
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        self._file_size = os.path.getsize(file_path)
+        self._length = len(self._head) + self._file_size + len(self._tail)
+        self._file: Optional[BinaryIO] = None
+        self._pos = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Only rewinding to the start is supported (used when a request is retried)."""
+        if offset != 0 or whence != os.SEEK_SET:
+            raise OSError("MultipartFileEncoder can only seek to 0")
+        self._pos = 0
+        if self._file is not None:
+            self._file.seek(0)
+        return 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length - self._pos
+        parts: List[bytes] = []
+        while size > 0 and self._pos < self._length:
+            chunk = self._read_section(size)
+            parts.append(chunk)
+            size -= len(chunk)
+            self._pos += len(chunk)
+        return b"".join(parts)
+
+    def _read_section(self, size: int) -> bytes:
+        head_len = len(self._head)
+        body_end = head_len + self._file_size
+        if self._pos < head_len:
+            return self._head[self._pos:self._pos + size]
+        if self._pos < body_end:
+            if self._file is None:
+                self._file = open(self.file_path, "rb")
+            chunk = self._file.read(min(size, body_end - self._pos))
+            if not chunk:
+                raise OSError(f"{self.file_path} shrank while being uploaded")
+            return chunk
+        offset = self._pos - body_end
+        return self._tail[offset:offset + size]
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "MultipartFileEncoder":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .lazy_models import unwrap
+
+# keys under which the Angles API returns the items of a paged response
+_ITEM_KEYS = ("builds", "executions", "items")
+
+
+class PageSizer:
+    """Adapts ``limit`` so each page takes roughly ``target_latency_s`` to fetch.
+
+    Fast pages double the size (up to ``max_size``), slow pages halve it (down to ``min_size``).
+    If the server returns fewer items than asked for while reporting more to come, its cap is
+    adopted as the new maximum.
+    """
+
+    def __init__(self, initial: int = 50, *, min_size: int = 10, max_size: int = 1000, target_latency_s: float = 0.5) -> None:
+        if not 1 <= min_size <= initial <= max_size:
+            raise ValueError("expected 1 <= min_size <= initial <= max_size")
+        self.size = initial
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency_s = target_latency_s
+
+    def observe(self, latency_s: float, requested: int, received: int, more: bool) -> None:
+        if more and 0 < received < requested:
+            self.max_size = max(self.min_size, received)
+        if latency_s < self.target_latency_s / 2:
+            self.size = min(self.max_size, self.size * 2)
+        elif latency_s > self.target_latency_s:
+            self.size = max(self.min_size, self.size // 2)
+        self.size = min(self.size, self.max_size)
+
+
+def page_items(response: Any) -> Tuple[List[Any], Optional[int]]:
+    """Return ``(items, total count or None)`` for a paged response."""
+    response = unwrap(response)
+    if isinstance(response, list):
+        return response, None
+    if isinstance(response, dict):
+        count = response.get("count")
+        for key in _ITEM_KEYS:
+            if isinstance(response.get(key), list):
+                return response[key], count if isinstance(count, int) else None
+    return [], None
+
+
+def merge_pages(responses: Iterable[Any]) -> Any:
+    """Combine the responses to consecutive chunks of one query into a single response.
+
+    Lists are concatenated; for ``{"count", "builds"}``-style dicts the item lists are joined
+    and the counts summed.
+    """
+    merged: Any = None
+    for response in responses:
+        if merged is None:
+            merged = list(response) if isinstance(response, list) else dict(response) if isinstance(response, dict) else response
+            continue
+        items, count = page_items(response)
+        if isinstance(merged, list):
+            merged.extend(items)
+        elif isinstance(merged, dict):
+            key = next((k for k in _ITEM_KEYS if isinstance(merged.get(k), list)), None)
+            if key is not None:
+                merged[key] = merged[key] + items
+            if isinstance(merged.get("count"), int) and count is not None:
+                merged["count"] += count
+    return merged
+
+
+def _has_more(skip: int, requested: int, items: List[Any], count: Optional[int]) -> bool:
+    if not items:
+        return False
+    if count is not None:
+        return skip < count
+    return len(items) >= requested
+
+
+def _timed(fetch: Callable[[int, int], Any], skip: int, limit: int) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    response = fetch(skip, limit)
+    return response, time.perf_counter() - started
+
+
+def iter_pages(fetch: Callable[[int, int], Any], *, skip: int = 0, sizer: Optional[PageSizer] = None, prefetch: bool = True) -> Iterator[Any]:
+    """Yield every item of a ``skip``/``limit`` paged endpoint; ``fetch(skip, limit)`` returns one page.
+
+    With ``prefetch`` the next page is requested on a background thread while the caller consumes
+    the current one, so at most two pages are held in memory.
+    """
+    sizer = sizer or PageSizer()
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="angles-page") if prefetch else None
+    try:
+        limit = sizer.size
+        pending = pool.submit(_timed, fetch, skip, limit) if pool else None
+        while True:
+            response, latency = pending.result() if pending else _timed(fetch, skip, limit)
+            items, count = page_items(response)
+            skip += len(items)
+            more = _has_more(skip, limit, items, count)
+            sizer.observe(latency, limit, len(items), more)
+            if more:
+                limit = sizer.size
+                pending = pool.submit(_timed, fetch, skip, limit) if pool else None
+            yield from items
+            if not more:
+                return
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_pages(fetch: Callable[[int, int], Awaitable[Any]], *, skip: int = 0, sizer: Optional[PageSizer] = None, prefetch: bool = True) -> AsyncIterator[Any]:
+    """Async counterpart of :func:`iter_pages`; ``fetch`` is a coroutine function."""
+    sizer = sizer or PageSizer()
+
+    async def _fetch(skip: int, limit: int) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        response = await fetch(skip, limit)
+        return response, time.perf_counter() - started
+
+    limit = sizer.size
+    pending: Optional[asyncio.Future] = asyncio.ensure_future(_fetch(skip, limit)) if prefetch else None
+    try:
+        while True:
+            response, latency = await pending if pending is not None else await _fetch(skip, limit)
+            pending = None
+            items, count = page_items(response)
+            skip += len(items)
+            more = _has_more(skip, limit, items, count)
+            sizer.observe(latency, limit, len(items), more)
+            if more:
+                limit = sizer.size
+                if prefetch:
+                    pending = asyncio.ensure_future(_fetch(skip, limit))
+            for item in items:
+                yield item
+            if not more:
+                return
+    finally:
+        if pending is not None:
+            pending.cancel()
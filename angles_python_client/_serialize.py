@@ -3,35 +3,214 @@ from __future__ import annotations
 import dataclasses
 import datetime as _dt
 import json
+from concurrent.futures import Future
 from enum import Enum
-from typing import Any, Mapping, Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+try:  # optional fast path
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on environment
+    _orjson = None
+
+_Encoder = Callable[[Any], Any]
+
+_SCALARS = (str, int, float, bool, type(None))
+
+# type -> compiled encoder; filled lazily by _encoder_for
+_ENCODERS: Dict[type, _Encoder] = {t: (lambda obj: obj) for t in _SCALARS}
+
 
 def _is_dataclass_instance(obj: Any) -> bool:
     return dataclasses.is_dataclass(obj) and not isinstance(obj, type)
 
-def jsonable(obj: Any) -> Any:
-    """Convert common python types (dataclasses, datetime, enums) into JSON-serializable values."""
-    if obj is None:
-        return None
-    if isinstance(obj, (str, int, float, bool)):
-        return obj
-    if isinstance(obj, Enum):
-        return obj.value
-    if isinstance(obj, _dt.datetime):
+
+def _encoder_for(cls: type) -> _Encoder:
+    enc = _ENCODERS.get(cls)
+    if enc is None:
+        enc = _ENCODERS[cls] = _compile(cls)
+    return enc
+
+
+def _encode_value(value: Any) -> Any:
+    cls = type(value)
+    if cls in _SCALARS:
+        return value
+    enc = _ENCODERS.get(cls)
+    if enc is None:
+        enc = _encoder_for(cls)
+    return enc(value)
+
+
+def _compile(cls: type) -> _Encoder:
+    # order mirrors the original isinstance chain; Enum before str because of str-valued enums
+    if issubclass(cls, Enum):
+        return lambda obj: obj.value
+    if issubclass(cls, (str, int, float, bool)):
+        return lambda obj: obj
+    if issubclass(cls, (_dt.datetime, _dt.date)):
         # mimic JS Date#toJSON (UTC-ish ISO). Keep tzinfo if present.
-        return obj.isoformat()
-    if isinstance(obj, _dt.date):
-        return obj.isoformat()
-    if _is_dataclass_instance(obj):
-        return {k: jsonable(v) for k, v in dataclasses.asdict(obj).items() if v is not None}
-    if isinstance(obj, Mapping):
-        return {str(k): jsonable(v) for k, v in obj.items() if v is not None}
-    if isinstance(obj, (list, tuple, set)):
-        return [jsonable(v) for v in obj]
+        return lambda obj: obj.isoformat()
+    if issubclass(cls, Future):
+        # pending background upload; resolved by UploadQueue before the payload is sent
+        return lambda obj: obj
+    if dataclasses.is_dataclass(cls):
+        return _compile_dataclass(cls)
+    if issubclass(cls, Mapping):
+        return lambda obj: {str(k): _encode_value(v) for k, v in obj.items() if v is not None}
+    if issubclass(cls, (list, tuple, set)):
+        return lambda obj: [_encode_value(v) for v in obj]
+    if hasattr(cls, "__jsonable__"):
+        return lambda obj: _encode_value(obj.__jsonable__())
+    return _encode_object
+
+
+def _compile_dataclass(cls: type) -> _Encoder:
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    scalars = _SCALARS
+    encoders = _ENCODERS
+
+    def encode(obj: Any) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name in names:
+            value = getattr(obj, name)
+            if value is None:
+                continue
+            vcls = type(value)
+            if vcls in scalars:
+                out[name] = value
+            else:
+                enc = encoders.get(vcls)
+                out[name] = (enc or _encoder_for(vcls))(value)
+        return out
+
+    return encode
+
+
+def _encode_object(obj: Any) -> Any:
     # fall back: objects with __dict__
     if hasattr(obj, "__dict__"):
-        return {k: jsonable(v) for k, v in vars(obj).items() if v is not None}
+        return {k: _encode_value(v) for k, v in vars(obj).items() if v is not None}
     return obj
 
+
+def jsonable(obj: Any) -> Any:
+    """Convert common python types (dataclasses, datetime, enums) into JSON-serializable values.
+
+    ``None`` fields of dataclasses and ``None`` mapping values are dropped. Encoders are compiled
+    once per type and cached, so large ``CreateExecution`` graphs are walked in a single pass.
+    Objects may define ``__jsonable__()`` returning their own representation, which is encoded in turn.
+    """
+    return _encode_value(obj)
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """Encode an already JSON-shaped value (see :func:`jsonable`), using orjson when installed."""
+    if _orjson is not None:
+        return _orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
 def json_dumps(obj: Any) -> str:
-    return json.dumps(jsonable(obj), separators=(",", ":"), ensure_ascii=False)
+    return dumps_bytes(jsonable(obj)).decode("utf-8")
+
+
+def json_bytes(obj: Any) -> bytes:
+    return dumps_bytes(jsonable(obj))
+
+
+_CONTAINERS = (list, tuple, set)
+
+
+def _is_branch(value: Any) -> bool:
+    """Whether ``value`` is worth streaming piecewise rather than encoding in one go."""
+    return (
+        isinstance(value, _CONTAINERS)
+        or hasattr(value, "iter_jsonable")
+        or isinstance(value, Mapping)
+        or _is_dataclass_instance(value)
+    )
+
+
+def _iter_fields(obj: Any) -> Iterator[tuple]:
+    if isinstance(obj, Mapping):
+        for k, v in obj.items():
+            if v is not None:
+                yield str(k), v
+    else:
+        for f in dataclasses.fields(obj):
+            v = getattr(obj, f.name)
+            if v is not None:
+                yield f.name, v
+
+
+def _iter_pieces(obj: Any) -> Iterator[bytes]:
+    if isinstance(obj, _CONTAINERS) or hasattr(obj, "iter_jsonable"):
+        items: Iterable[Any] = obj.iter_jsonable() if hasattr(obj, "iter_jsonable") else obj
+        yield b"["
+        first = True
+        for item in items:
+            if not first:
+                yield b","
+            first = False
+            yield from _iter_pieces(item)
+        yield b"]"
+    elif (isinstance(obj, Mapping) or _is_dataclass_instance(obj)) and any(_is_branch(v) for _, v in _iter_fields(obj)):
+        yield b"{"
+        first = True
+        for name, value in _iter_fields(obj):
+            if not first:
+                yield b","
+            first = False
+            yield dumps_bytes(name)
+            yield b":"
+            yield from _iter_pieces(value)
+        yield b"}"
+    else:
+        # leaf: small enough to encode in one go
+        yield dumps_bytes(jsonable(obj))
+
+
+def iter_json(obj: Any, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield the JSON encoding of ``obj`` as byte chunks of roughly ``chunk_size``.
+
+    Produces the same document as ``json_bytes(obj)`` but walks the model graph lazily, so no
+    intermediate dict or full-size string is built. Lists (and objects exposing
+    ``iter_jsonable()``, such as ``StepLog``) are streamed item by item.
+    """
+    buf: List[bytes] = []
+    size = 0
+    for piece in _iter_pieces(obj):
+        buf.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
+
+
+class JsonStream:
+    """Re-iterable request body streaming ``obj`` as JSON, optionally gzip-compressed.
+
+    ``requests`` sends iterables with ``Transfer-Encoding: chunked``. Each iteration re-encodes
+    from the model, so the body can be resent by a retry policy.
+    """
+
+    rewindable = True
+
+    def __init__(self, obj: Any, *, chunk_size: int = 64 * 1024, compress: Optional[str] = None) -> None:
+        self.obj = obj
+        self.chunk_size = chunk_size
+        self.compress = compress
+
+    @property
+    def content_encoding(self) -> Optional[str]:
+        return self.compress
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks = iter_json(self.obj, self.chunk_size)
+        if self.compress:
+            from ._compression import compress_stream
+
+            chunks = compress_stream(chunks, self.compress)
+        return chunks
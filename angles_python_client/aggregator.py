@@ -0,0 +1,367 @@
+"""Local aggregation daemon: many test processes upload through one client and one connection pool.
+
+An :class:`AggregatorServer` listens on a Unix socket. Reporters switched over with
+``AnglesReporter.enable_aggregator(socket_path)`` (e.g. every pytest-xdist worker) send it their
+builds, executions and screenshots instead of calling Angles themselves:
+
+- ``start_build`` is deduplicated: workers asking for the same name/team/environment/component/
+  phase all get the build created by the first one.
+- executions are acknowledged at once and uploaded in batches through
+  ``ExecutionRequests.save_executions`` (optionally to a bulk endpoint), with request bodies
+  compressed by the aggregator's :class:`~angles_python_client.http.AnglesHttpClient`.
+- screenshots are uploaded on receipt, so the caller gets the real ``_id`` back. Their
+  ``filePath`` must be absolute: the daemon's working directory is not the caller's.
+
+Messages are newline-delimited JSON objects; each request gets exactly one response.
+
+Run standalone with::
+
+    python -m angles_python_client.aggregator /tmp/angles.sock --base-url http://host/rest/api/v1.0/
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ._serialize import dumps_bytes, json_dumps
+from .exceptions import AnglesApiError
+from .http import AnglesHttpClient
+from .requests import BuildRequests, ExecutionRequests, ScreenshotRequests
+
+logger = logging.getLogger(__name__)
+
+# fields identifying "the same build" across workers
+BUILD_KEY_FIELDS = ("name", "team", "environment", "component", "phase")
+
+
+def build_key(build: Dict[str, Any]) -> str:
+    return json_dumps({k: build.get(k) for k in BUILD_KEY_FIELDS})
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = {"ok": True, "result": self.server.aggregator._dispatch(request)}
+            except Exception as e:
+                response = {"ok": False, "error": str(e), "status_code": getattr(e, "status_code", None)}
+            self.wfile.write(dumps_bytes(response) + b"\n")
+            self.wfile.flush()
+
+
+if hasattr(socket, "AF_UNIX"):
+
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        request_queue_size = 256  # every worker of a large xdist run connects at session start
+        aggregator: "AggregatorServer"
+
+
+class AggregatorServer:
+    """Accepts uploads from local reporters and sends them to Angles through one ``http`` client.
+
+    Queued executions are uploaded in batches of ``batch_size``, or ``flush_interval_s`` after
+    the first one arrives; at most ``max_pending`` wait at any time (senders block beyond that).
+    Use as a context manager, or call :meth:`start` and :meth:`stop`.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        http: Optional[AnglesHttpClient] = None,
+        *,
+        base_url: Optional[str] = None,
+        batch_size: int = 50,
+        flush_interval_s: float = 1.0,
+        max_in_flight: int = 8,
+        max_pending: int = 1000,
+        bulk_endpoint: Optional[str] = None,
+    ) -> None:
+        self.socket_path = socket_path
+        self.http = http or AnglesHttpClient(
+            base_url=base_url or AnglesHttpClient.base_url,
+            compression="gzip",
+            pool_maxsize=max(10, max_in_flight),
+        )
+        self.builds = BuildRequests(self.http)
+        self.executions = ExecutionRequests(self.http)
+        self.screenshots = ScreenshotRequests(self.http)
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending
+        self.bulk_endpoint = bulk_endpoint
+        self.uploaded = 0
+        self.failed = 0
+        self.errors: List[BaseException] = []
+        self._cond = threading.Condition()
+        self._pending: List[Any] = []
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._stopping = False
+        self._builds: Dict[str, "Future[Any]"] = {}
+        self._server: Optional[Any] = None
+        self._threads: List[threading.Thread] = []
+
+    # --- lifecycle ---
+    def start(self) -> "AggregatorServer":
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("The Angles aggregator needs Unix domain sockets")
+        _remove_stale_socket(self.socket_path)
+        self._stopping = False
+        server = _UnixServer(self.socket_path, _Handler)
+        server.aggregator = self
+        self._server = server
+        self._threads = [
+            threading.Thread(target=server.serve_forever, name="angles-aggregator", daemon=True),
+            threading.Thread(target=self._run_uploader, name="angles-aggregator-upload", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        """Stop accepting connections, upload everything queued and return the upload counts.
+
+        Executions submitted after this point, e.g. over a connection that is still open, are
+        rejected rather than acknowledged and dropped.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            _unlink(self.socket_path)
+        stats = self.flush(timeout)
+        for thread in self._threads:
+            thread.join(timeout)
+        return stats
+
+    def __enter__(self) -> "AggregatorServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        """Start, block until SIGINT/SIGTERM, then stop (used by the command line)."""
+        stopped = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopped.set())
+        self.start()
+        stopped.wait()
+        self.stop()
+
+    # --- operations ---
+    def start_build(self, build: Dict[str, Any]) -> Any:
+        """Create ``build`` unless a build with the same :func:`build_key` was already created."""
+        key = build.pop("key", None) or build_key(build)
+        with self._cond:
+            future = self._builds.get(key)
+            owner = future is None
+            if owner:
+                future = self._builds[key] = Future()
+        if owner:
+            try:
+                future.set_result(self.builds.create_build(build))
+            except BaseException as e:
+                with self._cond:
+                    del self._builds[key]  # let the next worker retry
+                future.set_exception(e)
+        return future.result()
+
+    def submit_execution(self, payload: Any) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._pending) < self.max_pending or self._stopping)
+            if self._stopping:
+                raise AnglesApiError("Angles aggregator is shutting down", status_code=503)
+            self._pending.append(payload)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def save_screenshot(self, payload: Any) -> Any:
+        if not os.path.isabs(payload.get("filePath") or ""):
+            raise ValueError(f"Screenshot filePath must be absolute, got {payload.get('filePath')!r}")
+        return self.screenshots.save_screenshot(payload)
+
+    def flush(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        """Wait until every queued execution has been uploaded (or failed)."""
+        with self._cond:
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+            finally:
+                self._flush_waiters -= 1
+            return {"uploaded": self.uploaded, "failed": self.failed, "pending": len(self._pending) + self._in_flight}
+
+    def _dispatch(self, request: Dict[str, Any]) -> Any:
+        op = request.get("op")
+        if op == "start_build":
+            return self.start_build(request["build"])
+        if op == "execution":
+            self.submit_execution(request["payload"])
+            return {"_id": None, "queued": True}
+        if op == "screenshot":
+            return self.save_screenshot(request["payload"])
+        if op == "flush":
+            return self.flush(request.get("timeout"))
+        raise ValueError(f"Unknown aggregator operation {op!r}")
+
+    def _run_uploader(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopping or self._flush_waiters > 0 or len(self._pending) >= self.batch_size,
+                    self.flush_interval_s,
+                )
+                batch, self._pending = self._pending, []
+                if not batch:
+                    if self._stopping:
+                        return
+                    continue
+                self._in_flight += len(batch)
+                self._cond.notify_all()
+            uploaded, errors = self._upload(batch)
+            with self._cond:
+                self._in_flight -= len(batch)
+                self.uploaded += uploaded
+                self.failed += len(errors)
+                self.errors.extend(errors[: max(0, 100 - len(self.errors))])
+                self._cond.notify_all()
+
+    def _upload(self, batch: List[Any]) -> Tuple[int, List[BaseException]]:
+        try:
+            results = self.executions.save_executions(
+                batch, batch_size=self.batch_size, max_in_flight=self.max_in_flight, bulk_endpoint=self.bulk_endpoint
+            )
+        except Exception as e:  # never let the uploader thread die
+            logger.warning("Angles aggregator upload failed: %s", e)
+            return 0, [e] * len(batch)
+        errors = [r.error for r in results if r.error is not None]
+        for error in errors[:1]:
+            logger.warning("Angles aggregator could not upload %d execution(s): %s", len(errors), error)
+        return len(results) - len(errors), errors
+
+
+class AggregatorClient:
+    """Connection from one reporter to an :class:`AggregatorServer`. Thread-safe."""
+
+    def __init__(self, socket_path: str, *, timeout_s: float = 120.0) -> None:
+        self.socket_path = socket_path
+        self.timeout_s = timeout_s
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._reader: Optional[Any] = None
+
+    def _call(self, op: str, **fields: Any) -> Any:
+        with self._lock:
+            if self._sock is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self.socket_path)  # blocking: waits for room in the listen backlog
+                sock.settimeout(self.timeout_s)
+                self._sock, self._reader = sock, sock.makefile("rb")
+            try:
+                self._sock.sendall(dumps_bytes({"op": op, **fields}) + b"\n")
+                line = self._reader.readline()  # type: ignore[union-attr]
+            except OSError:
+                self._close()
+                raise
+        if not line:
+            self.close()
+            raise AnglesApiError("Angles aggregator closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise AnglesApiError(f"Angles aggregator: {response['error']}", status_code=response.get("status_code"))
+        return response["result"]
+
+    def start_build(self, build: Dict[str, Any]) -> Any:
+        return self._call("start_build", build=build)
+
+    def save_execution(self, payload: Any) -> Any:
+        return self._call("execution", payload=payload)
+
+    def save_screenshot(self, payload: Any) -> Any:
+        return self._call("screenshot", payload=payload)
+
+    def flush(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        return self._call("flush", timeout=timeout)
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            self._reader.close()  # type: ignore[union-attr]
+            self._sock.close()
+            self._sock = self._reader = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _remove_stale_socket(path: str) -> None:
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        _unlink(path)  # left behind by a dead aggregator
+        return
+    finally:
+        probe.close()
+    raise OSError(f"An Angles aggregator is already listening on {path}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="angles-aggregator", description="Upload Angles results from many local processes through one client.")
+    parser.add_argument("socket_path")
+    parser.add_argument("--base-url", default=AnglesHttpClient.base_url)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--bulk-endpoint")
+    parser.add_argument("--compression", default="gzip", help='request body codec, or "none"')
+    args = parser.parse_args(argv)
+
+    http = AnglesHttpClient(
+        base_url=args.base_url,
+        compression=None if args.compression == "none" else args.compression,
+        pool_maxsize=max(10, args.max_in_flight),
+    )
+    server = AggregatorServer(
+        args.socket_path,
+        http,
+        batch_size=args.batch_size,
+        flush_interval_s=args.flush_interval,
+        max_in_flight=args.max_in_flight,
+        bulk_endpoint=args.bulk_endpoint,
+    )
+    server.serve_forever()
+    print(json.dumps({"uploaded": server.uploaded, "failed": server.failed}))
+    return 1 if server.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
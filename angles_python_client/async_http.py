@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, Set
+from urllib.parse import urljoin
+
+import requests
+
+from ._serialize import dumps_bytes
+from .cache import ResponseCache
+from .image_cache import ImageCache
+from .exceptions import AnglesApiError
+from .http import AnglesHttpClient, _is_connect_failure
+from .retry import CircuitBreaker, RetryPolicy, is_rewindable, rewind
+
+
+class AsyncTransport:
+    """Backend used by :class:`AsyncAnglesHttpClient` to put requests on the wire.
+
+    ``send`` must return an object exposing ``status_code``, ``content``, ``text`` and ``json()``
+    (both ``httpx.Response`` and ``requests.Response`` qualify). ``stream`` returns one whose body
+    has not been read yet, exposing ``status_code``, ``headers``, ``aiter_bytes(chunk_size)``,
+    ``aread()``, ``text`` (once read) and ``aclose()``, as ``httpx.Response`` does.
+    """
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        files: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Any:
+        raise NotImplementedError
+
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        files: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Any:
+        """Send a request and return the response before its body is read.
+
+        The default buffers the whole body through :meth:`send`; transports that can read
+        incrementally override it.
+        """
+        resp = await self.send(method, url, params=params, json=json, data=data, files=files, headers=headers, timeout_s=timeout_s)
+        return _BufferedStream(resp)
+
+    async def aclose(self) -> None:
+        return None
+
+
+async def _aiter_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _aiter_file(body: Any, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    while True:
+        chunk = body.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class _BufferedStream:
+    """Streaming interface over a response whose body is already in memory."""
+
+    def __init__(self, resp: Any) -> None:
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.headers = getattr(resp, "headers", {})
+
+    @property
+    def text(self) -> str:
+        return self._resp.text
+
+    async def aread(self) -> bytes:
+        return self._resp.content
+
+    async def aiter_bytes(self, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        content = self._resp.content
+        step = chunk_size or len(content) or 1
+        for start in range(0, len(content), step):
+            yield content[start:start + step]
+
+    async def aclose(self) -> None:
+        return None
+
+
+class _ThreadedStream:
+    """Streaming interface over a ``requests.Response`` opened with ``stream=True``; reads run in the executor."""
+
+    def __init__(self, resp: requests.Response) -> None:
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.headers = resp.headers
+
+    @property
+    def text(self) -> str:
+        return self._resp.text
+
+    async def aread(self) -> bytes:
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: self._resp.content)
+
+    async def aiter_bytes(self, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        chunks = self._resp.iter_content(chunk_size or 64 * 1024)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    async def aclose(self) -> None:
+        self._resp.close()
+
+
+class HttpxTransport(AsyncTransport):
+    """Native asyncio transport built on ``httpx.AsyncClient`` (``pip install httpx``)."""
+
+    def __init__(self, client: Any = None, **client_kwargs: Any) -> None:
+        if client is None:
+            try:
+                import httpx
+            except ImportError as e:  # pragma: no cover - depends on environment
+                raise ImportError("HttpxTransport requires httpx: pip install httpx") from e
+            client = httpx.AsyncClient(**client_kwargs)
+        self.client = client
+
+    def _build(self, method, url, *, params=None, json=None, data=None, files=None, headers=None, timeout_s=None):
+        content = None
+        if isinstance(data, (bytes, str)):
+            content, data = data, None
+        elif hasattr(data, "read"):
+            # file-like body (e.g. MultipartFileEncoder); the caller sets Content-Length
+            content, data = _aiter_file(data), None
+        elif data is not None and not isinstance(data, Mapping) and hasattr(data, "__iter__"):
+            # streamed body (e.g. JsonStream); httpx.AsyncClient wants an async iterator
+            content, data = _aiter_chunks(data), None
+        return self.client.build_request(
+            method,
+            url,
+            params=params,
+            json=json,
+            content=content,
+            data=data,
+            files=files,
+            headers=headers,
+            timeout=timeout_s,
+        )
+
+    async def send(self, method, url, **kwargs):
+        return await self.client.send(self._build(method, url, **kwargs))
+
+    async def stream(self, method, url, **kwargs):
+        return await self.client.send(self._build(method, url, **kwargs), stream=True)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class ThreadedTransport(AsyncTransport):
+    """Fallback transport running a blocking :class:`AnglesHttpClient` in the default executor.
+
+    Only meant for environments without httpx; each in-flight request occupies an executor thread.
+    """
+
+    def __init__(self, http: Optional[AnglesHttpClient] = None) -> None:
+        self.http = http or AnglesHttpClient()
+
+    async def send(self, method, url, *, params=None, json=None, data=None, files=None, headers=None, timeout_s=None, stream=False):
+        loop = asyncio.get_running_loop()
+
+        def _call() -> Any:
+            assert self.http.session is not None
+            return self.http.session.request(
+                method=method,
+                url=url,
+                params=params,
+                json=json,
+                data=data,
+                files=files,
+                headers=headers,
+                timeout=timeout_s,
+                stream=stream,
+            )
+
+        return await loop.run_in_executor(None, _call)
+
+    async def stream(self, method, url, **kwargs):
+        return _ThreadedStream(await self.send(method, url, stream=True, **kwargs))
+
+    async def aclose(self) -> None:
+        if self.http.session is not None:
+            self.http.session.close()
+
+
+def default_transport(
+    *,
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry_s: Optional[float] = 5.0,
+    http2: bool = False,
+) -> AsyncTransport:
+    try:
+        import httpx
+    except ImportError:
+        if http2:
+            raise ImportError("http2=True requires httpx: pip install 'httpx[http2]'")
+        return ThreadedTransport(AnglesHttpClient(pool_maxsize=max_connections, pool_block=True))
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry_s,
+    )
+    return HttpxTransport(limits=limits, http2=http2)
+
+
+def _is_async_connect_failure(exc: Exception) -> bool:
+    # httpx.ConnectError / httpx.ConnectTimeout, or requests errors from ThreadedTransport
+    if type(exc).__name__ in ("ConnectError", "ConnectTimeout"):
+        return True
+    return isinstance(exc, requests.RequestException) and _is_connect_failure(exc)
+
+
+@dataclass
+class AsyncAnglesHttpClient:
+    """asyncio counterpart of :class:`AnglesHttpClient` with a pluggable transport.
+
+    The connection settings (``max_connections`` total, ``max_keepalive_connections`` idle,
+    ``keepalive_expiry_s`` and ``http2``) configure the default transport only; they are ignored
+    when a ``transport`` is passed in. ``retry_policy`` and ``circuit_breaker`` behave as on
+    :class:`AnglesHttpClient` (``RetryPolicy.sleep`` is replaced by ``asyncio.sleep``), as do the
+    ``compression*``, cache and ``typed_responses`` settings.
+    """
+
+    base_url: str = "http://127.0.0.1:3000/rest/api/v1.0/"
+    timeout_s: float = 10.0
+    transport: Optional[AsyncTransport] = None
+    default_headers: Optional[Dict[str, str]] = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_s: Optional[float] = 5.0
+    http2: bool = False
+    retry_policy: Optional[RetryPolicy] = None
+    circuit_breaker: Optional[CircuitBreaker] = None
+    compression: Optional[str] = None
+    compression_endpoints: Optional[Dict[str, Optional[str]]] = None
+    compression_min_bytes: int = 1024
+    response_cache: Optional[ResponseCache] = None
+    image_cache: Optional[ImageCache] = None
+    typed_responses: bool = False
+    _rejected_codecs: Set[str] = field(default_factory=set, init=False, repr=False)
+
+    # same request-body compression rules as the blocking client
+    _compress_body = AnglesHttpClient._compress_body
+
+    def __post_init__(self) -> None:
+        if self.transport is None:
+            self.transport = default_transport(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry_s=self.keepalive_expiry_s,
+                http2=self.http2,
+            )
+        if self.default_headers is None:
+            self.default_headers = {
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            }
+
+    def set_base_url(self, base_url: str) -> None:
+        if not base_url.endswith("/"):
+            base_url += "/"
+        self.base_url = base_url
+
+    def _full_url(self, path_or_url: str) -> str:
+        if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
+            return path_or_url
+        return urljoin(self.base_url, path_or_url.lstrip("/"))
+
+    async def request(
+        self,
+        method: str,
+        path_or_url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        files: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout_s: Optional[float] = None,
+        stream: bool = False,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """Send a request, applying ``retry_policy`` and ``circuit_breaker`` when configured.
+
+        With ``stream``, the response is returned before its body is read (see
+        :meth:`AsyncTransport.stream`); the caller must ``await resp.aclose()`` it.
+        """
+        url = self._full_url(path_or_url)
+        merged_headers: Dict[str, str] = dict(self.default_headers or {})
+        if headers:
+            merged_headers.update(headers)
+        if files is not None:
+            # let the transport generate the multipart boundary header
+            merged_headers.pop("Content-Type", None)
+
+        if json is not None:
+            data, json = dumps_bytes(json), None
+            # requests/httpx would have set this for json=; custom default_headers may lack it
+            merged_headers.setdefault("Content-Type", "application/json")
+
+        plain_data = data
+        data, codec = self._compress_body(path_or_url, data, merged_headers)
+
+        assert self.transport is not None
+        # 304 is only an answer to a conditional request; otherwise there is no body to fall back on
+        revalidating = "If-None-Match" in merged_headers or "If-Modified-Since" in merged_headers
+        policy = self.retry_policy
+        breaker = self.circuit_breaker
+        if idempotent is None:
+            idempotent = policy.is_idempotent(method, merged_headers) if policy else False
+        can_resend = is_rewindable(data) and files is None
+        send = self.transport.stream if stream else self.transport.send
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = breaker is not None and breaker.before_request(url)
+            if attempt > 1:
+                rewind(data)
+            try:
+                resp = await send(
+                    method.upper(),
+                    url,
+                    params=params,
+                    json=json,
+                    data=data,
+                    files=files,
+                    headers=merged_headers,
+                    timeout_s=timeout_s if timeout_s is not None else self.timeout_s,
+                )
+            except AnglesApiError:
+                if probe:
+                    breaker.release_probe()  # type: ignore[union-attr]
+                raise
+            except Exception as e:
+                if breaker is not None:
+                    breaker.record_failure()
+                if policy and can_resend and policy.should_retry_error(attempt, idempotent=idempotent, connect_failure=_is_async_connect_failure(e)):
+                    await asyncio.sleep(policy.delay_s(attempt))
+                    continue
+                raise AnglesApiError(f"Request failed: {e}", url=url) from e
+            except BaseException:  # asyncio.CancelledError
+                if probe:
+                    breaker.release_probe()  # type: ignore[union-attr]
+                raise
+
+            if breaker is not None:
+                breaker.record_status(resp.status_code)
+            if 200 <= resp.status_code < 300 or (resp.status_code == 304 and revalidating):
+                return resp
+            if resp.status_code == 415 and codec is not None and can_resend:
+                self._rejected_codecs.add(codec)
+                if stream:
+                    await resp.aclose()
+                data, codec = plain_data, None
+                merged_headers.pop("Content-Encoding", None)
+                attempt -= 1
+                continue
+            if policy and can_resend and policy.should_retry_status(attempt, resp.status_code, idempotent=idempotent):
+                if stream:
+                    await resp.aclose()
+                await asyncio.sleep(policy.delay_s(attempt, resp.headers))
+                continue
+
+            text = None
+            try:
+                if stream:
+                    await resp.aread()
+                text = resp.text
+            except Exception:
+                text = None
+            finally:
+                if stream:
+                    await resp.aclose()
+            raise AnglesApiError(
+                "Angles API returned error",
+                status_code=resp.status_code,
+                url=url,
+                response_text=text,
+            )
+
+    async def aclose(self) -> None:
+        if self.transport is not None:
+            await self.transport.aclose()
+
+    async def __aenter__(self) -> "AsyncAnglesHttpClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import datetime as _dt
+from typing import Any, Dict, List, Optional
+
+from ._serialize import jsonable
+from .async_http import AsyncAnglesHttpClient, AsyncTransport
+from .async_requests import (
+    AsyncBaselineRequests,
+    AsyncBuildRequests,
+    AsyncEnvironmentRequests,
+    AsyncExecutionRequests,
+    AsyncScreenshotRequests,
+    AsyncTeamRequests,
+)
+from .models.requests import CreateBuild, ScreenshotPlatform, StoreScreenshot
+from .reporter import AnglesReporter
+
+
+class AsyncAnglesReporter(AnglesReporter):
+    """asyncio flavour of :class:`AnglesReporter`.
+
+    Step/action logging stays synchronous (it only touches local state); every method that talks
+    to the Angles server is a coroutine. Many reporters may share one ``AsyncAnglesHttpClient``.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        timeout_s: float = 10.0,
+        transport: Optional[AsyncTransport] = None,
+        default_headers: Optional[Dict[str, str]] = None,
+        http: Optional[AsyncAnglesHttpClient] = None,
+    ) -> None:
+        self.http = http or AsyncAnglesHttpClient(
+            base_url=base_url or AsyncAnglesHttpClient.base_url,
+            timeout_s=timeout_s,
+            transport=transport,
+            default_headers=default_headers,
+        )
+        self._instantiate_clients()
+        self._init_state()
+
+    def _instantiate_clients(self) -> None:
+        self.teams = AsyncTeamRequests(self.http)
+        self.environments = AsyncEnvironmentRequests(self.http)
+        self.builds = AsyncBuildRequests(self.http)
+        self.executions = AsyncExecutionRequests(self.http)
+        self.screenshots = AsyncScreenshotRequests(self.http)
+        self.baselines = AsyncBaselineRequests(self.http)
+
+    @classmethod
+    def get_instance(cls) -> "AsyncAnglesReporter":
+        raise TypeError("AsyncAnglesReporter has no process-wide singleton; instantiate it directly.")
+
+    def enable_background_uploads(self, **kwargs: Any) -> Any:
+        raise TypeError("AsyncAnglesReporter is already non-blocking; schedule its coroutines as tasks instead.")
+
+    def enable_spool(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("Spooling is not supported by AsyncAnglesReporter.")
+
+    def enable_fingerprint_index(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("The fingerprint index is not supported by AsyncAnglesReporter.")
+
+    def enable_aggregator(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("The aggregator is not supported by AsyncAnglesReporter; share one AsyncAnglesHttpClient instead.")
+
+    def enable_incremental(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("Incremental reporting is not supported by AsyncAnglesReporter.")
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    # --- build lifecycle ---
+    async def start_build(self, name: str, team: str, environment: str, component: str, phase: Optional[str] = None) -> Dict[str, Any]:
+        req = CreateBuild(
+            name=name,
+            team=team,
+            environment=environment,
+            component=component,
+            phase=phase,
+            start=_dt.datetime.now(),
+        )
+        created = await self.builds.create_build(req)
+        self.current_build = created
+        return created
+
+    async def add_artifacts(self, artifacts: List[Any]) -> Any:
+        if not self.current_build or not self.current_build.get("_id"):
+            raise RuntimeError("No current build set. Call start_build() or set_current_build() first.")
+        return await self.builds.add_artifacts(self.current_build["_id"], artifacts)
+
+    # --- execution lifecycle ---
+    async def save_test(self) -> Any:
+        if not self.current_execution:
+            raise RuntimeError("No current test started. Call start_test() first.")
+        return await self.executions.save_execution(self.current_execution)
+
+    # --- screenshots ---
+    async def save_screenshot(self, file_path: str, view: str, tags: Optional[List[str]] = None) -> Any:
+        return await self.save_screenshot_with_platform(file_path=file_path, view=view, tags=tags, platform=None)
+
+    async def save_screenshot_with_platform(
+        self,
+        file_path: str,
+        view: str,
+        tags: Optional[List[str]] = None,
+        platform: Optional[ScreenshotPlatform] = None,
+    ) -> Any:
+        if not self.current_build or not self.current_build.get("_id"):
+            raise RuntimeError("No current build set. Call start_build() or set_current_build() first.")
+        store = StoreScreenshot(
+            buildId=self.current_build["_id"],
+            filePath=file_path,
+            view=view,
+            timestamp=_dt.datetime.now(),
+            tags=tags,
+            platform=platform,
+        )
+        return await self.screenshots.save_screenshot(store)
+
+    async def compare_screenshot_against_baseline(self, screenshot_id: str, *, local: bool = False) -> Any:
+        if local:
+            return jsonable(await self.screenshots.get_baseline_compare_local(screenshot_id))
+        return await self.screenshots.get_baseline_compare(screenshot_id)
@@ -0,0 +1,454 @@
+"""asyncio variants of the request classes in :mod:`angles_python_client.requests`.
+
+Each ``Async*Requests`` class reuses the endpoint definitions of its synchronous counterpart;
+only the verb helpers are overridden, so every public method returns an awaitable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as _dt
+import inspect
+import json
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from ._multipart import MultipartFileEncoder
+from ._pagination import PageSizer, aiter_pages, merge_pages, page_items
+from ._serialize import JsonStream
+from .async_http import AsyncAnglesHttpClient
+from .exceptions import AnglesApiError
+from .models import Build, BuildsResponse, Execution, Screenshot
+from .requests import (
+    MAX_IDS_PER_REQUEST,
+    MAX_URL_LENGTH,
+    AnglesRequests,
+    BaseRequests,
+    BaselineRequests,
+    BuildRequests,
+    EnvironmentRequests,
+    ExecutionRequests,
+    MetricRequests,
+    ScreenshotRequests,
+    TeamRequests,
+    _cache_response,
+    _revalidation_headers,
+    baseline_screenshot_id,
+    first_baseline,
+)
+from .results import ItemResult
+
+
+class AsyncBaseRequests(BaseRequests):
+    http: AsyncAnglesHttpClient  # type: ignore[assignment]
+
+    def __init__(self, http: AsyncAnglesHttpClient):
+        self.http = http
+
+    def _typed(self, response: Any, model: type, page: Optional[type] = None) -> Any:
+        if not self.http.typed_responses or not inspect.isawaitable(response):
+            return super()._typed(response, model, page)
+
+        async def _decoded() -> Any:
+            return super(AsyncBaseRequests, self)._typed(await response, model, page)
+
+        return _decoded()
+
+    async def post(self, url: str, body: Any, *, headers: Optional[Dict[str, str]] = None) -> Any:
+        try:
+            resp = await self.http.request("POST", url, json=self._json(body), headers=headers)
+        finally:
+            self._invalidate(url)
+        return resp.json() if resp.content else None
+
+    async def post_stream(self, url: str, body: Any, *, compress: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Any:
+        stream = JsonStream(body, compress=compress)
+        merged: Dict[str, str] = {"Content-Type": "application/json", **(headers or {})}
+        if stream.content_encoding:
+            merged["Content-Encoding"] = stream.content_encoding
+        try:
+            resp = await self.http.request("POST", url, data=stream, headers=merged)
+        finally:
+            self._invalidate(url)
+        return resp.json() if resp.content else None
+
+    async def get(self, url: str, *, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, response_type: str = "json") -> Any:
+        cache = self.http.response_cache
+        if cache is not None and response_type == "json":
+            ttl = cache.ttl_for(url)
+            if ttl is not None:
+                key = cache.key(url, params)
+                entry, fresh = cache.lookup(key)
+                if fresh:
+                    return json.loads(entry.body)  # type: ignore[union-attr]
+                resp = await self.http.request("GET", url, params=params, headers=_revalidation_headers(headers, entry))
+                return _cache_response(cache, key, ttl, entry, resp)
+        resp = await self.http.request("GET", url, params=params, headers=headers)
+        if response_type == "bytes":
+            return resp.content
+        return resp.json() if resp.content else None
+
+    async def _get_by_ids(  # type: ignore[override]
+        self,
+        url: str,
+        params: Dict[str, Any],
+        key: str,
+        ids: List[str],
+        *,
+        max_workers: int,
+        max_url_length: int,
+        max_ids: int,
+        ordered: bool = True,
+    ) -> AsyncIterator[Any]:
+        chunks = self._id_chunks(url, params, key, ids, max_url_length, max_ids)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def _one(chunk: List[str]) -> Any:
+            async with semaphore:
+                return await self.get(url, params={**params, key: ",".join(chunk)})
+
+        tasks = [asyncio.ensure_future(_one(chunk)) for chunk in chunks]
+        try:
+            for next_done in (tasks if ordered else asyncio.as_completed(tasks)):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def put(self, url: str, body: Any = None, *, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Any:
+        try:
+            resp = await self.http.request("PUT", url, params=params, json=self._json(body) if body is not None else None, headers=headers)
+        finally:
+            self._invalidate(url)
+        return resp.json() if resp.content else None
+
+    async def delete(self, url: str, *, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Any:
+        try:
+            resp = await self.http.request("DELETE", url, params=params, headers=headers)
+        finally:
+            self._invalidate(url)
+        return resp.json() if resp.content else None
+
+
+class AsyncTeamRequests(AsyncBaseRequests, TeamRequests):
+    pass
+
+
+class AsyncEnvironmentRequests(AsyncBaseRequests, EnvironmentRequests):
+    pass
+
+
+class AsyncBuildRequests(AsyncBaseRequests, BuildRequests):
+    async def get_builds(  # type: ignore[override]
+        self,
+        team_id: str,
+        build_ids: Optional[List[str]] = None,
+        return_execution_details: bool = False,
+        *,
+        max_workers: int = 4,
+        max_url_length: int = MAX_URL_LENGTH,
+        max_ids_per_request: int = MAX_IDS_PER_REQUEST,
+    ) -> Any:
+        params = self._builds_params(team_id, return_execution_details)
+        if not build_ids:
+            return self._typed(await self.get("build", params=params), Build, BuildsResponse)
+        pages = self._get_by_ids("build", params, "buildIds", list(build_ids), max_workers=max_workers, max_url_length=max_url_length, max_ids=max_ids_per_request)
+        return self._typed(merge_pages([page async for page in pages]), Build, BuildsResponse)
+
+    async def iter_builds_by_id(  # type: ignore[override]
+        self,
+        team_id: str,
+        build_ids: Iterable[str],
+        return_execution_details: bool = False,
+        *,
+        max_workers: int = 4,
+        max_url_length: int = MAX_URL_LENGTH,
+        max_ids_per_request: int = MAX_IDS_PER_REQUEST,
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of :meth:`BuildRequests.iter_builds_by_id`; iterate with ``async for``."""
+        ids = list(build_ids)
+        if not ids:
+            return
+        params = self._builds_params(team_id, return_execution_details)
+        pages = self._get_by_ids("build", params, "buildIds", ids, max_workers=max_workers, max_url_length=max_url_length, max_ids=max_ids_per_request, ordered=False)
+        async for page in pages:
+            for build in page_items(page)[0]:
+                yield self._typed(build, Build)
+
+    async def iter_builds(  # type: ignore[override]
+        self,
+        team_id: str,
+        filter_environments: Optional[List[str]] = None,
+        filter_components: Optional[List[str]] = None,
+        *,
+        from_date: Optional[_dt.date] = None,
+        to_date: Optional[_dt.date] = None,
+        skip: int = 0,
+        page_size: int = 50,
+        max_page_size: int = 1000,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of :meth:`BuildRequests.iter_builds`; iterate with ``async for``."""
+        def fetch(page_skip: int, limit: int) -> Any:
+            return self.get_builds_with_date_filters(
+                team_id, filter_environments, filter_components, skip=page_skip, limit=limit, from_date=from_date, to_date=to_date
+            )
+
+        sizer = PageSizer(page_size, min_size=min(10, page_size), max_size=max(page_size, max_page_size))
+        async for build in aiter_pages(fetch, skip=skip, sizer=sizer, prefetch=prefetch):
+            yield self._typed(build, Build)
+
+
+class AsyncExecutionRequests(AsyncBaseRequests, ExecutionRequests):
+    async def save_executions(  # type: ignore[override]
+        self,
+        save_execution_requests: Iterable[Any],
+        *,
+        batch_size: int = 100,
+        max_in_flight: int = 8,
+        bulk_endpoint: Optional[str] = None,
+    ) -> List[ItemResult]:
+        """Async counterpart of :meth:`ExecutionRequests.save_executions`."""
+        items = list(save_execution_requests)
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def _one(index: int, item: Any) -> List[ItemResult]:
+            async with semaphore:
+                try:
+                    return [ItemResult(index=index, item=item, result=await self.save_execution(item))]
+                except Exception as e:
+                    return [ItemResult(index=index, item=item, error=e)]
+
+        async def _batch(start: int, batch: List[Any], probe: bool = False) -> List[ItemResult]:
+            async with semaphore:
+                try:
+                    response = await self.post(bulk_endpoint, batch)  # type: ignore[arg-type]
+                    if not isinstance(response, list) or len(response) != len(batch):
+                        raise AnglesApiError(f"Bulk endpoint returned {type(response).__name__}, expected a list of {len(batch)} items")
+                except Exception as e:
+                    if probe and isinstance(e, AnglesApiError) and e.status_code in (404, 405):
+                        raise
+                    return [ItemResult(index=start + i, item=item, error=e) for i, item in enumerate(batch)]
+                return [ItemResult(index=start + i, item=item, result=res) for i, (item, res) in enumerate(zip(batch, response))]
+
+        if bulk_endpoint and self._bulk_supported is not False and items:
+            batches = [(start, items[start:start + batch_size]) for start in range(0, len(items), batch_size)]
+            probe = self._bulk_supported is None
+            try:
+                head = await _batch(*batches[0], probe=probe)
+            except AnglesApiError:
+                self._bulk_supported = False
+            else:
+                if probe and head[0].ok:
+                    self._bulk_supported = True
+                groups = [head] + list(await asyncio.gather(*(_batch(*b) for b in batches[1:])))
+                return [r for group in groups for r in group]
+
+        groups = await asyncio.gather(*(_one(i, item) for i, item in enumerate(items)))
+        return [r for group in groups for r in group]
+
+    async def iter_execution_history(  # type: ignore[override]
+        self,
+        execution_id: str,
+        *,
+        skip: int = 0,
+        page_size: int = 50,
+        max_page_size: int = 1000,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of :meth:`ExecutionRequests.iter_execution_history`."""
+        sizer = PageSizer(page_size, min_size=min(10, page_size), max_size=max(page_size, max_page_size))
+        async for execution in aiter_pages(lambda page_skip, limit: self.get_execution_history(execution_id, page_skip, limit), skip=skip, sizer=sizer, prefetch=prefetch):
+            yield self._typed(execution, Execution)
+
+
+class AsyncScreenshotRequests(AsyncBaseRequests, ScreenshotRequests):
+    async def _cached_image(self, key: str, fetch: Callable[[], Awaitable[bytes]]) -> bytes:  # type: ignore[override]
+        cache = self.http.image_cache
+        if cache is None:
+            return await fetch()
+        data = cache.get(key)
+        if data is None:
+            data = await fetch()
+            cache.put(key, data)
+        return data
+
+    async def iter_screenshot_image(self, screenshot_id: str, chunk_size: int = 64 * 1024, *, offset: int = 0) -> AsyncIterator[bytes]:  # type: ignore[override]
+        """Async counterpart of :meth:`ScreenshotRequests.iter_screenshot_image`; iterate with ``async for``."""
+        cache = self.http.image_cache
+        if cache is not None:
+            with cache.open(f"screenshot/{screenshot_id}") as view:
+                if view is not None:
+                    for start in range(offset, len(view), chunk_size):
+                        yield view[start:start + chunk_size].tobytes()
+                    return
+        url = f"screenshot/{screenshot_id}/image"
+        headers = {"Accept": "*/*"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        resp = await self.http.request("GET", url, headers=headers, stream=True)
+        try:
+            skip = offset if offset and resp.status_code != 206 else 0
+            async for chunk in resp.aiter_bytes(chunk_size):
+                if skip:
+                    dropped = min(skip, len(chunk))
+                    chunk, skip = chunk[dropped:], skip - dropped
+                if chunk:
+                    yield chunk
+        except Exception as e:  # requests or httpx errors, depending on the transport
+            raise AnglesApiError(f"Download interrupted: {e}", url=self.http._full_url(url)) from e
+        finally:
+            await resp.aclose()
+
+    async def download_screenshot_image(  # type: ignore[override]
+        self,
+        screenshot_id: str,
+        dest: str,
+        *,
+        chunk_size: int = 64 * 1024,
+        resume: bool = True,
+        max_resumes: int = 3,
+    ) -> str:
+        """Async counterpart of :meth:`ScreenshotRequests.download_screenshot_image`."""
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, f"{screenshot_id}.png")
+        part = dest + ".part"
+        if not resume and os.path.exists(part):
+            os.remove(part)
+        resumes = 0
+        while True:
+            offset = os.path.getsize(part) if os.path.exists(part) else 0
+            try:
+                with open(part, "ab") as f:
+                    async for chunk in self.iter_screenshot_image(screenshot_id, chunk_size, offset=offset):
+                        f.write(chunk)
+                break
+            except AnglesApiError as e:
+                if e.status_code == 416 and offset:
+                    os.remove(part)  # stale partial file; start over
+                    continue
+                if e.status_code is not None or not resume or resumes >= max_resumes:
+                    raise
+                resumes += 1
+        os.replace(part, dest)
+        return dest
+
+    async def download_screenshots(  # type: ignore[override]
+        self,
+        screenshot_ids: Iterable[str],
+        dest_dir: str,
+        *,
+        max_workers: int = 4,
+        chunk_size: int = 64 * 1024,
+        resume: bool = True,
+    ) -> AsyncIterator[ItemResult]:
+        """Async counterpart of :meth:`ScreenshotRequests.download_screenshots`; iterate with ``async for``."""
+        os.makedirs(dest_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def _one(index: int, screenshot_id: str) -> ItemResult:
+            path = os.path.join(dest_dir, f"{screenshot_id}.png")
+            async with semaphore:
+                try:
+                    if not os.path.exists(path):
+                        path = await self.download_screenshot_image(screenshot_id, path, chunk_size=chunk_size, resume=resume)
+                    return ItemResult(index=index, item=screenshot_id, result=path)
+                except Exception as e:
+                    return ItemResult(index=index, item=screenshot_id, error=e)
+
+        tasks = [asyncio.ensure_future(_one(i, screenshot_id)) for i, screenshot_id in enumerate(screenshot_ids)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_screenshots(  # type: ignore[override]
+        self,
+        screenshot_ids: List[str],
+        *,
+        max_workers: int = 4,
+        max_url_length: int = MAX_URL_LENGTH,
+        max_ids_per_request: int = MAX_IDS_PER_REQUEST,
+    ) -> Any:
+        if not screenshot_ids:
+            return self._typed(await self.get("screenshot/", params={"screenshotIds": ""}), Screenshot)
+        pages = self._get_by_ids("screenshot/", {}, "screenshotIds", list(screenshot_ids), max_workers=max_workers, max_url_length=max_url_length, max_ids=max_ids_per_request)
+        return self._typed(merge_pages([page async for page in pages]), Screenshot)
+
+    async def iter_screenshots_by_id(  # type: ignore[override]
+        self,
+        screenshot_ids: Iterable[str],
+        *,
+        max_workers: int = 4,
+        max_url_length: int = MAX_URL_LENGTH,
+        max_ids_per_request: int = MAX_IDS_PER_REQUEST,
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of :meth:`ScreenshotRequests.iter_screenshots_by_id`."""
+        ids = list(screenshot_ids)
+        if not ids:
+            return
+        pages = self._get_by_ids("screenshot/", {}, "screenshotIds", ids, max_workers=max_workers, max_url_length=max_url_length, max_ids=max_ids_per_request, ordered=False)
+        async for page in pages:
+            for screenshot in page_items(page)[0]:
+                yield self._typed(screenshot, Screenshot)
+
+    async def get_baseline_compare_local(self, screenshot_id: str, *, tolerance: int = 0, diff_path: Optional[str] = None) -> Any:  # type: ignore[override]
+        """Async counterpart of :meth:`ScreenshotRequests.get_baseline_compare_local`; the compare runs in a thread."""
+        from .image_diff import compare_images
+
+        shot = await self.get_screenshot(screenshot_id)
+        baseline = first_baseline(await AsyncBaselineRequests(self.http).get_baseline_for_screenshot(shot))
+        baseline_id = baseline_screenshot_id(baseline)
+        if baseline is None or baseline_id is None:
+            raise AnglesApiError(f"No baseline found for screenshot {screenshot_id}", status_code=404)
+        images = await asyncio.gather(self.get_screenshot_image(baseline_id), self.get_screenshot_image(screenshot_id))
+        return await asyncio.to_thread(
+            compare_images, *images, ignore_boxes=baseline.get("ignoreBoxes"), tolerance=tolerance, diff_path=diff_path
+        )
+
+    async def save_screenshot(self, store_screenshot: Any) -> Any:
+        full_path, file_name, data = self._screenshot_form(store_screenshot)
+
+        # streamed from disk in chunks, as in ScreenshotRequests.save_screenshot
+        with MultipartFileEncoder(data, "screenshot", full_path, file_name=file_name) as body:
+            headers = {"Accept": "application/json", "Content-Type": body.content_type, "Content-Length": str(len(body))}
+            resp = await self.http.request("POST", "screenshot/", data=body, headers=headers)
+            return resp.json() if resp.content else None
+
+    async def save_screenshots(self, store_screenshots: Iterable[Any], *, max_workers: int = 4) -> AsyncIterator[ItemResult]:  # type: ignore[override]
+        """Async counterpart of :meth:`ScreenshotRequests.save_screenshots`; iterate with ``async for``."""
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def _one(index: int, item: Any) -> ItemResult:
+            async with semaphore:
+                try:
+                    return ItemResult(index=index, item=item, result=await self.save_screenshot(item))
+                except Exception as e:
+                    return ItemResult(index=index, item=item, error=e)
+
+        tasks = [asyncio.ensure_future(_one(i, item)) for i, item in enumerate(store_screenshots)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class AsyncBaselineRequests(AsyncBaseRequests, BaselineRequests):
+    # BaselineIndex loads synchronously; async writes are not reflected in an index
+    def _indexed(self, baseline: Any) -> Any:
+        return baseline
+
+    def _unindexed(self, baseline_id: str, response: Any) -> Any:
+        return response
+
+
+class AsyncMetricRequests(AsyncBaseRequests, MetricRequests):
+    pass
+
+
+class AsyncAnglesRequests(AsyncBaseRequests, AnglesRequests):
+    pass
@@ -0,0 +1,101 @@
+"""In-memory index of every baseline, for resolving many screenshots without one GET each."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ._serialize import jsonable
+from .lazy_models import unwrap
+from .requests import BaselineRequests, baseline_key
+
+
+def baseline_slot(baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Screenshot-shaped view of a baseline, so it yields the same :func:`baseline_key`."""
+    shot = baseline.get("screenshot")
+    shot = shot if isinstance(shot, dict) else {}
+    return {
+        "view": baseline.get("view") or shot.get("view"),
+        "platform": baseline.get("platform") or shot.get("platform"),
+        "height": baseline.get("screenHeight") or shot.get("height"),
+        "width": baseline.get("screenWidth") or shot.get("width"),
+    }
+
+
+class BaselineIndex:
+    """Every baseline, keyed like the server's ``GET baseline/`` lookup (view + platform + size).
+
+    Loaded with one ``get_baselines()`` call and reloaded once older than ``max_age_s``. The
+    index attaches itself to ``baselines``, so ``set_baseline``, ``update_baseline`` and
+    ``delete_baseline`` made through that object update it in place. Thread-safe.
+    """
+
+    def __init__(self, baselines: BaselineRequests, *, max_age_s: float = 300.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.baselines = baselines
+        self.max_age_s = max_age_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._key_by_id: Dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+        baselines.index = self
+
+    def refresh(self) -> None:
+        by_key: Dict[str, Dict[str, Any]] = {}
+        key_by_id: Dict[str, str] = {}
+        for baseline in unwrap(self.baselines.get_baselines()) or []:
+            key = baseline_key(baseline_slot(baseline))
+            by_key[key] = baseline
+            if baseline.get("_id"):
+                key_by_id[baseline["_id"]] = key
+        with self._lock:
+            self._by_key, self._key_by_id = by_key, key_by_id
+            self._loaded_at = self._clock()
+
+    def _ensure_fresh(self) -> None:
+        with self._lock:
+            stale = self._loaded_at is None or self._clock() - self._loaded_at > self.max_age_s
+        if stale:
+            self.refresh()
+
+    def resolve(self, screenshots: Iterable[Any]) -> List[Optional[Dict[str, Any]]]:
+        """The baseline for each screenshot (dicts or models), in input order; ``None`` if it has none."""
+        self._ensure_fresh()
+        keys = [baseline_key(jsonable(s)) for s in screenshots]
+        with self._lock:
+            return [self._by_key.get(key) for key in keys]
+
+    def get(self, screenshot: Any) -> Optional[Dict[str, Any]]:
+        return self.resolve([screenshot])[0]
+
+    # drop-in for BaselineRequests in code that only looks baselines up (e.g. FingerprintIndex)
+    get_baseline_for_screenshot = get
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    # --- kept coherent by BaselineRequests ---
+    def upsert(self, baseline: Any) -> None:
+        """Record a baseline returned by the server; anything unrecognisable forces a reload."""
+        if not isinstance(baseline, dict) or not baseline_slot(baseline)["view"]:
+            self.invalidate()
+            return
+        key = baseline_key(baseline_slot(baseline))
+        with self._lock:
+            old_key = self._key_by_id.pop(baseline.get("_id"), None) if baseline.get("_id") else None
+            if old_key is not None and old_key != key:
+                self._by_key.pop(old_key, None)
+            self._by_key[key] = baseline
+            if baseline.get("_id"):
+                self._key_by_id[baseline["_id"]] = key
+
+    def remove(self, baseline_id: str) -> None:
+        with self._lock:
+            key = self._key_by_id.pop(baseline_id, None)
+            if key is not None:
+                self._by_key.pop(key, None)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
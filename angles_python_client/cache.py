@@ -0,0 +1,231 @@
+"""Client-side response cache for rarely changing reference data (teams, environments, ...).
+
+Attach a :class:`ResponseCache` to an HTTP client and ``BaseRequests.get`` serves cached JSON
+for endpoints that have a TTL, revalidating expired entries with ``If-None-Match`` when the
+server sent an ``ETag``. Any POST/PUT/DELETE through the request classes drops every cached
+entry of the same resource (the first path segment, e.g. ``team``); writes to resources
+without a TTL, such as executions, leave the cache alone.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from ._serialize import dumps_bytes
+
+# (resource, path + query)
+CacheKey = Tuple[str, str]
+
+DEFAULT_TTLS: Dict[str, float] = {
+    "team": 300.0,
+    "environment": 300.0,
+    "baseline": 60.0,
+    "angles/versions": 3600.0,
+}
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    etag: Optional[str]
+    expires_at: float
+
+
+class MemoryCacheBackend:
+    """Bounded in-process LRU store. Thread-safe."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: CacheKey, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_resource(self, resource: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == resource]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend:
+    """Store shared by every process using ``directory`` (e.g. pytest-xdist workers).
+
+    One file per entry under a directory per resource, written atomically via rename. Reads
+    touch the file's mtime so the least recently used entries are evicted once the directory
+    grows past ``max_entries`` by a tenth; the directory is only scanned then.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 1024) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        # entries on disk as of the last scan, plus the ones this process has added since
+        self._count: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: CacheKey) -> str:
+        resource, name = key
+        return os.path.join(self.directory, _safe(resource), hashlib.sha1(name.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                raw = json.loads(f.read())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(body=raw["body"].encode("utf-8"), etag=raw.get("etag"), expires_at=raw["expires_at"])
+
+    def set(self, key: CacheKey, entry: CacheEntry) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = dumps_bytes({"body": entry.body.decode("utf-8"), "etag": entry.etag, "expires_at": entry.expires_at})
+        added = not os.path.exists(path)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(record)
+            os.replace(tmp, path)
+        except BaseException:
+            _unlink(tmp)
+            raise
+        if added:
+            self._count = len(self._files()) if self._count is None else self._count + 1
+            if self._count > self.max_entries + max(1, self.max_entries // 10):
+                self._evict()
+
+    def _evict(self) -> None:
+        files = self._files()
+        if len(files) > self.max_entries:
+            files.sort()
+            for _, path in files[: len(files) - self.max_entries]:
+                _unlink(path)
+        self._count = min(len(files), self.max_entries)
+
+    def _files(self) -> List[Tuple[float, str]]:
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        files.append((os.stat(path).st_mtime, path))
+                    except OSError:
+                        pass
+        return files
+
+    def delete_resource(self, resource: str) -> None:
+        directory = os.path.join(self.directory, _safe(resource))
+        try:
+            removed = sum(1 for name in os.listdir(directory) if name.endswith(".json"))
+        except OSError:
+            return
+        shutil.rmtree(directory, ignore_errors=True)
+        if self._count is not None:
+            self._count = max(0, self._count - removed)
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        self._count = 0
+
+
+def _safe(resource: str) -> str:
+    return resource.replace("/", "_") or "_"
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ResponseCache:
+    """TTL cache of GET responses, keyed by path and query parameters.
+
+    ``ttls`` maps path prefixes (relative to the API base) to seconds; the longest matching
+    prefix wins and paths without one are never cached. ``backend`` defaults to an in-memory
+    LRU of ``max_entries``; pass :class:`DiskCacheBackend` to share one cache between processes.
+    """
+
+    def __init__(
+        self,
+        backend: Any = None,
+        *,
+        ttls: Optional[Mapping[str, float]] = None,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_entries)
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._clock = clock
+
+    def ttl_for(self, path_or_url: str) -> Optional[float]:
+        path = _path(path_or_url)
+        best, ttl = -1, None
+        for prefix, value in self.ttls.items():
+            prefix = prefix.strip("/")
+            if path.startswith(prefix) and len(prefix) > best:
+                best, ttl = len(prefix), value
+        return ttl
+
+    def key(self, path_or_url: str, params: Optional[Mapping[str, Any]] = None) -> CacheKey:
+        path = _path(path_or_url)
+        query = urlencode(sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None))
+        return path.split("/", 1)[0], f"{path}?{query}"
+
+    def lookup(self, key: CacheKey) -> Tuple[Optional[CacheEntry], bool]:
+        """Return ``(entry, fresh)``; a stale entry is still useful for revalidation."""
+        entry = self.backend.get(key)
+        return entry, entry is not None and entry.expires_at > self._clock()
+
+    def store(self, key: CacheKey, body: bytes, etag: Optional[str], ttl: float) -> None:
+        try:
+            self.backend.set(key, CacheEntry(body=body, etag=etag, expires_at=self._clock() + ttl))
+        except OSError:
+            pass  # e.g. a full disk; the response itself was fine
+
+    def invalidate(self, path_or_url: str) -> None:
+        """Drop the cached entries of ``path_or_url``'s resource, if that resource is cacheable."""
+        resource = _path(path_or_url).split("/", 1)[0]
+        if any(prefix.strip("/").split("/", 1)[0] == resource for prefix in self.ttls):
+            self.backend.delete_resource(resource)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def _path(path_or_url: str) -> str:
+    if path_or_url.startswith(("http://", "https://")):
+        path_or_url = urlsplit(path_or_url).path
+    return path_or_url.strip("/")
@@ -0,0 +1,55 @@
+"""Reporters whose test state is local to the current thread or asyncio task.
+
+One :class:`ContextLocalReporter` can report many tests running concurrently in one process:
+``current_execution`` and ``current_action`` live in :mod:`contextvars`, so every thread, and
+every asyncio task, sees only the test it started. The build, the HTTP client and any upload
+queue, spool or journal stay shared by all of them.
+"""
+
+from __future__ import annotations
+
+import contextvars
+from typing import Any, Dict
+
+from .async_reporter import AsyncAnglesReporter
+from .reporter import AnglesReporter
+
+# per-test attributes of AnglesReporter kept in context variables
+CONTEXT_ATTRIBUTES = ("current_execution", "current_action", "_action_batch")
+
+
+def _context_attribute(name: str) -> property:
+    def fget(self: "ContextLocalState") -> Any:
+        return self._context_vars[name].get()
+
+    def fset(self: "ContextLocalState", value: Any) -> None:
+        self._context_vars[name].set(value)
+
+    return property(fget, fset, doc=f"``{name}`` of the test running in the current context.")
+
+
+class ContextLocalState:
+    """Mixin moving a reporter's per-test attributes into context variables.
+
+    New threads start with no current test. asyncio tasks start with a copy of their creator's
+    context, so a task sees the test that was current when it was created until it calls
+    ``start_test`` itself; that call does not affect other tasks.
+    """
+
+    _context_vars: Dict[str, contextvars.ContextVar]
+
+    def __init__(self, **kwargs: Any) -> None:
+        self._context_vars = {name: contextvars.ContextVar(f"angles.{name}", default=None) for name in CONTEXT_ATTRIBUTES}
+        super().__init__(**kwargs)  # type: ignore[call-arg]
+
+    current_execution = _context_attribute("current_execution")
+    current_action = _context_attribute("current_action")
+    _action_batch = _context_attribute("_action_batch")
+
+
+class ContextLocalReporter(ContextLocalState, AnglesReporter):
+    """:class:`AnglesReporter` that can run tests on many threads at once."""
+
+
+class AsyncContextLocalReporter(ContextLocalState, AsyncAnglesReporter):
+    """:class:`AsyncAnglesReporter` that can run tests in many asyncio tasks at once."""
@@ -22,3 +22,11 @@ class AnglesApiError(RuntimeError):
         if self.response_text:
             parts.append(f"response={self.response_text[:500]}")
         return " | ".join(parts)
+
+
+class AnglesUploadDroppedError(RuntimeError):
+    """Set on a background upload's future when the queue discarded it under backpressure."""
+
+
+class AnglesCircuitOpenError(AnglesApiError):
+    """Raised without contacting the server while the client's circuit breaker is open."""
@@ -0,0 +1,172 @@
+"""Client-side fingerprints of baseline images, used to skip uploading unchanged screenshots.
+
+A :class:`FingerprintIndex` maps a baseline slot (view + platform, see
+:func:`~angles_python_client.requests.baseline_key`) to the SHA-256 and, when Pillow is
+installed, a 64-bit difference hash of the current baseline image. A new screenshot whose
+content hash matches (or whose perceptual hash is within ``max_distance`` bits) is unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .exceptions import AnglesApiError
+
+try:  # optional: perceptual hashing needs an image decoder
+    from PIL import Image as _Image
+except ImportError:  # pragma: no cover - depends on environment
+    _Image = None
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """``(width, height)`` from a PNG header, or via Pillow for other formats."""
+    if data[:8] == _PNG_SIGNATURE and data[12:16] == b"IHDR":
+        return struct.unpack(">II", data[16:24])
+    if _Image is not None:
+        try:
+            with _Image.open(io.BytesIO(data)) as img:
+                return img.size
+        except Exception:
+            return None
+    return None
+
+
+def perceptual_hash(data: bytes) -> Optional[int]:
+    """64-bit difference hash (dHash) of an image; ``None`` without Pillow."""
+    if _Image is None:
+        return None
+    with _Image.open(io.BytesIO(data)) as img:
+        pixels = img.convert("L").resize((9, 8)).tobytes()
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class Fingerprint:
+    screenshot_id: str
+    content_hash: str
+    phash: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    @classmethod
+    def of(cls, screenshot_id: str, data: bytes) -> "Fingerprint":
+        size = image_size(data)
+        return cls(
+            screenshot_id=screenshot_id,
+            content_hash=content_hash(data),
+            phash=perceptual_hash(data),
+            width=size[0] if size else None,
+            height=size[1] if size else None,
+        )
+
+
+class FingerprintIndex:
+    """Baseline key -> :class:`Fingerprint` of the current baseline image. Thread-safe.
+
+    Entries (including "no baseline" answers) are refreshed after ``ttl_s`` seconds. With
+    ``path`` the index is persisted as JSON, so later runs start warm.
+    """
+
+    def __init__(self, path: Optional[str] = None, *, ttl_s: float = 3600.0, max_distance: int = 0, clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_distance = max_distance
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (fetched_at, fingerprint or None when the slot has no baseline)
+        self._entries: Dict[str, Tuple[float, Optional[Fingerprint]]] = {}
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, (fetched_at, fp) in raw.items():
+            self._entries[key] = (fetched_at, Fingerprint(**fp) if fp else None)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            raw = {k: (t, asdict(fp) if fp else None) for k, (t, fp) in self._entries.items()}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(raw, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def get(self, key: str) -> Tuple[bool, Optional[Fingerprint]]:
+        """``(known, fingerprint)``; ``known`` is False when the entry is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or self._clock() - entry[0] > self.ttl_s:
+            return False, None
+        return True, entry[1]
+
+    def put(self, key: str, fingerprint: Optional[Fingerprint]) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), fingerprint)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def lookup(self, key: str, screenshot: Dict[str, Any], baselines: Any, screenshots: Any) -> Optional[Fingerprint]:
+        """Fingerprint of the baseline for ``screenshot``, fetching and hashing it on a miss."""
+        known, fingerprint = self.get(key)
+        if known:
+            return fingerprint
+        try:
+            baseline = baselines.get_baseline_for_screenshot(screenshot)
+        except AnglesApiError as e:
+            if e.status_code != 404:
+                raise
+            baseline = None
+        from .requests import baseline_screenshot_id, first_baseline
+
+        screenshot_id = baseline_screenshot_id(first_baseline(baseline))
+        if screenshot_id:
+            fingerprint = Fingerprint.of(screenshot_id, screenshots.get_screenshot_image(screenshot_id))
+        self.put(key, fingerprint)
+        return fingerprint
+
+    def matches(self, fingerprint: Fingerprint, data: bytes) -> bool:
+        if content_hash(data) == fingerprint.content_hash:
+            return True
+        if self.max_distance <= 0 or fingerprint.phash is None:
+            return False
+        phash = perceptual_hash(data)
+        return phash is not None and hamming(phash, fingerprint.phash) <= self.max_distance
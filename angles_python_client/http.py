@@ -1,30 +1,93 @@
 from __future__ import annotations
 
 import requests
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
 from urllib.parse import urljoin
 
+from ._compression import choose_codec, compress
+from ._serialize import JsonStream, dumps_bytes
+from .cache import ResponseCache
+from .image_cache import ImageCache
 from .exceptions import AnglesApiError
+from .retry import CircuitBreaker, RetryPolicy, is_rewindable, rewind
 
 
 @dataclass
 class AnglesHttpClient:
-    """Thin wrapper around requests.Session with Angles defaults."""
+    """Thin wrapper around requests.Session with Angles defaults.
+
+    One client may be shared by any number of threads: ``request`` keeps no per-call state on
+    the instance, and the underlying urllib3 pool hands each thread its own connection. Size the
+    pool for the concurrency you expect:
+
+    - ``pool_maxsize``: connections kept per host (the per-host connection limit).
+    - ``pool_connections``: number of distinct hosts to keep pools for.
+    - ``pool_block``: when all ``pool_maxsize`` connections are busy, wait for one instead of
+      opening a throwaway extra connection. Enable this to cap connections to the server hard.
+    - ``keep_alive``: set ``False`` to send ``Connection: close`` and open a connection per call.
+
+    Pool options only apply to the session created here; a caller-supplied ``session`` is used
+    as is. HTTP/2 is not available through ``requests``; use ``AsyncAnglesHttpClient(http2=True)``.
+
+    JSON request bodies are sent uncompressed unless ``compression`` (``"gzip"``, or ``"zstd"``
+    with ``zstandard`` installed) is set; ``compression_endpoints`` overrides it per path prefix,
+    e.g. ``{"execution": "gzip", "screenshot": None}``. Bodies smaller than
+    ``compression_min_bytes`` are sent as is. A server answering 415 to a compressed body gets
+    the plain body instead and that codec is not used again by this client. Compressed
+    responses are negotiated through ``Accept-Encoding`` and decoded incrementally by urllib3.
+
+    Failures are not retried unless a :class:`~angles_python_client.retry.RetryPolicy` is set;
+    a :class:`~angles_python_client.retry.CircuitBreaker` makes calls fail fast while the server
+    is down. Share one breaker between clients to coordinate them.
+
+    With a :class:`~angles_python_client.cache.ResponseCache` as ``response_cache``, GETs of
+    reference data (teams, environments, baselines, versions) are served from the cache, and an
+    :class:`~angles_python_client.image_cache.ImageCache` as ``image_cache`` keeps downloaded
+    screenshot and compare images on disk.
+
+    ``typed_responses=True`` makes the ``get_*`` methods of the request classes return lazily
+    decoded models (see :mod:`angles_python_client.lazy_models`) instead of plain dicts.
+    """
 
     base_url: str = "http://127.0.0.1:3000/rest/api/v1.0/"
     timeout_s: float = 10.0
     session: Optional[requests.Session] = None
     default_headers: Optional[Dict[str, str]] = None
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keep_alive: bool = True
+    retry_policy: Optional[RetryPolicy] = None
+    circuit_breaker: Optional[CircuitBreaker] = None
+    compression: Optional[str] = None
+    compression_endpoints: Optional[Dict[str, Optional[str]]] = None
+    compression_min_bytes: int = 1024
+    response_cache: Optional[ResponseCache] = None
+    image_cache: Optional[ImageCache] = None
+    typed_responses: bool = False
+    _rejected_codecs: Set[str] = field(default_factory=set, init=False, repr=False)
 
     def __post_init__(self) -> None:
         if self.session is None:
             self.session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=self.pool_block,
+            )
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
         if self.default_headers is None:
             self.default_headers = {
                 "Accept": "application/json",
                 "Content-Type": "application/json",
             }
+        if not self.keep_alive:
+            # copied: the caller's dict may be shared with other clients
+            self.default_headers = {"Connection": "close", **self.default_headers}
 
     def set_base_url(self, base_url: str) -> None:
         if not base_url.endswith("/"):
@@ -49,28 +112,81 @@ class AnglesHttpClient:
         headers: Optional[Dict[str, str]] = None,
         timeout_s: Optional[float] = None,
         stream: bool = False,
+        idempotent: Optional[bool] = None,
     ) -> requests.Response:
+        """Send a request, applying ``retry_policy`` and ``circuit_breaker`` when configured.
+
+        ``idempotent`` overrides the policy's method/header based guess of whether the call may
+        be safely repeated.
+        """
         url = self._full_url(path_or_url)
         merged_headers: Dict[str, str] = dict(self.default_headers or {})
         if headers:
             merged_headers.update(headers)
 
-        try:
-            resp = self.session.request(
-                method=method.upper(),
-                url=url,
-                params=params,
-                json=json,
-                data=data,
-                files=files,
-                headers=merged_headers,
-                timeout=timeout_s if timeout_s is not None else self.timeout_s,
-                stream=stream,
-            )
-        except requests.RequestException as e:
-            raise AnglesApiError(f"Request failed: {e}", url=url) from e
+        if json is not None:
+            # encode once here (orjson when available) instead of letting requests re-encode per attempt
+            data, json = dumps_bytes(json), None
+            # requests/httpx would have set this for json=; custom default_headers may lack it
+            merged_headers.setdefault("Content-Type", "application/json")
+
+        plain_data = data
+        data, codec = self._compress_body(path_or_url, data, merged_headers)
+
+        # 304 is only an answer to a conditional request; otherwise there is no body to fall back on
+        revalidating = "If-None-Match" in merged_headers or "If-Modified-Since" in merged_headers
+        policy = self.retry_policy
+        breaker = self.circuit_breaker
+        if idempotent is None:
+            idempotent = policy.is_idempotent(method, merged_headers) if policy else False
+        can_resend = is_rewindable(data)
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = breaker is not None and breaker.before_request(url)
+            if attempt > 1:
+                rewind(data)
+            try:
+                resp = self.session.request(
+                    method=method.upper(),
+                    url=url,
+                    params=params,
+                    json=json,
+                    data=data,
+                    files=files,
+                    headers=merged_headers,
+                    timeout=timeout_s if timeout_s is not None else self.timeout_s,
+                    stream=stream,
+                )
+            except requests.RequestException as e:
+                if breaker is not None:
+                    breaker.record_failure()
+                if policy and can_resend and policy.should_retry_error(attempt, idempotent=idempotent, connect_failure=_is_connect_failure(e)):
+                    policy.sleep(policy.delay_s(attempt))
+                    continue
+                raise AnglesApiError(f"Request failed: {e}", url=url) from e
+            except BaseException:
+                if probe:
+                    breaker.release_probe()  # type: ignore[union-attr]
+                raise
+
+            if breaker is not None:
+                breaker.record_status(resp.status_code)
+            if 200 <= resp.status_code < 300 or (resp.status_code == 304 and revalidating):
+                return resp
+            if resp.status_code == 415 and codec is not None and can_resend:
+                # server cannot decode this codec: resend uncompressed, and stop using it
+                self._rejected_codecs.add(codec)
+                resp.close()
+                data, codec = plain_data, None
+                merged_headers.pop("Content-Encoding", None)
+                attempt -= 1
+                continue
+            if policy and can_resend and policy.should_retry_status(attempt, resp.status_code, idempotent=idempotent):
+                resp.close()
+                policy.sleep(policy.delay_s(attempt, resp.headers))
+                continue
 
-        if not (200 <= resp.status_code < 300):
             # Best effort to include body.
             text = None
             try:
@@ -83,4 +199,31 @@ class AnglesHttpClient:
                 url=url,
                 response_text=text,
             )
-        return resp
+
+    def _compress_body(self, path_or_url: str, data: Any, headers: Dict[str, str]) -> Tuple[Any, Optional[str]]:
+        """Compress a JSON body per the client's compression settings, updating ``headers``."""
+        if "Content-Encoding" in headers or not (isinstance(data, bytes) or isinstance(data, JsonStream)):
+            return data, None
+        codec = choose_codec(path_or_url, self.compression, self.compression_endpoints)
+        if codec is None or codec in self._rejected_codecs:
+            return data, None
+        if isinstance(data, JsonStream):
+            if data.compress:
+                return data, None
+            data = JsonStream(data.obj, chunk_size=data.chunk_size, compress=codec)
+        elif len(data) >= self.compression_min_bytes:
+            data = compress(data, codec)
+        else:
+            return data, None
+        headers["Content-Encoding"] = codec
+        return data, codec
+
+
+def _is_connect_failure(exc: requests.RequestException) -> bool:
+    """True when the request never reached the server, so resending cannot duplicate it."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError) and not isinstance(exc, requests.exceptions.ReadTimeout):
+        reason = getattr(exc.args[0], "reason", None) if exc.args else None
+        return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+    return False
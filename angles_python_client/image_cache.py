@@ -0,0 +1,145 @@
+"""Size-capped disk cache for screenshot image bytes.
+
+Screenshot images never change once stored, so ``ScreenshotRequests.get_screenshot_image`` and
+``get_baseline_compare_image`` can answer from disk when the HTTP client has an ``image_cache``.
+Files are written atomically (temp file + rename) and read through ``mmap``; any number of
+processes may share one directory.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+_SUFFIX = ".img"
+
+
+class ImageCache:
+    """LRU cache of image bytes under ``directory``, holding at most about ``max_bytes``.
+
+    Recency is tracked through file mtimes (touched on every hit), so eviction order is shared
+    by all processes using the directory. The size cap is enforced by whichever process pushes
+    its running estimate over ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._approx_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, key: str) -> str:
+        # keys look like "<namespace>/<id>..."; each namespace gets its own subdirectory
+        namespace = key.split("/", 1)[0] or "_"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, namespace, digest[:2], digest + _SUFFIX)
+
+    @contextlib.contextmanager
+    def open(self, key: str) -> Iterator[Optional[memoryview]]:
+        """Yield a read-only, memory-mapped view of a cached image, or ``None`` on a miss."""
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            yield None
+            return
+        with f:
+            _touch(path)
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """The cached image as ``bytes``, or ``None`` on a miss; :meth:`open` avoids the copy."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        _touch(path)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            _unlink(tmp)
+            raise
+        with self._lock:
+            self._approx_bytes += len(data)
+            over = self._approx_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def evict(self) -> int:
+        """Remove least recently used images until the cache fits ``max_bytes``; returns bytes freed."""
+        files = sorted(self._scan())
+        total = sum(size for _, size, _ in files)
+        freed = 0
+        for _, size, path in files:
+            if total - freed <= self.max_bytes:
+                break
+            if _unlink(path):
+                freed += size
+        with self._lock:
+            self._approx_bytes = total - freed
+        return freed
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove every cached image, or only those whose key starts with ``namespace + "/"``."""
+        freed = 0
+        for _, size, path in self._scan(namespace):
+            if _unlink(path):
+                freed += size
+        with self._lock:
+            self._approx_bytes = max(0, self._approx_bytes - freed)
+
+    def _scan(self, namespace: Optional[str] = None) -> List[Tuple[float, int, str]]:
+        out = []
+        top = os.path.join(self.directory, namespace) if namespace else self.directory
+        for root, _, names in os.walk(top):
+            for name in names:
+                if name.endswith(_SUFFIX):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    out.append((st.st_mtime, st.st_size, path))
+        return out
+
+
+def _touch(path: str) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _unlink(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,151 @@
+"""Local, NumPy-based screenshot comparison (an alternative to the server's baseline compare).
+
+Results use the server's :class:`~angles_python_client.models.responses.ImageCompareResponse`
+shape. A pixel counts as mismatched when any RGBA channel differs by more than ``tolerance``;
+pixels inside ignore boxes always match. When the dimensions differ, the overlapping area is
+compared and every pixel outside it counts as mismatched.
+
+Requires the ``diff`` extra: ``pip install angles-python-client[diff]`` (NumPy and Pillow).
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .models.ignore_box import IgnoreBox
+from .models.responses import ImageCompareResponse
+from .results import ItemResult
+
+try:  # optional: local compare
+    import numpy as _np
+    from PIL import Image as _Image
+except ImportError:  # pragma: no cover - depends on environment
+    _np = None
+    _Image = None
+
+ImageSource = Union[bytes, str, "os.PathLike[str]"]
+
+# resemble.js-style diff colouring
+_DIFF_COLOUR = (255, 0, 255, 255)
+
+
+def _require() -> None:
+    if _np is None or _Image is None:
+        raise ImportError("Local image compare requires numpy and Pillow: pip install angles-python-client[diff]")
+
+
+def load_image(source: ImageSource) -> Any:
+    """Decode PNG/JPEG bytes or a file path into an ``(height, width, 4)`` uint8 array."""
+    _require()
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source
+    with _Image.open(stream) as img:
+        return _np.asarray(img.convert("RGBA"))
+
+
+def _box(box: Union[IgnoreBox, Dict[str, Any]]) -> Tuple[int, int, int, int]:
+    get = box.get if isinstance(box, dict) else (lambda k: getattr(box, k))
+    return int(get("left") or 0), int(get("top") or 0), int(get("right") or 0), int(get("bottom") or 0)
+
+
+def mismatch_mask(baseline: Any, candidate: Any, *, ignore_boxes: Optional[Sequence[Any]] = None, tolerance: int = 0) -> Any:
+    """Boolean ``(h, w)`` mask of mismatched pixels over the overlapping area of two RGBA arrays."""
+    _require()
+    height = min(baseline.shape[0], candidate.shape[0])
+    width = min(baseline.shape[1], candidate.shape[1])
+    a = baseline[:height, :width].astype(_np.int16)
+    b = candidate[:height, :width].astype(_np.int16)
+    mask = (_np.abs(a - b) > tolerance).any(axis=2)
+    for box in ignore_boxes or ():
+        left, top, right, bottom = _box(box)
+        mask[max(top, 0):max(bottom, 0), max(left, 0):max(right, 0)] = False
+    return mask
+
+
+def render_diff(candidate: Any, mask: Any) -> bytes:
+    """PNG of ``candidate`` faded to grey with mismatched pixels highlighted."""
+    _require()
+    height, width = mask.shape
+    grey = candidate[:height, :width, :3].mean(axis=2, keepdims=True)
+    out = _np.empty((height, width, 4), dtype=_np.uint8)
+    out[..., :3] = (grey * 0.3 + 178).astype(_np.uint8)
+    out[..., 3] = 255
+    out[mask] = _DIFF_COLOUR
+    buf = io.BytesIO()
+    _Image.fromarray(out, "RGBA").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def compare_images(
+    baseline: ImageSource,
+    candidate: ImageSource,
+    *,
+    ignore_boxes: Optional[Sequence[Any]] = None,
+    tolerance: int = 0,
+    diff_path: Optional[str] = None,
+) -> ImageCompareResponse:
+    """Compare two images locally; with ``diff_path`` also write a diff PNG there."""
+    started = time.perf_counter()
+    a, b = load_image(baseline), load_image(candidate)
+    mask = mismatch_mask(a, b, ignore_boxes=ignore_boxes, tolerance=tolerance)
+    total = max(a.shape[0], b.shape[0]) * max(a.shape[1], b.shape[1])
+    mismatched = int(mask.sum()) + total - mask.size
+    raw = 100.0 * mismatched / total if total else 0.0
+    if diff_path:
+        with open(diff_path, "wb") as f:
+            f.write(render_diff(b, mask))
+    return ImageCompareResponse(
+        isSameDimensions=a.shape[:2] == b.shape[:2],
+        rawMisMatchPercentage=raw,
+        misMatchPercentage=round(raw, 2),
+        analysisTime=round((time.perf_counter() - started) * 1000, 3),
+    )
+
+
+@dataclass
+class CompareJob:
+    """One comparison for :func:`compare_many`; images are bytes or file paths (picklable)."""
+
+    baseline: ImageSource
+    candidate: ImageSource
+    ignore_boxes: Optional[List[Any]] = None
+    tolerance: int = 0
+    diff_path: Optional[str] = None
+
+
+def _run_job(job: CompareJob) -> ImageCompareResponse:
+    return compare_images(job.baseline, job.candidate, ignore_boxes=job.ignore_boxes, tolerance=job.tolerance, diff_path=job.diff_path)
+
+
+def compare_many(jobs: Iterable[CompareJob], *, max_workers: Optional[int] = None) -> Iterator[ItemResult]:
+    """Run comparisons in a process pool, yielding an :class:`ItemResult` as each one finishes.
+
+    ``jobs`` is consumed lazily with at most ``2 * max_workers`` comparisons queued, so large
+    batches of images are not all held in memory.
+    """
+    _require()
+    workers = max_workers or os.cpu_count() or 1
+    it = iter(enumerate(jobs))
+    in_flight: Dict[Future, Tuple[int, CompareJob]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+
+        def _fill() -> None:
+            while len(in_flight) < 2 * workers:
+                try:
+                    index, job = next(it)
+                except StopIteration:
+                    return
+                in_flight[pool.submit(_run_job, job)] = (index, job)
+
+        _fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                index, job = in_flight.pop(fut)
+                error = fut.exception()
+                yield ItemResult(index=index, item=job, result=None if error else fut.result(), error=error)
+            _fill()
@@ -0,0 +1,185 @@
+"""Incremental execution reporting: finished actions leave memory while the test is still running.
+
+With ``AnglesReporter.enable_incremental`` the reporter opens an execution in an
+:class:`ExecutionJournal` at ``start_test`` and hands it batches of finished actions (see
+:class:`ActionBatch`), keeping only the open action in memory. ``save_test`` closes the
+execution.
+
+The Angles API only accepts whole executions, so the bundled :class:`LocalExecutionJournal`
+is a local stand-in: deltas are appended to a file per execution, and closing uploads the
+assembled execution as one streamed request. Subclass :class:`ExecutionJournal` to push the
+deltas to a server that accepts them.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ._serialize import dumps_bytes, jsonable
+from .results import ItemResult
+from .spool import _pid_alive, _read_jsonl
+from .upload_queue import resolve_futures
+
+
+class ExecutionJournal:
+    """Destination of an incrementally reported execution."""
+
+    def open(self, execution: Dict[str, Any]) -> str:
+        """Start an execution (its fields without ``actions``); returns a key for the calls below."""
+        raise NotImplementedError
+
+    def append(self, key: str, actions: List[Dict[str, Any]]) -> None:
+        """Record finished actions, in order."""
+        raise NotImplementedError
+
+    def close(self, key: str, execution: Dict[str, Any]) -> Any:
+        """Finish the execution with its final fields; returns the server response."""
+        raise NotImplementedError
+
+    def discard(self, key: str) -> None:
+        """Drop an execution that will never be closed."""
+
+
+class _JournalActions:
+    """The actions of a journal file, read back one at a time by the streaming encoder."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def iter_jsonable(self) -> Iterator[Dict[str, Any]]:
+        for record in _read_jsonl(self.path):
+            yield from record.get("actions") or ()
+
+    def __jsonable__(self) -> List[Dict[str, Any]]:
+        return list(self.iter_jsonable())
+
+
+class LocalExecutionJournal(ExecutionJournal):
+    """One append-only ``<pid>-<key>.journal`` file per execution under ``directory``.
+
+    ``close`` passes ``save_execution`` the execution with its actions streamed from the file
+    (suitable for ``ExecutionRequests.save_execution(body, stream=True)``) and deletes the file
+    once that succeeds. Files left behind by a crash or a failed upload are uploaded by
+    :meth:`recover`. Thread-safe.
+    """
+
+    def __init__(self, directory: str, save_execution: Callable[[Any], Any], *, fsync: bool = False) -> None:
+        self.directory = directory
+        self.save_execution = save_execution
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._open: Dict[str, str] = {}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{os.getpid()}-{key}.journal")
+
+    def _write(self, path: str, record: Dict[str, Any]) -> None:
+        with open(path, "ab") as f:
+            f.write(dumps_bytes(record) + b"\n")
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def open(self, execution: Dict[str, Any]) -> str:
+        key = uuid.uuid4().hex
+        path = self._path(key)
+        self._write(path, {"execution": execution})
+        with self._lock:
+            self._open[key] = path
+        return key
+
+    def append(self, key: str, actions: List[Dict[str, Any]]) -> None:
+        self._write(self._open[key], {"actions": actions})
+
+    def close(self, key: str, execution: Dict[str, Any]) -> Any:
+        with self._lock:
+            path = self._open.pop(key)
+        self._write(path, {"execution": execution})
+        return self._upload(path)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            path = self._open.pop(key, None)
+        if path is not None:
+            os.remove(path)
+
+    def _upload(self, path: str) -> Any:
+        header: Dict[str, Any] = {}
+        for record in _read_jsonl(path):
+            if "execution" in record:
+                header = record["execution"]
+        result = self.save_execution({**header, "actions": _JournalActions(path)})
+        os.remove(path)
+        return result
+
+    def pending(self) -> List[str]:
+        """Journal files not being written by a live process (this one included)."""
+        with self._lock:
+            mine = set(self._open.values())
+        out = []
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.journal"))):
+            owner = os.path.basename(path).split("-", 1)[0]
+            if path in mine or (owner.isdigit() and int(owner) != os.getpid() and _pid_alive(int(owner))):
+                continue
+            out.append(path)
+        return out
+
+    def recover(self) -> List[ItemResult]:
+        """Upload every :meth:`pending` execution with the actions recorded so far."""
+        results = []
+        for index, path in enumerate(self.pending()):
+            try:
+                results.append(ItemResult(index=index, item=path, result=self._upload(path)))
+            except Exception as e:
+                results.append(ItemResult(index=index, item=path, error=e))
+        return results
+
+
+class ActionBatch:
+    """Coalesces finished actions of one execution into journal appends.
+
+    Actions are sent once ``max_actions`` are waiting or ``max_delay_s`` has passed since the
+    last append; the check runs whenever an action is added. Pending screenshot uploads
+    referenced by the actions are waited for when they are sent.
+    """
+
+    def __init__(self, journal: ExecutionJournal, key: str, *, max_actions: int = 20, max_delay_s: float = 2.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.journal = journal
+        self.key = key
+        self.max_actions = max_actions
+        self.max_delay_s = max_delay_s
+        self._clock = clock
+        self._pending: List[Any] = []
+        self._last_flush = clock()
+
+    def add(self, action: Any) -> None:
+        self._pending.append(action)
+        if len(self._pending) >= self.max_actions or self._clock() - self._last_flush >= self.max_delay_s:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self.journal.append(self.key, resolve_futures(jsonable(self._pending)))
+            self._pending = []
+        self._last_flush = self._clock()
+
+    def close(self, execution: Dict[str, Any]) -> Any:
+        self.flush()
+        return self.journal.close(self.key, execution)
+
+    def discard(self) -> None:
+        self._pending = []
+        self.journal.discard(self.key)
+
+
+def execution_header(execution: Any) -> Dict[str, Any]:
+    """JSON fields of an execution without its actions."""
+    header = jsonable(execution)
+    header.pop("actions", None)
+    return resolve_futures(header)
@@ -0,0 +1,227 @@
+"""Typed, lazily decoded views of API responses.
+
+``lazy(raw, Build)`` wraps a decoded JSON dict in a slotted class with one property per
+:class:`~angles_python_client.models.Build` field. Nothing is converted up front: datetimes and
+enums are parsed, and nested models and lists wrapped, the first time a field is read (then
+memoised). Large responses such as build reports therefore cost little more than the dicts
+``json.loads`` produced, however deep the ``Execution`` -> ``Action`` -> ``Step`` nesting.
+
+:func:`decode` is the eager counterpart, building the real dataclasses in one pass.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime as _dt
+import functools
+import typing
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+_MISSING = object()
+_Convert = Callable[[Any], Any]
+
+
+def _parse_datetime(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    try:
+        return _dt.datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        return value
+
+
+def _parse_date(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    try:
+        return _dt.date.fromisoformat(value[:10])
+    except ValueError:
+        return value
+
+
+def _parse_enum(cls: type, value: Any) -> Any:
+    try:
+        return cls(value)
+    except ValueError:
+        return value
+
+
+class LazyList(Sequence):
+    """Read-only list whose items are converted on first access."""
+
+    __slots__ = ("_raw", "_convert", "_items")
+
+    def __init__(self, raw: List[Any], convert: _Convert) -> None:
+        self._raw = raw
+        self._convert = convert
+        self._items: Optional[List[Any]] = None
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._raw)))]
+        items = self._items
+        if items is None:
+            items = self._items = [_MISSING] * len(self._raw)
+        item = items[index]
+        if item is _MISSING:
+            item = items[index] = self._convert(self._raw[index])
+        return item
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self._raw)):
+            yield self[i]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyList):
+            return self._raw == other._raw
+        return isinstance(other, list) and list(self) == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"LazyList(len={len(self._raw)})"
+
+    @property
+    def raw(self) -> List[Any]:
+        return self._raw
+
+    def __jsonable__(self) -> List[Any]:
+        return self._raw
+
+
+class LazyModel:
+    """Base of the generated lazy classes; ``raw`` is the underlying dict."""
+
+    __slots__ = ("_raw", "_cache")
+    _model: type = object
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self._raw = raw
+        self._cache: Optional[Dict[str, Any]] = None
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        return self._raw
+
+    def to_model(self) -> Any:
+        """Decode everything into the real dataclass."""
+        return decode(self._raw, self._model)
+
+    def __jsonable__(self) -> Dict[str, Any]:
+        return self._raw
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, LazyModel) and other._model is self._model and other._raw == self._raw
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        ident = self._raw.get("_id")
+        return f"Lazy{self._model.__name__}({'_id=' + repr(ident) if ident else '...'})"
+
+
+def _field(name: str, convert: Optional[_Convert]) -> property:
+    if convert is None:
+        def fget(self: LazyModel) -> Any:
+            return self._raw.get(name)
+    else:
+        def fget(self: LazyModel) -> Any:
+            cache = self._cache
+            if cache is None:
+                cache = self._cache = {}
+            value = cache.get(name, _MISSING)
+            if value is _MISSING:
+                value = self._raw.get(name)
+                if value is not None:
+                    value = convert(value)
+                cache[name] = value
+            return value
+    return property(fget)
+
+
+@functools.lru_cache(maxsize=None)
+def lazy_class(model: type) -> type:
+    """The lazy class for a model dataclass (generated once per model)."""
+    hints = typing.get_type_hints(model)
+    namespace: Dict[str, Any] = {"__slots__": (), "_model": model, "__doc__": f"Lazily decoded :class:`{model.__name__}`."}
+    for f in dataclasses.fields(model):
+        namespace[f.name] = _field(f.name, _converter(hints[f.name], True))
+    return type(f"Lazy{model.__name__}", (LazyModel,), namespace)
+
+
+def _dataclass_converter(model: type, lazily: bool) -> _Convert:
+    if lazily:
+        def convert(value: Any) -> Any:
+            return lazy_class(model)(value) if isinstance(value, dict) else value
+    else:
+        def convert(value: Any) -> Any:
+            return _decode_dataclass(model, value) if isinstance(value, dict) else value
+    return convert
+
+
+@functools.lru_cache(maxsize=None)
+def _converter(hint: Any, lazily: bool) -> Optional[_Convert]:
+    """How to turn a JSON value into ``hint``; ``None`` when it is used as is."""
+    origin = typing.get_origin(hint)
+    if origin is Union:
+        args = [a for a in typing.get_args(hint) if a is not type(None)]
+        return _converter(args[0], lazily) if len(args) == 1 else None
+    if origin in (list, List):
+        args = typing.get_args(hint)
+        item = _converter(args[0], lazily) if args else None
+        if item is None:
+            return None
+        if lazily:
+            return lambda value: LazyList(value, item) if isinstance(value, list) else value
+        return lambda value: [item(v) for v in value] if isinstance(value, list) else value
+    if hint is _dt.datetime:
+        return _parse_datetime
+    if hint is _dt.date:
+        return _parse_date
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return functools.partial(_parse_enum, hint)
+    if dataclasses.is_dataclass(hint):
+        return _dataclass_converter(hint, lazily)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _eager_fields(model: type) -> Tuple[Tuple[str, Optional[_Convert]], ...]:
+    hints = typing.get_type_hints(model)
+    return tuple((f.name, _converter(hints[f.name], False)) for f in dataclasses.fields(model) if f.init)
+
+
+def _decode_dataclass(model: type, raw: Dict[str, Any]) -> Any:
+    kwargs = {}
+    for name, convert in _eager_fields(model):
+        if name in raw:
+            value = raw[name]
+            kwargs[name] = convert(value) if convert is not None and value is not None else value
+    return model(**kwargs)
+
+
+def lazy(raw: Any, model: type) -> Any:
+    """Wrap a decoded response: a dict becomes a lazy ``model``, a list a :class:`LazyList` of them."""
+    if isinstance(raw, dict):
+        return lazy_class(model)(raw)
+    if isinstance(raw, list):
+        return LazyList(raw, _dataclass_converter(model, True))
+    return raw
+
+
+def decode(raw: Any, model: type) -> Any:
+    """Eagerly decode a response (dict or list of dicts) into ``model`` dataclasses."""
+    if isinstance(raw, dict):
+        return _decode_dataclass(model, raw)
+    if isinstance(raw, list):
+        return [_decode_dataclass(model, v) if isinstance(v, dict) else v for v in raw]
+    return raw
+
+
+def unwrap(value: Any) -> Any:
+    """The raw JSON behind a lazy model or list; anything else is returned unchanged."""
+    return value._raw if isinstance(value, (LazyModel, LazyList)) else value
@@ -9,6 +9,7 @@ from .build import Build
 from .execution import Execution
 from .action import Action
 from .step import Step
+from .step_log import StepLog
 from .versions import Versions
 
 from .enums import ExecutionStates, StepStates, GroupingPeriods
@@ -31,6 +32,8 @@ from .responses import (
     ScreenshotMetrics,
     Period,
     ScreenshotMetric,
+    Suite,
+    BuildReport,
 )
 
 __all__ = [
@@ -45,6 +48,7 @@ __all__ = [
     "Execution",
     "Action",
     "Step",
+    "StepLog",
     "Versions",
     "ExecutionStates",
     "StepStates",
@@ -63,4 +67,6 @@ __all__ = [
     "ScreenshotMetrics",
     "Period",
     "ScreenshotMetric",
+    "Suite",
+    "BuildReport",
 ]
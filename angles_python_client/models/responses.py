@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 from .build import Build
+from .enums import ExecutionStates
 from .execution import Execution
 from .requests import ScreenshotPlatform
 
@@ -26,6 +27,21 @@ class ExecutionResponse:
     builds: Optional[List[Execution]] = None  # kept as 'builds' for like-for-like
 
 
+@dataclass
+class Suite:
+    name: Optional[str] = None
+    executions: Optional[List[Execution]] = None
+    status: Optional[ExecutionStates] = None
+    result: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class BuildReport(Build):
+    """``GET build/{id}/report``: a build with its suites' executions populated."""
+
+    suites: Optional[List[Suite]] = None
+
+
 @dataclass
 class ImageCompareResponse:
     isSameDimensions: Optional[bool] = None
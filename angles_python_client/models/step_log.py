@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import datetime as _dt
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, overload
+
+from .enums import StepStates
+from .step import Step
+
+_NO_TIMESTAMP = -(2 ** 63)
+
+# status value <-> small int code, shared by every StepLog
+_STATUS_TABLE: List[Any] = [None, *StepStates]
+_STATUS_CODES: Dict[Any, int] = {v: i for i, v in enumerate(_STATUS_TABLE)}
+_STATUS_LOCK = threading.Lock()
+# codes are stored in array("H"); the table is process-wide, so it is capped rather than left to overflow
+_MAX_STATUSES = 1 << 16
+
+
+def _status_code(status: Any) -> int:
+    code = _STATUS_CODES.get(status)
+    if code is None:
+        with _STATUS_LOCK:
+            code = _STATUS_CODES.get(status)
+            if code is None:
+                code = len(_STATUS_TABLE)
+                if code >= _MAX_STATUSES:
+                    raise ValueError(f"More than {_MAX_STATUSES} distinct step statuses; use StepStates values")
+                _STATUS_TABLE.append(status)
+                _STATUS_CODES[status] = code
+    return code
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if type(value) is str else value
+
+
+class StepLog(Sequence):
+    """Column-oriented, append-only storage for an action's steps.
+
+    Used by :class:`AnglesReporter` in place of ``List[Step]``: names are interned, statuses are
+    stored as two-byte codes and timestamps as microsecond offsets (from a monotonic clock) in an
+    ``array``, so no per-step object is kept alive. ``Step`` objects are only built when items
+    are read, and serialization emits JSON-ready dicts directly.
+    """
+
+    __slots__ = ("_base_wall", "_base_mono_ns", "_names", "_expected", "_actual", "_info", "_status", "_offsets", "_screenshots", "_odd_timestamps")
+
+    def __init__(self, steps: Iterable[Step] = ()) -> None:
+        self._base_wall = _dt.datetime.now()
+        self._base_mono_ns = time.monotonic_ns()
+        self._names: List[Optional[str]] = []
+        self._expected: List[Optional[str]] = []
+        self._actual: List[Optional[str]] = []
+        self._info: List[Optional[str]] = []
+        self._status = array("H")
+        self._offsets = array("q")
+        self._screenshots: List[Any] = []
+        # timestamps that cannot be expressed as an offset (e.g. tz-aware), by index
+        self._odd_timestamps: Optional[Dict[int, _dt.datetime]] = None
+        for step in steps:
+            self.append(step)
+
+    def add(
+        self,
+        name: Optional[str],
+        expected: Optional[str],
+        actual: Optional[str],
+        info: Optional[str],
+        status: Any,
+        screenshot: Any = None,
+    ) -> None:
+        """Record a step stamped with the current time, without creating a ``Step``."""
+        self._names.append(_intern(name))
+        self._expected.append(expected)
+        self._actual.append(actual)
+        self._info.append(info)
+        self._status.append(_status_code(status))
+        self._offsets.append((time.monotonic_ns() - self._base_mono_ns) // 1000)
+        self._screenshots.append(screenshot)
+
+    def append(self, step: Step) -> None:
+        self._names.append(_intern(step.name))
+        self._expected.append(step.expected)
+        self._actual.append(step.actual)
+        self._info.append(step.info)
+        self._status.append(_status_code(step.status))
+        ts = step.timestamp
+        if ts is None:
+            self._offsets.append(_NO_TIMESTAMP)
+        elif isinstance(ts, _dt.datetime) and ts.tzinfo is None:
+            self._offsets.append((ts - self._base_wall) // _dt.timedelta(microseconds=1))
+        else:
+            if self._odd_timestamps is None:
+                self._odd_timestamps = {}
+            self._odd_timestamps[len(self._offsets)] = ts
+            self._offsets.append(_NO_TIMESTAMP)
+        self._screenshots.append(step.screenshot)
+
+    def extend(self, steps: Iterable[Step]) -> None:
+        for step in steps:
+            self.append(step)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _timestamp(self, i: int) -> Optional[_dt.datetime]:
+        offset = self._offsets[i]
+        if offset == _NO_TIMESTAMP:
+            return self._odd_timestamps.get(i) if self._odd_timestamps else None
+        return self._base_wall + _dt.timedelta(microseconds=offset)
+
+    def _step(self, i: int) -> Step:
+        return Step(
+            name=self._names[i],
+            expected=self._expected[i],
+            actual=self._actual[i],
+            info=self._info[i],
+            status=_STATUS_TABLE[self._status[i]],
+            timestamp=self._timestamp(i),
+            screenshot=self._screenshots[i],
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Step: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Step]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Step, List[Step]]:
+        if isinstance(index, slice):
+            return [self._step(i) for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("StepLog index out of range")
+        return self._step(index)
+
+    def __iter__(self) -> Iterator[Step]:
+        for i in range(len(self)):
+            yield self._step(i)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (StepLog, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"StepLog(<{len(self)} steps>)"
+
+    def __jsonable__(self) -> List[Dict[str, Any]]:
+        return list(self.iter_jsonable())
+
+    def iter_jsonable(self) -> Iterator[Dict[str, Any]]:
+        """Yield each step as a JSON-ready dict (used by the streaming encoder)."""
+        statuses = _STATUS_TABLE
+        for i in range(len(self._names)):
+            d: Dict[str, Any] = {}
+            v = self._names[i]
+            if v is not None:
+                d["name"] = v
+            v = self._expected[i]
+            if v is not None:
+                d["expected"] = v
+            v = self._actual[i]
+            if v is not None:
+                d["actual"] = v
+            v = self._info[i]
+            if v is not None:
+                d["info"] = v
+            status = statuses[self._status[i]]
+            if status is not None:
+                d["status"] = status.value if isinstance(status, StepStates) else status
+            ts = self._timestamp(i)
+            if ts is not None:
+                d["timestamp"] = ts.isoformat() if isinstance(ts, _dt.date) else ts
+            v = self._screenshots[i]
+            if v is not None:
+                d["screenshot"] = v
+            yield d
@@ -0,0 +1,247 @@
+"""pytest plugin reporting a test session to Angles.
+
+Installed as the ``angles`` pytest plugin (``pytest11`` entry point) and inert unless pytest
+runs with ``--angles``. Then the session becomes a build, every test an execution and its
+setup/call/teardown phases the execution's actions, each ending with a step holding the
+phase's outcome. Steps logged through ``angles_reporter`` (or the ``angles`` fixture) inside a
+test land in the action of the phase that logged them.
+
+Executions are encoded and uploaded by background threads, so a test only pays for recording
+its steps and handing the execution to the upload queue (see
+``benchmarks/bench_pytest_plugin.py``). Under pytest-xdist the controller creates the build
+and, where Unix sockets exist, runs an
+:class:`~angles_python_client.aggregator.AggregatorServer` that every worker uploads through;
+the workers' upload threads then pass executions on to it.
+
+Every option can also be set through the environment variable named in its help text.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, List, Optional
+
+import pytest
+
+from ._serialize import jsonable
+from .aggregator import AggregatorServer
+from .models import CreateExecution
+from .reporter import AnglesReporter, angles_reporter
+from .upload_queue import UploadQueue, resolve_futures
+
+logger = logging.getLogger(__name__)
+
+# option name -> (environment variable, help)
+_OPTIONS = {
+    "angles_url": ("ANGLES_URL", "Angles API base URL"),
+    "angles_build_id": ("ANGLES_BUILD_ID", "report into this existing build"),
+    "angles_build_name": ("ANGLES_BUILD_NAME", "name of the build to create (default: the rootdir name)"),
+    "angles_team": ("ANGLES_TEAM", "team of the build to create"),
+    "angles_environment": ("ANGLES_ENVIRONMENT", "environment of the build to create"),
+    "angles_component": ("ANGLES_COMPONENT", "component of the build to create"),
+    "angles_phase": ("ANGLES_PHASE", "phase of the build to create"),
+}
+
+# upload queue kind for batches of finished executions, handed over as models
+_EXECUTION_BATCH = "angles-plugin-executions"
+
+
+def pytest_addoption(parser: Any) -> None:
+    group = parser.getgroup("angles", "report results to an Angles dashboard")
+    group.addoption("--angles", action="store_true", default=False, help="report this session to Angles")
+    for dest, (env, help) in _OPTIONS.items():
+        group.addoption("--" + dest.replace("_", "-"), dest=dest, default=None, help=f"{help} (env: {env})")
+    group.addoption("--angles-upload-workers", type=int, default=2, help="background upload threads (default: 2)")
+    group.addoption(
+        "--angles-batch-size", type=int, default=100, help="executions handed to the upload threads at once (default: 100)"
+    )
+
+
+def _option(config: Any, dest: str) -> Optional[str]:
+    return config.getoption(dest) or os.environ.get(_OPTIONS[dest][0])
+
+
+def pytest_configure(config: Any) -> None:
+    if config.getoption("angles"):
+        config.pluginmanager.register(AnglesPlugin(config), "angles-reporter")
+
+
+@pytest.fixture
+def angles(request: Any) -> AnglesReporter:
+    """The reporter recording the current test (``angles_reporter`` unless the plugin was given another)."""
+    plugin = request.config.pluginmanager.get_plugin("angles-reporter")
+    return plugin.reporter if plugin is not None else angles_reporter
+
+
+class AnglesPlugin:
+    """Session-level hooks, registered with ``--angles``; tests are recorded by :class:`TestRecorder`."""
+
+    def __init__(self, config: Any, reporter: Optional[AnglesReporter] = None) -> None:
+        self.config = config
+        self.reporter = reporter or angles_reporter
+        self.aggregator: Optional[AggregatorServer] = None
+        self.recorder: Optional[TestRecorder] = None
+        self.upload_queue: Optional[UploadQueue] = None
+        self.failed_uploads = 0
+        self._failures_lock = threading.Lock()  # done callbacks run on the upload threads
+        url = _option(config, "angles_url")
+        if url:
+            self.reporter.set_base_url(url)
+        self._workerinput = getattr(config, "workerinput", None)
+
+    # --- session <-> build ---
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionstart(self, session: Any) -> None:
+        reporter = self.reporter
+        socket_path = None
+        if self._workerinput is not None:
+            reporter.set_current_build(self._workerinput["angles_build_id"])
+            socket_path = self._workerinput.get("angles_socket")
+        else:
+            self._start_build()
+            if self.config.pluginmanager.has_plugin("dsession"):
+                self._start_aggregator()
+                return  # the controller runs no tests
+        workers = self.config.getoption("angles_upload_workers")
+        if socket_path:
+            # the socket round trip per execution stays off the test's thread as well
+            reporter.enable_aggregator(socket_path)
+            self.upload_queue = UploadQueue({_EXECUTION_BATCH: self._upload_batch}, workers=workers)
+        else:
+            self.upload_queue = reporter.enable_background_uploads(workers=workers)
+            self.upload_queue.handlers[_EXECUTION_BATCH] = self._upload_batch
+        self.recorder = TestRecorder(reporter, self, batch_size=self.config.getoption("angles_batch_size"))
+        self.config.pluginmanager.register(self.recorder, "angles-recorder")
+
+    def _upload_batch(self, executions: List[CreateExecution]) -> int:
+        # runs on an upload thread; finished executions are never touched again, so they are
+        # encoded here rather than on the test's thread. Returns the number of failed uploads.
+        aggregator = self.reporter.aggregator
+        save = aggregator.save_execution if aggregator is not None else self.reporter.executions.save_execution
+        failed = 0
+        for execution in executions:
+            try:
+                save(resolve_futures(jsonable(execution)))
+            except Exception as e:
+                logger.warning("Angles execution upload failed: %s", e)
+                failed += 1
+        return failed
+
+    def _start_build(self) -> None:
+        build_id = _option(self.config, "angles_build_id")
+        if build_id:
+            self.reporter.set_current_build(build_id)
+            return
+        team, environment, component = (_option(self.config, k) for k in ("angles_team", "angles_environment", "angles_component"))
+        if not (team and environment and component):
+            raise pytest.UsageError("--angles needs --angles-build-id, or --angles-team, --angles-environment and --angles-component")
+        name = _option(self.config, "angles_build_name") or os.path.basename(str(self.config.rootpath))
+        self.reporter.start_build(name, team, environment, component, _option(self.config, "angles_phase"))
+
+    def _start_aggregator(self) -> None:
+        if not hasattr(socket, "AF_UNIX"):
+            return
+        path = os.path.join(tempfile.mkdtemp(prefix="angles-"), "aggregator.sock")
+        self.aggregator = AggregatorServer(path, self.reporter.http).start()
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node: Any) -> None:
+        # pytest-xdist: hand the build (and aggregator) to each worker
+        node.workerinput["angles_build_id"] = self.reporter.current_build["_id"]  # type: ignore[index]
+        if self.aggregator is not None:
+            node.workerinput["angles_socket"] = self.aggregator.socket_path
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: Any) -> None:
+        if self.recorder is not None:
+            self.recorder.flush()
+        if self.upload_queue is not None:
+            self.upload_queue.close()  # before the reporter closes the aggregator connection
+        self.reporter.close()
+        if self.aggregator is not None:
+            self.add_failed_uploads(self.aggregator.stop()["failed"])
+            os.rmdir(os.path.dirname(self.aggregator.socket_path))
+
+    def add_failed_uploads(self, count: int) -> None:
+        with self._failures_lock:
+            self.failed_uploads += count
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if self.failed_uploads:
+            terminalreporter.write_line(f"angles: {self.failed_uploads} execution(s) could not be uploaded", red=True)
+
+
+class TestRecorder:
+    """Per-test hooks: test -> execution, setup/call/teardown -> actions."""
+
+    __test__ = False  # not a test class, despite the name
+
+    def __init__(self, reporter: AnglesReporter, plugin: AnglesPlugin, *, batch_size: int = 100, max_delay_s: float = 1.0) -> None:
+        self.reporter = reporter
+        self.plugin = plugin
+        self.batch_size = batch_size
+        self.max_delay_s = max_delay_s
+        self._batch: List[CreateExecution] = []
+        self._batch_started = 0.0
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logstart(self, nodeid: str, location: Any) -> None:
+        suite, _, title = nodeid.rpartition("::")
+        self.reporter.start_test(title, suite)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: Any) -> None:
+        self.reporter.add_action("setup")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_call(self, item: Any) -> None:
+        self.reporter.add_action("call")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_teardown(self, item: Any, nextitem: Any) -> None:
+        self.reporter.add_action("teardown")
+
+    def pytest_runtest_logreport(self, report: Any) -> None:
+        reporter = self.reporter
+        if reporter.current_action is None or reporter.current_action.name != report.when:
+            reporter.add_action(report.when)  # e.g. a setup skipped by a mark
+        if report.passed:
+            reporter.pass_step(report.when, "passed", "passed", f"{report.duration:.6f}s")
+        elif report.failed:
+            reporter.fail_step(report.when, "passed", "failed", report.longreprtext)
+        else:
+            reason = report.longrepr[2] if isinstance(report.longrepr, tuple) else str(report.longrepr)
+            reason = reason[len("Skipped: "):] if reason.startswith("Skipped: ") else reason
+            reporter.info(f"skipped: {reason}")
+
+    def pytest_runtest_logfinish(self, nodeid: str, location: Any) -> None:
+        reporter = self.reporter
+        execution = reporter.current_execution
+        if execution is None:
+            return
+        reporter.current_execution = reporter.current_action = None
+        # waking an upload thread per test costs more than recording the test, so finished
+        # executions are handed over in batches
+        now = time.monotonic()
+        if not self._batch:
+            self._batch_started = now
+        self._batch.append(execution)
+        if len(self._batch) >= self.batch_size or now - self._batch_started >= self.max_delay_s:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand the executions recorded so far to the upload threads."""
+        queue = self.plugin.upload_queue
+        if self._batch and queue is not None:
+            batch, self._batch = self._batch, []
+            queue.submit(_EXECUTION_BATCH, batch).add_done_callback(partial(self._count_failures, len(batch)))
+
+    def _count_failures(self, size: int, future: "Future[Any]") -> None:
+        self.plugin.add_failed_uploads(size if future.exception() is not None else future.result())
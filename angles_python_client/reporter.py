@@ -1,18 +1,37 @@
 from __future__ import annotations
 
+import atexit
+import dataclasses
 import datetime as _dt
-from typing import Any, Dict, List, Optional
+import os
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Set, Union
 
+from ._serialize import jsonable
+from .aggregator import AggregatorClient
 from .http import AnglesHttpClient
-from .models import Action, Platform, Step, StepStates
+from .models import Action, Platform, Step, StepLog, StepStates
 from .models.requests import CreateBuild, CreateExecution, StoreScreenshot, ScreenshotPlatform
+from .exceptions import AnglesApiError
+from .fingerprint import FingerprintIndex, image_size
+from .journal import ActionBatch, ExecutionJournal, LocalExecutionJournal, execution_header
 from .requests import (
+    BaselineRequests,
     BuildRequests,
     TeamRequests,
     EnvironmentRequests,
     ExecutionRequests,
     ScreenshotRequests,
+    baseline_key,
 )
+from .spool import Spool, SpoolReplayer, SpoolUploader, placeholder_id
+from .upload_queue import Backpressure, UploadQueue, resolve_futures
+
+# a screenshot id, or the Future returned by save_screenshot* in background mode
+ScreenshotRef = Union[str, "Future[Any]"]
+
+# compare result reported for screenshots skipped by the fingerprint index
+UNCHANGED_COMPARE: Dict[str, Any] = {"isSameDimensions": True, "rawMisMatchPercentage": 0.0, "misMatchPercentage": 0.0, "analysisTime": 0.0}
 
 
 class AnglesReporter:
@@ -32,18 +51,33 @@ class AnglesReporter:
         timeout_s: float = 10.0,
         session: Any = None,
         default_headers: Optional[Dict[str, str]] = None,
+        http: Optional[AnglesHttpClient] = None,
     ) -> None:
-        self.http = AnglesHttpClient(
+        # pass ``http`` to share one tuned client (and its connection pool) between reporters
+        self.http = http or AnglesHttpClient(
             base_url=base_url or AnglesHttpClient.base_url,
             timeout_s=timeout_s,
             session=session,
             default_headers=default_headers,
         )
         self._instantiate_clients()
+        self._init_state()
 
+    def _init_state(self) -> None:
+        # shared with AsyncAnglesReporter, whose constructor only differs in the HTTP client
         self.current_build: Optional[Dict[str, Any]] = None
         self.current_execution: Optional[CreateExecution] = None
         self.current_action: Optional[Action] = None
+        self.upload_queue: Optional[UploadQueue] = None
+        self.spool: Optional[Spool] = None
+        self._spool_replayer: Optional[SpoolReplayer] = None
+        self._spool_uploader: Optional[SpoolUploader] = None
+        self.fingerprints: Optional[FingerprintIndex] = None
+        self._unchanged_screenshots: Set[str] = set()
+        self.journal: Optional[ExecutionJournal] = None
+        self._journal_options: Dict[str, float] = {}
+        self._action_batch: Optional[ActionBatch] = None
+        self.aggregator: Optional[AggregatorClient] = None
 
     def _instantiate_clients(self) -> None:
         self.teams = TeamRequests(self.http)
@@ -51,6 +85,7 @@ class AnglesReporter:
         self.builds = BuildRequests(self.http)
         self.executions = ExecutionRequests(self.http)
         self.screenshots = ScreenshotRequests(self.http)
+        self.baselines = BaselineRequests(self.http)
 
     @classmethod
     def get_instance(cls) -> "AnglesReporter":
@@ -73,9 +108,201 @@ class AnglesReporter:
 
     def reset_state(self) -> None:
         """Clear tracked build/execution/action state without recreating the HTTP client."""
+        self._discard_action_batch()
         self.current_build = None
         self.current_execution = None
         self.current_action = None
+        self._unchanged_screenshots.clear()
+
+    # --- background uploads ---
+    def enable_background_uploads(
+        self,
+        *,
+        max_queue_size: int = 1000,
+        workers: int = 2,
+        backpressure: Backpressure = Backpressure.BLOCK,
+        spill_dir: Optional[str] = None,
+    ) -> UploadQueue:
+        """Switch ``save_test`` and ``save_screenshot*`` to non-blocking mode.
+
+        Those methods then return a ``concurrent.futures.Future`` resolving to the server response.
+        A screenshot future may be passed straight to ``info_with_screenshot`` and friends; its
+        ``_id`` is filled in before the execution is uploaded. Pending uploads are flushed at
+        interpreter exit, or explicitly via ``flush()`` / ``close()``.
+        """
+        self.close()
+        self.upload_queue = UploadQueue(
+            {
+                "execution": self.executions.save_execution,
+                "screenshot": self._upload_screenshot,
+            },
+            max_size=max_queue_size,
+            workers=workers,
+            backpressure=backpressure,
+            spill_dir=spill_dir,
+        )
+        return self.upload_queue
+
+    def enable_spool(
+        self,
+        directory: str,
+        *,
+        upload: bool = True,
+        workers: int = 2,
+        interval_s: float = 2.0,
+        **spool_options: Any,
+    ) -> Spool:
+        """Write ``save_test`` / ``save_screenshot*`` submissions to a durable on-disk spool.
+
+        Calls return immediately with ``{"_id": "spool:<record id>", "spooled": True}``; such a
+        screenshot id can be used in steps and is swapped for the real id on upload. With
+        ``upload=True`` a background thread replays the spool every ``interval_s`` seconds;
+        anything it cannot upload (e.g. while the server is down) stays on disk for a later run
+        or for ``python -m angles_python_client.spool replay``. ``spool_options`` are passed to
+        :class:`Spool`.
+        """
+        self.close()
+        self.spool = Spool(directory, **spool_options)
+        self._spool_replayer = SpoolReplayer(
+            self.spool,
+            {"execution": self.executions.save_execution, "screenshot": self._upload_screenshot},
+            max_workers=workers,
+        )
+        if upload:
+            self._spool_uploader = SpoolUploader(self._spool_replayer, interval_s=interval_s)
+        atexit.register(self.close)
+        return self.spool
+
+    def enable_aggregator(self, socket_path: str) -> AggregatorClient:
+        """Send builds, executions and screenshots to a local :mod:`~angles_python_client.aggregator`.
+
+        ``start_build`` then returns the build shared by every reporter asking for the same one,
+        ``save_test`` returns ``{"_id": None, "queued": True}`` once the aggregator has queued
+        the execution, and ``save_screenshot*`` return the uploaded screenshot.
+        """
+        self.close()
+        self.aggregator = AggregatorClient(socket_path)
+        return self.aggregator
+
+    def enable_fingerprint_index(
+        self,
+        index: Optional[FingerprintIndex] = None,
+        *,
+        path: Optional[str] = None,
+        max_distance: int = 0,
+        ttl_s: float = 3600.0,
+    ) -> FingerprintIndex:
+        """Skip uploading screenshots that are unchanged from their current baseline.
+
+        Before each upload the image is hashed and compared with a fingerprint of the baseline for
+        its view and platform (fetched once per ``ttl_s`` via ``get_baseline_for_screenshot``).
+        An unchanged screenshot is not uploaded; ``save_screenshot*`` returns
+        ``{"_id": <baseline screenshot id>, "unchanged": True}`` instead, and comparing that id
+        against the baseline is answered locally. With background uploads or a spool the check
+        runs on the upload threads, so the returned future or placeholder resolves to that id.
+        ``max_distance`` > 0 also accepts perceptually similar images (needs Pillow). ``path``
+        persists the index between runs. The options are ignored when ``index`` is given.
+        """
+        self.fingerprints = index or FingerprintIndex(path, ttl_s=ttl_s, max_distance=max_distance)
+        return self.fingerprints
+
+    def enable_incremental(
+        self,
+        journal: Optional[ExecutionJournal] = None,
+        *,
+        directory: Optional[str] = None,
+        max_actions: int = 20,
+        max_delay_s: float = 2.0,
+    ) -> ExecutionJournal:
+        """Report executions incrementally: finished actions leave memory while the test runs.
+
+        ``start_test`` opens the execution in ``journal`` (by default a
+        :class:`~angles_python_client.journal.LocalExecutionJournal` under ``directory``) and
+        each finished action is passed on in batches of up to ``max_actions``, or after
+        ``max_delay_s``; only the open action is kept in ``current_execution``. ``save_test``
+        flushes the rest, closes the execution and returns the server response, after which
+        there is no current test.
+        """
+        if journal is None:
+            if directory is None:
+                raise ValueError("enable_incremental() needs a journal or a directory")
+            journal = LocalExecutionJournal(directory, lambda body: self.executions.save_execution(body, stream=True))
+        self.journal = journal
+        self._journal_options = {"max_actions": max_actions, "max_delay_s": max_delay_s}
+        return journal
+
+    def _discard_action_batch(self) -> None:
+        if self._action_batch is not None:
+            batch, self._action_batch = self._action_batch, None
+            batch.discard()
+
+    def _unchanged_screenshot(self, store: Any) -> Optional[Dict[str, Any]]:
+        assert self.fingerprints is not None
+        query = dict(jsonable(store))
+        with open(query["filePath"], "rb") as f:
+            data = f.read()
+        size = image_size(data)
+        if size:
+            query["width"], query["height"] = size
+        try:
+            fingerprint = self.fingerprints.lookup(baseline_key(query), query, self.baselines, self.screenshots)
+        except AnglesApiError:
+            return None  # no fingerprint available; upload as usual
+        if fingerprint is None or not self.fingerprints.matches(fingerprint, data):
+            return None
+        self._unchanged_screenshots.add(fingerprint.screenshot_id)
+        return {"_id": fingerprint.screenshot_id, "unchanged": True}
+
+    def _upload_screenshot(self, store: Any) -> Any:
+        # also the queue/spool handler, so the baseline lookup never blocks the test's thread
+        if self.fingerprints is not None:
+            unchanged = self._unchanged_screenshot(store)
+            if unchanged is not None:
+                return unchanged
+        return self.screenshots.save_screenshot(store)
+
+    def _spool_submit(self, kind: str, payload: Any) -> Dict[str, Any]:
+        assert self.spool is not None
+        record_id = self.spool.append(kind, payload)
+        if self._spool_uploader is not None:
+            self._spool_uploader.poke()
+        return {"_id": placeholder_id(record_id), "spooled": True}
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background uploads to finish. Always ``True`` in blocking mode.
+
+        In spool mode this syncs the spool and replays it once (``timeout`` is not applied);
+        returns ``False`` if anything is left pending.
+        """
+        ok = True
+        if self.upload_queue is not None:
+            ok = self.upload_queue.flush(timeout)
+        if self.spool is not None:
+            self.spool.sync()
+            if self._spool_uploader is not None:
+                assert self._spool_replayer is not None
+                ok = self._spool_replayer.replay().failed == 0 and ok
+        return ok
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush and stop background uploads or spooling, returning to blocking mode."""
+        if self.fingerprints is not None:
+            self.fingerprints.save()
+        ok = True
+        if self.upload_queue is not None:
+            queue, self.upload_queue = self.upload_queue, None
+            ok = queue.close(timeout)
+        if self.spool is not None:
+            if self._spool_uploader is not None:
+                report = self._spool_uploader.stop(drain=True)
+                ok = ok and (report is None or report.failed == 0)
+            self.spool.close()
+            atexit.unregister(self.close)
+            self.spool = self._spool_replayer = self._spool_uploader = None
+        if self.aggregator is not None:
+            aggregator, self.aggregator = self.aggregator, None
+            aggregator.close()
+        return ok
 
     def set_current_build(self, build_id: str) -> None:
         self.current_build = self.current_build or {}
@@ -91,8 +318,12 @@ class AnglesReporter:
             phase=phase,
             start=_dt.datetime.now(),
         )
-        created = self.builds.create_build(req)
+        if self.aggregator is not None:
+            created = self.aggregator.start_build(jsonable(req))
+        else:
+            created = self.builds.create_build(req)
         self.current_build = created
+        self._unchanged_screenshots.clear()
         return created
 
     def add_artifacts(self, artifacts: List[Any]) -> Any:
@@ -112,6 +343,10 @@ class AnglesReporter:
             platforms=[],
         )
         self.current_action = None
+        self._discard_action_batch()
+        if self.journal is not None:
+            key = self.journal.open(execution_header(self.current_execution))
+            self._action_batch = ActionBatch(self.journal, key, **self._journal_options)  # type: ignore[arg-type]
 
     def update_test_name(self, title: str, suite: Optional[str] = None) -> None:
         if self.current_execution:
@@ -128,6 +363,19 @@ class AnglesReporter:
     def save_test(self) -> Any:
         if not self.current_execution:
             raise RuntimeError("No current test started. Call start_test() first.")
+        if self._action_batch is not None:
+            batch, self._action_batch = self._action_batch, None
+            if self.current_action is not None:
+                batch.add(self.current_action)
+            header = execution_header(self.current_execution)
+            self.current_execution = self.current_action = None
+            return batch.close(header)
+        if self.aggregator is not None:
+            return self.aggregator.save_execution(resolve_futures(jsonable(self.current_execution)))
+        if self.spool is not None:
+            return self._spool_submit("execution", self.current_execution)
+        if self.upload_queue is not None:
+            return self.upload_queue.submit("execution", jsonable(self.current_execution))
         return self.executions.save_execution(self.current_execution)
 
     # --- screenshots ---
@@ -151,18 +399,36 @@ class AnglesReporter:
             tags=tags,
             platform=platform,
         )
-        return self.screenshots.save_screenshot(store)
-
-    def compare_screenshot_against_baseline(self, screenshot_id: str) -> Any:
+        if self.aggregator is not None:
+            unchanged = self._unchanged_screenshot(store) if self.fingerprints is not None else None
+            # opened by the aggregator daemon, whose working directory may differ
+            return unchanged or self.aggregator.save_screenshot(jsonable(dataclasses.replace(store, filePath=os.path.abspath(file_path))))
+        if self.spool is not None:
+            # replayed later, possibly by `angles-spool replay` from another directory
+            return self._spool_submit("screenshot", dataclasses.replace(store, filePath=os.path.abspath(file_path)))
+        if self.upload_queue is not None:
+            return self.upload_queue.submit("screenshot", jsonable(store))
+        return self._upload_screenshot(store)
+
+    def compare_screenshot_against_baseline(self, screenshot_id: str, *, local: bool = False) -> Any:
+        """Compare a screenshot with its baseline; ``local=True`` runs the compare on this machine."""
+        if screenshot_id in self._unchanged_screenshots:
+            return dict(UNCHANGED_COMPARE)
+        if local:
+            return jsonable(self.screenshots.get_baseline_compare_local(screenshot_id))
         return self.screenshots.get_baseline_compare(screenshot_id)
 
     # --- steps/actions ---
     def add_action(self, name: str) -> None:
-        self.current_action = Action(name=name, start=_dt.datetime.now(), steps=[])
         if self.current_execution is None:
             # JS uses a default Set-up execution if you start logging early
             self.start_test("Set-up", "Set-up")
         assert self.current_execution is not None
+        if self._action_batch is not None and self.current_action is not None:
+            # incremental mode: the previous action is finished; only the new one stays in memory
+            self._action_batch.add(self.current_action)
+            self.current_execution.actions = []
+        self.current_action = Action(name=name, start=_dt.datetime.now(), steps=StepLog())
         if self.current_execution.actions is None:
             self.current_execution.actions = []
         self.current_execution.actions.append(self.current_action)
@@ -177,26 +443,26 @@ class AnglesReporter:
     def debug(self, info: str) -> None:
         self.add_step(name="DEBUG", expected=None, actual=None, info=info, status=StepStates.DEBUG, screenshot=None)
 
-    def info_with_screenshot(self, info: str, screenshot_id: str) -> None:
+    def info_with_screenshot(self, info: str, screenshot_id: ScreenshotRef) -> None:
         self.add_step(name="INFO", expected=None, actual=None, info=info, status=StepStates.INFO, screenshot=screenshot_id)
 
     def error(self, error: str) -> None:
         self.add_step(name="ERROR", expected=None, actual=None, info=error, status=StepStates.ERROR, screenshot=None)
 
-    def error_with_screenshot(self, error: str, screenshot_id: str) -> None:
+    def error_with_screenshot(self, error: str, screenshot_id: ScreenshotRef) -> None:
         self.add_step(name="ERROR", expected=None, actual=None, info=error, status=StepStates.ERROR, screenshot=screenshot_id)
 
     # `pass` is a keyword in python
     def pass_step(self, name: str, expected: str, actual: str, info: str) -> None:
         self.add_step(name=name, expected=expected, actual=actual, info=info, status=StepStates.PASS, screenshot=None)
 
-    def pass_with_screenshot(self, name: str, expected: str, actual: str, info: str, screenshot_id: str) -> None:
+    def pass_with_screenshot(self, name: str, expected: str, actual: str, info: str, screenshot_id: ScreenshotRef) -> None:
         self.add_step(name=name, expected=expected, actual=actual, info=info, status=StepStates.PASS, screenshot=screenshot_id)
 
     def fail_step(self, name: str, expected: str, actual: str, info: str) -> None:
         self.add_step(name=name, expected=expected, actual=actual, info=info, status=StepStates.FAIL, screenshot=None)
 
-    def fail_with_screenshot(self, name: str, expected: str, actual: str, info: str, screenshot_id: str) -> None:
+    def fail_with_screenshot(self, name: str, expected: str, actual: str, info: str, screenshot_id: ScreenshotRef) -> None:
         self.add_step(name=name, expected=expected, actual=actual, info=info, status=StepStates.FAIL, screenshot=screenshot_id)
 
     def add_step(
@@ -206,22 +472,28 @@ class AnglesReporter:
         actual: Optional[str],
         info: Optional[str],
         status: StepStates,
-        screenshot: Optional[str],
+        screenshot: Optional[ScreenshotRef],
     ) -> None:
         self._ensure_action()
         assert self.current_action is not None
-        step = Step(
-            name=name,
-            expected=expected,
-            actual=actual,
-            info=info,
-            status=status,
-            timestamp=_dt.datetime.now(),
-            screenshot=screenshot,
+        steps = self.current_action.steps
+        if steps is None:
+            steps = self.current_action.steps = StepLog()
+        if isinstance(steps, StepLog):
+            # compact path: no Step object or datetime is created per call
+            steps.add(name, expected, actual, info, status, screenshot)
+            return
+        steps.append(
+            Step(
+                name=name,
+                expected=expected,
+                actual=actual,
+                info=info,
+                status=status,
+                timestamp=_dt.datetime.now(),
+                screenshot=screenshot,
+            )
         )
-        if self.current_action.steps is None:
-            self.current_action.steps = []
-        self.current_action.steps.append(step)
 
 
 angles_reporter = AnglesReporter.get_instance()
@@ -1,13 +1,45 @@
 from __future__ import annotations
 
 import datetime as _dt
+import itertools
+import json
+import os
 from dataclasses import asdict
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlencode
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
 
-from ._serialize import jsonable, json_dumps
+from requests import RequestException
+
+from ._concurrency import bounded_map, chunk_by_length, chunked, ordered_map
+from ._multipart import MultipartFileEncoder
+from ._pagination import PageSizer, iter_pages, merge_pages, page_items
+from ._serialize import JsonStream, jsonable, json_dumps
+from .cache import CacheEntry, CacheKey, ResponseCache
+from .exceptions import AnglesApiError
 from .http import AnglesHttpClient
+from .lazy_models import lazy, unwrap
+from .models import (
+    Baseline,
+    Build,
+    BuildReport,
+    BuildsResponse,
+    Environment,
+    Execution,
+    ExecutionResponse,
+    ImageCompareResponse,
+    PhaseMetrics,
+    Screenshot,
+    ScreenshotMetrics,
+    Team,
+    Versions,
+)
 from .models.enums import GroupingPeriods
+from .results import ItemResult
+
+
+# keeps id-list GETs under common proxy/server URL limits
+MAX_URL_LENGTH = 2000
+MAX_IDS_PER_REQUEST = 100
 
 
 class BaseRequests:
@@ -17,34 +49,148 @@ class BaseRequests:
     def _json(self, obj: Any) -> Any:
         return jsonable(obj)
 
+    def _typed(self, response: Any, model: type, page: Optional[type] = None) -> Any:
+        """``response`` as lazy ``model`` objects when the client has ``typed_responses`` set.
+
+        ``page`` is the model for ``{"count": ..., "builds": [...]}``-style paged responses.
+        """
+        if not self.http.typed_responses:
+            return response
+        return lazy(response, page if page is not None and isinstance(response, dict) else model)
+
+    def _invalidate(self, url: str) -> None:
+        cache = self.http.response_cache
+        if cache is not None:
+            cache.invalidate(url)
+
     def post(self, url: str, body: Any, *, headers: Optional[Dict[str, str]] = None) -> Any:
-        resp = self.http.request("POST", url, json=self._json(body), headers=headers)
+        try:
+            resp = self.http.request("POST", url, json=self._json(body), headers=headers)
+        finally:
+            self._invalidate(url)
+        return resp.json() if resp.content else None
+
+    def post_stream(self, url: str, body: Any, *, compress: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Any:
+        """POST ``body`` as a chunked JSON stream instead of a fully rendered string.
+
+        ``compress="gzip"`` compresses the stream on the fly and sets ``Content-Encoding``.
+        """
+        stream = JsonStream(body, compress=compress)
+        merged: Dict[str, str] = {"Content-Type": "application/json", **(headers or {})}
+        if stream.content_encoding:
+            merged["Content-Encoding"] = stream.content_encoding
+        try:
+            resp = self.http.request("POST", url, data=stream, headers=merged)
+        finally:
+            self._invalidate(url)
         return resp.json() if resp.content else None
 
     def get(self, url: str, *, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, response_type: str = "json") -> Any:
-        resp = self.http.request("GET", url, params=params, headers=headers, stream=(response_type=="bytes"))
+        cache = self.http.response_cache
+        if cache is not None and response_type == "json":
+            ttl = cache.ttl_for(url)
+            if ttl is not None:
+                key = cache.key(url, params)
+                entry, fresh = cache.lookup(key)
+                if fresh:
+                    return json.loads(entry.body)  # type: ignore[union-attr]
+                resp = self.http.request("GET", url, params=params, headers=_revalidation_headers(headers, entry))
+                return _cache_response(cache, key, ttl, entry, resp)
+        resp = self.http.request("GET", url, params=params, headers=headers)
         if response_type == "bytes":
             return resp.content
         return resp.json() if resp.content else None
 
+    def _id_chunks(self, url: str, params: Dict[str, Any], key: str, ids: List[str], max_url_length: int, max_ids: int) -> List[List[str]]:
+        """Split ``ids`` so each ``url?params&key=id1,id2,...`` stays within ``max_url_length``."""
+        fixed = len(self.http._full_url(url)) + 1 + len(urlencode(params)) + len(key) + 2
+        # ids are comma-joined and requests percent-encodes the comma as %2C
+        return list(chunk_by_length(ids, max_url_length - fixed, lambda i: len(quote(str(i), safe="")) + 3, max_ids))
+
+    def _get_by_ids(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        key: str,
+        ids: List[str],
+        *,
+        max_workers: int,
+        max_url_length: int,
+        max_ids: int,
+        ordered: bool = True,
+    ) -> Iterator[Any]:
+        """GET ``url`` once per id chunk, fetching chunks concurrently; yields one response per chunk.
+
+        Responses come in chunk order when ``ordered``, otherwise as they complete. The first
+        failed chunk raises.
+        """
+        chunks = self._id_chunks(url, params, key, ids, max_url_length, max_ids)
+
+        def fetch(chunk: List[str]) -> Any:
+            return self.get(url, params={**params, key: ",".join(chunk)})
+
+        if len(chunks) == 1:
+            yield fetch(chunks[0])
+            return
+        results = bounded_map(fetch, chunks, max_workers=max_workers, thread_name_prefix="angles-fanout")
+        done: Dict[int, Any] = {}
+        next_index = 0
+        try:
+            for r in results:
+                if r.error is not None:
+                    raise r.error
+                if not ordered:
+                    yield r.result
+                    continue
+                done[r.index] = r.result
+                while next_index in done:
+                    yield done.pop(next_index)
+                    next_index += 1
+        finally:
+            # shut the pool down here, not whenever (and on whichever thread) the generator is collected
+            results.close()
+
     def put(self, url: str, body: Any = None, *, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Any:
-        resp = self.http.request("PUT", url, params=params, json=self._json(body) if body is not None else None, headers=headers)
+        try:
+            resp = self.http.request("PUT", url, params=params, json=self._json(body) if body is not None else None, headers=headers)
+        finally:
+            self._invalidate(url)
         return resp.json() if resp.content else None
 
     def delete(self, url: str, *, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Any:
-        resp = self.http.request("DELETE", url, params=params, headers=headers)
+        try:
+            resp = self.http.request("DELETE", url, params=params, headers=headers)
+        finally:
+            self._invalidate(url)
         return resp.json() if resp.content else None
 
 
+def _revalidation_headers(headers: Optional[Dict[str, str]], entry: Optional[CacheEntry]) -> Optional[Dict[str, str]]:
+    if entry is None or not entry.etag:
+        return headers
+    return {**(headers or {}), "If-None-Match": entry.etag}
+
+
+def _cache_response(cache: ResponseCache, key: CacheKey, ttl: float, entry: Optional[CacheEntry], resp: Any) -> Any:
+    """Parse a GET response for a cacheable endpoint, storing or refreshing the cache entry."""
+    if resp.status_code == 304 and entry is not None:
+        cache.store(key, entry.body, entry.etag, ttl)
+        return json.loads(entry.body)
+    if not resp.content:
+        return None
+    cache.store(key, resp.content, resp.headers.get("ETag"), ttl)
+    return resp.json()
+
+
 class TeamRequests(BaseRequests):
     def create_team(self, request: Any) -> Any:
         return self.post("team", request)
 
     def get_teams(self) -> Any:
-        return self.get("team")
+        return self._typed(self.get("team"), Team)
 
     def get_team(self, team_id: str) -> Any:
-        return self.get(f"team/{team_id}")
+        return self._typed(self.get(f"team/{team_id}"), Team)
 
     def delete_team(self, team_id: str) -> Any:
         return self.delete(f"team/{team_id}")
@@ -61,10 +207,10 @@ class EnvironmentRequests(BaseRequests):
         return self.post("environment", request)
 
     def get_environment(self, environment_id: str) -> Any:
-        return self.get(f"environment/{environment_id}")
+        return self._typed(self.get(f"environment/{environment_id}"), Environment)
 
     def get_environments(self) -> Any:
-        return self.get("environment")
+        return self._typed(self.get("environment"), Environment)
 
     def delete_environment(self, environment_id: str) -> Any:
         return self.delete(f"environment/{environment_id}")
@@ -77,14 +223,54 @@ class BuildRequests(BaseRequests):
     def create_build(self, request: Any) -> Any:
         return self.post("build", request)
 
-    def get_builds(self, team_id: str, build_ids: Optional[List[str]] = None, return_execution_details: bool = False) -> Any:
-        # matches JS: /build?teamId=...&buildIds=...&returnExecutionDetails=...
+    @staticmethod
+    def _builds_params(team_id: str, return_execution_details: bool) -> Dict[str, Any]:
         params: Dict[str, Any] = {"teamId": team_id}
-        if build_ids:
-            params["buildIds"] = ",".join(build_ids)
         if return_execution_details:
             params["returnExecutionDetails"] = "true"
-        return self.get("build", params=params)
+        return params
+
+    def get_builds(
+        self,
+        team_id: str,
+        build_ids: Optional[List[str]] = None,
+        return_execution_details: bool = False,
+        *,
+        max_workers: int = 4,
+        max_url_length: int = MAX_URL_LENGTH,
+        max_ids_per_request: int = MAX_IDS_PER_REQUEST,
+    ) -> Any:
+        """Fetch builds; a long ``build_ids`` list is split into several concurrent requests.
+
+        Chunks keep each URL under ``max_url_length`` and at most ``max_ids_per_request`` ids;
+        their responses are merged in request order into one response.
+        """
+        # matches JS: /build?teamId=...&buildIds=...&returnExecutionDetails=...
+        params = self._builds_params(team_id, return_execution_details)
+        if not build_ids:
+            return self._typed(self.get("build", params=params), Build, BuildsResponse)
+        merged = merge_pages(
+            self._get_by_ids("build", params, "buildIds", list(build_ids), max_workers=max_workers, max_url_length=max_url_length, max_ids=max_ids_per_request)
+        )
+        return self._typed(merged, Build, BuildsResponse)
+
+    def iter_builds_by_id(
+        self,
+        team_id: str,
+        build_ids: Iterable[str],
+        return_execution_details: bool = False,
+        *,
+        max_workers: int = 4,
+        max_url_length: int = MAX_URL_LENGTH,
+        max_ids_per_request: int = MAX_IDS_PER_REQUEST,
+    ) -> Iterator[Any]:
+        """Like :meth:`get_builds` but yields builds as each chunk arrives (in completion order)."""
+        params = self._builds_params(team_id, return_execution_details)
+        ids = list(build_ids)
+        if not ids:
+            return iter(())
+        pages = self._get_by_ids("build", params, "buildIds", ids, max_workers=max_workers, max_url_length=max_url_length, max_ids=max_ids_per_request, ordered=False)
+        return (self._typed(item, Build) for page in pages for item in page_items(page)[0])
 
     def get_builds_with_filters(self, team_id: str, filter_environments: Optional[List[str]] = None, filter_components: Optional[List[str]] = None, skip: int = 0, limit: int = 50) -> Any:
         params: Dict[str, Any] = {"teamId": team_id, "skip": skip, "limit": limit}
@@ -92,7 +278,7 @@ class BuildRequests(BaseRequests):
             params["environmentIds"] = ",".join(filter_environments)
         if filter_components:
             params["componentIds"] = ",".join(filter_components)
-        return self.get("build", params=params)
+        return self._typed(self.get("build", params=params), Build, BuildsResponse)
 
     def get_builds_with_date_filters(
         self,
@@ -113,16 +299,43 @@ class BuildRequests(BaseRequests):
             params["environmentIds"] = ",".join(filter_environments)
         if filter_components:
             params["componentIds"] = ",".join(filter_components)
-        return self.get("build", params=params)
+        return self._typed(self.get("build", params=params), Build, BuildsResponse)
+
+    def iter_builds(
+        self,
+        team_id: str,
+        filter_environments: Optional[List[str]] = None,
+        filter_components: Optional[List[str]] = None,
+        *,
+        from_date: Optional[_dt.date] = None,
+        to_date: Optional[_dt.date] = None,
+        skip: int = 0,
+        page_size: int = 50,
+        max_page_size: int = 1000,
+        prefetch: bool = True,
+    ) -> Iterator[Any]:
+        """Lazily yield every build matching the filters, following ``skip``/``limit`` pages.
+
+        The next page is fetched in the background while the current one is consumed, and the
+        page size starts at ``page_size`` and adapts to response latency (up to ``max_page_size``).
+        """
+        def fetch(page_skip: int, limit: int) -> Any:
+            return self.get_builds_with_date_filters(
+                team_id, filter_environments, filter_components, skip=page_skip, limit=limit, from_date=from_date, to_date=to_date
+            )
+
+        sizer = PageSizer(page_size, min_size=min(10, page_size), max_size=max(page_size, max_page_size))
+        return (self._typed(build, Build) for build in iter_pages(fetch, skip=skip, sizer=sizer, prefetch=prefetch))
 
     def delete_builds(self, team_id: str, age_in_days: int) -> Any:
         return self.delete("build", params={"teamId": team_id, "ageInDays": age_in_days})
 
     def get_build(self, build_id: str) -> Any:
-        return self.get(f"build/{build_id}")
+        return self._typed(self.get(f"build/{build_id}"), Build)
 
     def get_build_report(self, build_id: str) -> Any:
-        return self.get(f"build/{build_id}/report")
+        """The build with every suite's executions; with ``typed_responses`` a lazy :class:`BuildReport`."""
+        return self._typed(self.get(f"build/{build_id}/report"), BuildReport)
 
     def delete_build(self, build_id: str) -> Any:
         return self.delete(f"build/{build_id}")
@@ -135,25 +348,109 @@ class BuildRequests(BaseRequests):
 
 
 class ExecutionRequests(BaseRequests):
-    def save_execution(self, save_execution_request: Any) -> Any:
+    # None = not probed yet; flips to False once the server rejects the bulk endpoint
+    _bulk_supported: Optional[bool] = None
+
+    def save_execution(self, save_execution_request: Any, *, stream: bool = False, compress: Optional[str] = None) -> Any:
+        """Save one execution.
+
+        Set ``stream=True`` for very large executions: the body is encoded incrementally from the
+        model and sent with chunked transfer encoding (optionally gzip-compressed), so the full
+        dict and JSON string are never held in memory.
+        """
+        if stream or compress:
+            return self.post_stream("execution/", save_execution_request, compress=compress)
         return self.post("execution/", save_execution_request)
 
+    def save_executions(
+        self,
+        save_execution_requests: Iterable[Any],
+        *,
+        batch_size: int = 100,
+        max_in_flight: int = 8,
+        bulk_endpoint: Optional[str] = None,
+    ) -> List[ItemResult]:
+        """Save many executions, returning one :class:`ItemResult` per input, in input order.
+
+        With ``bulk_endpoint`` set, executions are posted as JSON arrays of up to ``batch_size``
+        items (the server must answer with an array of the same length). If the server does not
+        know that endpoint (404/405) this falls back, for the lifetime of this object, to
+        pipelining single ``save_execution`` calls with at most ``max_in_flight`` in flight. Any
+        other failure of a batch is reported as the error of each of its items.
+        """
+        if not bulk_endpoint or self._bulk_supported is False:
+            return ordered_map(self.save_execution, save_execution_requests, max_workers=max_in_flight)
+
+        batches = chunked(save_execution_requests, batch_size)
+        first = next(batches, None)
+        if first is None:
+            return []
+        results: List[ItemResult] = []
+        if self._bulk_supported is None:
+            try:
+                results.extend(self._save_batch(bulk_endpoint, 0, first))
+            except Exception as e:
+                if isinstance(e, AnglesApiError) and e.status_code in (404, 405):
+                    self._bulk_supported = False
+                    rest = itertools.chain(first, itertools.chain.from_iterable(batches))
+                    return ordered_map(self.save_execution, rest, max_workers=max_in_flight)
+                # any other failure says nothing about the endpoint: report it per item, keep
+                # sending the remaining batches and probe again on the next call
+                results.extend(ItemResult(index=i, item=item, error=e) for i, item in enumerate(first))
+            else:
+                self._bulk_supported = True
+            remaining: Iterable[List[Any]] = batches
+        else:
+            remaining = itertools.chain([first], batches)
+
+        offset = len(results)
+        indexed: List[Tuple[int, List[Any]]] = []
+        for batch in remaining:
+            indexed.append((offset, batch))
+            offset += len(batch)
+        for r in bounded_map(lambda ib: self._save_batch(bulk_endpoint, *ib), indexed, max_workers=max_in_flight):
+            start, batch = r.item
+            if r.error is not None:
+                results.extend(ItemResult(index=start + i, item=item, error=r.error) for i, item in enumerate(batch))
+            else:
+                results.extend(r.result)
+        results.sort(key=lambda r: r.index)
+        return results
+
+    def _save_batch(self, bulk_endpoint: str, start: int, batch: List[Any]) -> List[ItemResult]:
+        response = self.post(bulk_endpoint, batch)
+        if not isinstance(response, list) or len(response) != len(batch):
+            raise AnglesApiError(f"Bulk endpoint returned {type(response).__name__}, expected a list of {len(batch)} items")
+        return [ItemResult(index=start + i, item=item, result=res) for i, (item, res) in enumerate(zip(batch, response))]
+
     def get_execution(self, execution_id: str) -> Any:
-        return self.get(f"execution/{execution_id}")
+        return self._typed(self.get(f"execution/{execution_id}"), Execution)
 
     def delete_execution(self, execution_id: str) -> Any:
         return self.delete(f"execution/{execution_id}")
 
     def get_execution_history(self, execution_id: str, skip: int = 0, limit: int = 50) -> Any:
-        return self.get(f"execution/{execution_id}/history", params={"skip": skip, "limit": limit})
+        return self._typed(self.get(f"execution/{execution_id}/history", params={"skip": skip, "limit": limit}), Execution, ExecutionResponse)
 
+    def iter_execution_history(
+        self,
+        execution_id: str,
+        *,
+        skip: int = 0,
+        page_size: int = 50,
+        max_page_size: int = 1000,
+        prefetch: bool = True,
+    ) -> Iterator[Any]:
+        """Lazily yield the history of an execution; paging works as in :meth:`BuildRequests.iter_builds`."""
+        sizer = PageSizer(page_size, min_size=min(10, page_size), max_size=max(page_size, max_page_size))
+        pages = iter_pages(lambda page_skip, limit: self.get_execution_history(execution_id, page_skip, limit), skip=skip, sizer=sizer, prefetch=prefetch)
+        return (self._typed(execution, Execution) for execution in pages)
 
-class ScreenshotRequests(BaseRequests):
-    def save_screenshot(self, store_screenshot: Any) -> Any:
-        # multipart form-data
-        import os
-        import json as _json
 
+class ScreenshotRequests(BaseRequests):
+    @staticmethod
+    def _screenshot_form(store_screenshot: Any) -> Tuple[str, str, Dict[str, Any]]:
+        """Return ``(full_path, file_name, form_fields)`` for a multipart screenshot upload."""
         payload = jsonable(store_screenshot)
         full_path = os.path.abspath(payload["filePath"])
         file_name = os.path.basename(full_path)
@@ -164,37 +461,173 @@ class ScreenshotRequests(BaseRequests):
             "timestamp": payload["timestamp"] if isinstance(payload["timestamp"], str) else str(payload["timestamp"]),
         }
         if payload.get("tags") is not None:
-            data["tags"] = _json.dumps(payload["tags"])
+            data["tags"] = json.dumps(payload["tags"])
         platform = payload.get("platform")
         if platform:
             for k, v in platform.items():
                 if v is not None:
                     data[k] = v
+        return full_path, file_name, data
+
+    def save_screenshot(self, store_screenshot: Any) -> Any:
+        # multipart form-data
+        full_path, file_name, data = self._screenshot_form(store_screenshot)
 
-        with open(full_path, "rb") as f:
-            files = {"screenshot": (file_name, f)}
-            # IMPORTANT: when using files=..., don't set Content-Type json
-            headers = {"Accept": "application/json"}
-            resp = self.http.request("POST", "screenshot/", data=data, files=files, headers=headers)
+        # streamed from disk in chunks rather than buffered by requests' files=...
+        with MultipartFileEncoder(data, "screenshot", full_path, file_name=file_name) as body:
+            headers = {"Accept": "application/json", "Content-Type": body.content_type}
+            resp = self.http.request("POST", "screenshot/", data=body, headers=headers)
             return resp.json() if resp.content else None
 
+    def save_screenshots(self, store_screenshots: Iterable[Any], *, max_workers: int = 4) -> Iterator[ItemResult]:
+        """Upload screenshots concurrently, yielding an :class:`ItemResult` as each one finishes.
+
+        Results arrive in completion order (use ``ItemResult.index`` to map back to the input).
+        The input is consumed lazily and each body is streamed from disk, so memory stays flat
+        regardless of how many or how large the images are.
+        """
+        return bounded_map(self.save_screenshot, store_screenshots, max_workers=max_workers, thread_name_prefix="angles-screenshot")
+
+    def iter_screenshot_image(self, screenshot_id: str, chunk_size: int = 64 * 1024, *, offset: int = 0) -> Iterator[bytes]:
+        """Yield the image bytes of a screenshot in chunks, starting at byte ``offset``.
+
+        The body is streamed from the socket rather than buffered. A non-zero ``offset`` is sent
+        as a ``Range`` request; if the server ignores it, the leading bytes are skipped locally.
+        A connection lost mid-stream raises :class:`AnglesApiError` without a status code.
+        """
+        cache = self.http.image_cache
+        if cache is not None:
+            with cache.open(f"screenshot/{screenshot_id}") as view:
+                if view is not None:
+                    for start in range(offset, len(view), chunk_size):
+                        yield view[start:start + chunk_size].tobytes()
+                    return
+        url = f"screenshot/{screenshot_id}/image"
+        headers = {"Accept": "*/*"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        resp = self.http.request("GET", url, headers=headers, stream=True)
+        try:
+            skip = offset if offset and resp.status_code != 206 else 0
+            for chunk in resp.iter_content(chunk_size):
+                if skip:
+                    dropped = min(skip, len(chunk))
+                    chunk, skip = chunk[dropped:], skip - dropped
+                if chunk:
+                    yield chunk
+        except RequestException as e:
+            raise AnglesApiError(f"Download interrupted: {e}", url=self.http._full_url(url)) from e
+        finally:
+            resp.close()
+
+    def download_screenshot_image(
+        self,
+        screenshot_id: str,
+        dest: str,
+        *,
+        chunk_size: int = 64 * 1024,
+        resume: bool = True,
+        max_resumes: int = 3,
+    ) -> str:
+        """Stream a screenshot image to ``dest`` (a file path, or a directory to write ``<id>.png`` into).
+
+        Data is written to ``<dest>.part`` and renamed into place when complete. With ``resume``,
+        an existing ``.part`` file from an earlier attempt is continued with a ``Range`` request,
+        as is a download interrupted mid-stream (up to ``max_resumes`` times). Returns the path.
+        """
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, f"{screenshot_id}.png")
+        part = dest + ".part"
+        if not resume and os.path.exists(part):
+            os.remove(part)
+        resumes = 0
+        while True:
+            offset = os.path.getsize(part) if os.path.exists(part) else 0
+            try:
+                with open(part, "ab") as f:
+                    for chunk in self.iter_screenshot_image(screenshot_id, chunk_size, offset=offset):
+                        f.write(chunk)
+                break
+            except AnglesApiError as e:
+                if e.status_code == 416 and offset:
+                    os.remove(part)  # stale partial file; start over
+                    continue
+                if e.status_code is not None or not resume or resumes >= max_resumes:
+                    raise
+                resumes += 1
+        os.replace(part, dest)
+        return dest
+
+    def download_screenshots(
+        self,
+        screenshot_ids: Iterable[str],
+        dest_dir: str,
+        *,
+        max_workers: int = 4,
+        chunk_size: int = 64 * 1024,
+        resume: bool = True,
+    ) -> Iterator[ItemResult]:
+        """Download many screenshot images into ``dest_dir`` concurrently.
+
+        Yields an :class:`ItemResult` (``result`` is the file path) as each download finishes;
+        files already present in ``dest_dir`` are not downloaded again.
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+
+        def _one(screenshot_id: str) -> str:
+            path = os.path.join(dest_dir, f"{screenshot_id}.png")
+            if os.path.exists(path):
+                return path
+            return self.download_screenshot_image(screenshot_id, path, chunk_size=chunk_size, resume=resume)
+
+        return bounded_map(_one, screenshot_ids, max_workers=max_workers, thread_name_prefix="angles-download")
+
     def get_screenshots_for_build(self, build_id: str, limit: int = 100) -> Any:
         params: Dict[str, Any] = {"buildId": build_id}
         if limit:
             params["limit"] = limit
-        return self.get("screenshot/", params=params)
+        return self._typed(self.get("screenshot/", params=params), Screenshot)
 
-    def get_screenshots(self, screenshot_ids: List[str]) -> Any:
-        return self.get("screenshot/", params={"screenshotIds": ",".join(screenshot_ids)})
+    def get_screenshots(
+        self,
+        screenshot_ids: List[str],
+        *,
+        max_workers: int = 4,
+        max_url_length: int = MAX_URL_LENGTH,
+        max_ids_per_request: int = MAX_IDS_PER_REQUEST,
+    ) -> Any:
+        """Fetch screenshots by id, splitting long id lists as :meth:`BuildRequests.get_builds` does."""
+        if not screenshot_ids:
+            return self._typed(self.get("screenshot/", params={"screenshotIds": ""}), Screenshot)
+        merged = merge_pages(
+            self._get_by_ids("screenshot/", {}, "screenshotIds", list(screenshot_ids), max_workers=max_workers, max_url_length=max_url_length, max_ids=max_ids_per_request)
+        )
+        return self._typed(merged, Screenshot)
+
+    def iter_screenshots_by_id(
+        self,
+        screenshot_ids: Iterable[str],
+        *,
+        max_workers: int = 4,
+        max_url_length: int = MAX_URL_LENGTH,
+        max_ids_per_request: int = MAX_IDS_PER_REQUEST,
+    ) -> Iterator[Any]:
+        """Like :meth:`get_screenshots` but yields screenshots as each chunk arrives (in completion order)."""
+        ids = list(screenshot_ids)
+        if not ids:
+            return iter(())
+        pages = self._get_by_ids("screenshot/", {}, "screenshotIds", ids, max_workers=max_workers, max_url_length=max_url_length, max_ids=max_ids_per_request, ordered=False)
+        return (self._typed(item, Screenshot) for page in pages for item in page_items(page)[0])
 
     def get_screenshot_views(self, view: str, limit: int = 50) -> Any:
-        return self.get("screenshot/views", params={"view": view, "limit": limit})
+        return self._typed(self.get("screenshot/views", params={"view": view, "limit": limit}), Screenshot)
 
     def get_screenshot_tags(self, tag: str, limit: int = 50) -> Any:
-        return self.get("screenshot/tags", params={"tag": tag, "limit": limit})
+        return self._typed(self.get("screenshot/tags", params={"tag": tag, "limit": limit}), Screenshot)
 
     def get_screenshot_history_by_view(self, view: str, platform_id: str, limit: int = 50, offset: int = 0) -> Any:
-        return self.get("screenshot/", params={"view": view, "platformId": platform_id, "limit": limit, "offset": offset})
+        params = {"view": view, "platformId": platform_id, "limit": limit, "offset": offset}
+        return self._typed(self.get("screenshot/", params=params), Screenshot)
 
     def get_screenshots_grouped_by_platform(self, view: str, number_of_days: int) -> Any:
         return self.get("screenshot/grouped/platform", params={"view": view, "numberOfDays": number_of_days})
@@ -203,13 +636,26 @@ class ScreenshotRequests(BaseRequests):
         return self.get("screenshot/grouped/tag", params={"tag": tag, "numberOfDays": number_of_days})
 
     def get_screenshot(self, screenshot_id: str) -> Any:
-        return self.get(f"screenshot/{screenshot_id}")
+        return self._typed(self.get(f"screenshot/{screenshot_id}"), Screenshot)
 
     def delete_screenshot(self, screenshot_id: str) -> Any:
         return self.delete(f"screenshot/{screenshot_id}")
 
+    def _cached_image(self, key: str, fetch: Callable[[], bytes]) -> bytes:
+        cache = self.http.image_cache
+        if cache is None:
+            return fetch()
+        data = cache.get(key)
+        if data is None:
+            data = fetch()
+            cache.put(key, data)
+        return data
+
     def get_screenshot_image(self, screenshot_id: str) -> bytes:
-        return self.get(f"screenshot/{screenshot_id}/image", response_type="bytes")
+        return self._cached_image(
+            f"screenshot/{screenshot_id}",
+            lambda: self.get(f"screenshot/{screenshot_id}/image", response_type="bytes"),
+        )
 
     def get_dynamic_baseline_image(self, screenshot_id: str, number_of_images_to_compare: Optional[int] = None) -> Any:
         path = f"screenshot/{screenshot_id}/dynamic-baseline"
@@ -219,45 +665,114 @@ class ScreenshotRequests(BaseRequests):
         return self.get(path, params=params or None)
 
     def get_baseline_compare_image(self, screenshot_id: str, cache: bool = False) -> bytes:
-        return self.get(
-            "screenshot/{}/baseline/compare/image/".format(screenshot_id),
-            params={"useCache": str(bool(cache)).lower()},
-            response_type="bytes",
+        use_cache = str(bool(cache)).lower()
+        return self._cached_image(
+            f"compare/{screenshot_id}?useCache={use_cache}",
+            lambda: self.get(
+                "screenshot/{}/baseline/compare/image/".format(screenshot_id),
+                params={"useCache": use_cache},
+                response_type="bytes",
+            ),
         )
 
     def get_baseline_compare(self, screenshot_id: str) -> Any:
-        return self.get(f"screenshot/{screenshot_id}/baseline/compare/")
+        return self._typed(self.get(f"screenshot/{screenshot_id}/baseline/compare/"), ImageCompareResponse)
+
+    def get_baseline_compare_local(self, screenshot_id: str, *, tolerance: int = 0, diff_path: Optional[str] = None) -> Any:
+        """Compare a screenshot with its baseline on this machine instead of on the server.
+
+        Downloads both images (through the client's ``image_cache`` when set) and returns an
+        :class:`ImageCompareResponse`, honouring the baseline's ignore boxes. Needs NumPy and
+        Pillow; see :mod:`angles_python_client.image_diff`.
+        """
+        from .image_diff import compare_images
+
+        baseline = first_baseline(BaselineRequests(self.http).get_baseline_for_screenshot(self.get_screenshot(screenshot_id)))
+        baseline_id = baseline_screenshot_id(baseline)
+        if baseline is None or baseline_id is None:
+            raise AnglesApiError(f"No baseline found for screenshot {screenshot_id}", status_code=404)
+        return compare_images(
+            self.get_screenshot_image(baseline_id),
+            self.get_screenshot_image(screenshot_id),
+            ignore_boxes=baseline.get("ignoreBoxes"),
+            tolerance=tolerance,
+            diff_path=diff_path,
+        )
+
+
+def baseline_params(screenshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Query identifying the baseline a screenshot is compared against (view + platform)."""
+    screenshot = unwrap(screenshot)
+    platform = (screenshot.get("platform") or {})
+    params: Dict[str, Any] = {
+        "view": screenshot.get("view"),
+        "platformName": platform.get("platformName"),
+    }
+    device_name = platform.get("deviceName")
+    if device_name:
+        params["deviceName"] = device_name
+    else:
+        params["browserName"] = platform.get("browserName")
+        params["screenHeight"] = screenshot.get("height")
+        params["screenWidth"] = screenshot.get("width")
+    return params
+
+
+def first_baseline(response: Any) -> Optional[Dict[str, Any]]:
+    """The baseline in a ``get_baseline_for_screenshot`` response (a list or a single object)."""
+    response = unwrap(response)
+    if isinstance(response, list):
+        response = response[0] if response else None
+    return response if isinstance(response, dict) else None
+
+
+def baseline_screenshot_id(baseline: Optional[Dict[str, Any]]) -> Optional[str]:
+    shot = baseline.get("screenshot") if baseline else None
+    return shot.get("_id") if isinstance(shot, dict) else shot
+
+
+def baseline_key(screenshot: Dict[str, Any]) -> str:
+    """Stable string key for the baseline slot of ``screenshot``; equal keys share a baseline."""
+    return json_dumps(baseline_params(screenshot))
 
 
 class BaselineRequests(BaseRequests):
+    # set by BaselineIndex; kept in sync with the writes below
+    index: Optional[Any] = None
+
+    def _indexed(self, baseline: Any) -> Any:
+        if self.index is not None:
+            self.index.upsert(baseline)
+        return baseline
+
+    def _unindexed(self, baseline_id: str, response: Any) -> Any:
+        if self.index is not None:
+            self.index.remove(baseline_id)
+        return response
+
+    def _invalidate(self, url: str) -> None:
+        super()._invalidate(url)
+        # compare images are rendered against the current baseline
+        if self.http.image_cache is not None:
+            self.http.image_cache.clear("compare")
+
     def set_baseline(self, screenshot: Dict[str, Any]) -> Any:
+        screenshot = unwrap(screenshot)
         view = screenshot.get("view")
         screenshot_id = screenshot.get("_id")
-        return self.post("baseline", {"view": view, "screenshotId": screenshot_id})
+        return self._indexed(self.post("baseline", {"view": view, "screenshotId": screenshot_id}))
 
     def get_baseline_for_screenshot(self, screenshot: Dict[str, Any]) -> Any:
-        platform = (screenshot.get("platform") or {})
-        params: Dict[str, Any] = {
-            "view": screenshot.get("view"),
-            "platformName": platform.get("platformName"),
-        }
-        device_name = platform.get("deviceName")
-        if device_name:
-            params["deviceName"] = device_name
-        else:
-            params["browserName"] = platform.get("browserName")
-            params["screenHeight"] = screenshot.get("height")
-            params["screenWidth"] = screenshot.get("width")
-        return self.get("baseline/", params=params)
+        return self._typed(self.get("baseline/", params=baseline_params(screenshot)), Baseline)
 
     def get_baselines(self) -> Any:
-        return self.get("baseline")
+        return self._typed(self.get("baseline"), Baseline)
 
     def get_baseline(self, baseline_id: str) -> Any:
-        return self.get(f"baseline/{baseline_id}")
+        return self._typed(self.get(f"baseline/{baseline_id}"), Baseline)
 
     def delete_baseline(self, baseline_id: str) -> Any:
-        return self.delete(f"baseline/{baseline_id}")
+        return self._unindexed(baseline_id, self.delete(f"baseline/{baseline_id}"))
 
     def update_baseline(self, baseline_id: str, screenshot_id: Optional[str] = None, ignore_boxes: Optional[List[Any]] = None) -> Any:
         body: Dict[str, Any] = {}
@@ -265,7 +780,7 @@ class BaselineRequests(BaseRequests):
             body["screenshotId"] = screenshot_id
         if ignore_boxes is not None:
             body["ignoreBoxes"] = ignore_boxes
-        return self.put(f"baseline/{baseline_id}", body)
+        return self._indexed(self.put(f"baseline/{baseline_id}", body))
 
 
 class MetricRequests(BaseRequests):
@@ -288,7 +803,7 @@ class MetricRequests(BaseRequests):
             params["groupingPeriod"] = grouping_period.value if hasattr(grouping_period, "value") else str(grouping_period)
         # JS uses an absolute URL via new URL(baseURL + '/metrics/phase?...')
         # We'll just pass a relative path + params; client will build URL.
-        return self.get("metrics/phase", params=params)
+        return self._typed(self.get("metrics/phase", params=params), PhaseMetrics)
 
     def get_screenshot_metrics(self, view: Optional[str] = None, tag: Optional[str] = None, limit: Optional[int] = None, thumbnail: Optional[bool] = None) -> Any:
         params: Dict[str, Any] = {}
@@ -300,9 +815,9 @@ class MetricRequests(BaseRequests):
             params["limit"] = str(limit)
         if thumbnail is not None:
             params["thumbnail"] = str(bool(thumbnail)).lower()
-        return self.get("metrics/screenshot", params=params or None)
+        return self._typed(self.get("metrics/screenshot", params=params or None), ScreenshotMetrics)
 
 
 class AnglesRequests(BaseRequests):
     def get_versions(self) -> Any:
-        return self.get("angles/versions")
+        return self._typed(self.get("angles/versions"), Versions)
@@ -0,0 +1,166 @@
+"""Retry and circuit-breaker policies for :class:`AnglesHttpClient`."""
+
+from __future__ import annotations
+
+import email.utils
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, FrozenSet, Mapping, Optional
+
+from .exceptions import AnglesCircuitOpenError
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    Idempotent requests (``idempotent_methods``, or any request carrying an ``Idempotency-Key``
+    header) are retried on transport errors and on ``retry_statuses``. Other requests, such as
+    ``POST execution/``, are only retried when the server cannot have processed them: the
+    connection was never established, or the server rejected the call with 429/503.
+    """
+
+    max_attempts: int = 3
+    backoff_base_s: float = 0.5
+    backoff_max_s: float = 30.0
+    jitter: bool = True
+    retry_statuses: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    unprocessed_statuses: FrozenSet[int] = frozenset({429, 503})
+    idempotent_methods: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    respect_retry_after: bool = True
+    max_retry_after_s: float = 60.0
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+
+    def is_idempotent(self, method: str, headers: Optional[Mapping[str, str]] = None) -> bool:
+        if method.upper() in self.idempotent_methods:
+            return True
+        return bool(headers) and any(k.lower() == IDEMPOTENCY_HEADER.lower() for k in headers)
+
+    def should_retry_error(self, attempt: int, *, idempotent: bool, connect_failure: bool) -> bool:
+        if attempt >= self.max_attempts:
+            return False
+        return idempotent or connect_failure
+
+    def should_retry_status(self, attempt: int, status_code: int, *, idempotent: bool) -> bool:
+        if attempt >= self.max_attempts:
+            return False
+        if idempotent:
+            return status_code in self.retry_statuses
+        return status_code in self.unprocessed_statuses
+
+    def backoff_s(self, attempt: int) -> float:
+        """Delay before attempt ``attempt + 1``."""
+        ceiling = min(self.backoff_max_s, self.backoff_base_s * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+    def delay_s(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        if self.respect_retry_after and headers:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after_s)
+        return self.backoff_s(attempt)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given as delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """Fast-fails requests while the Angles server looks down.
+
+    After ``failure_threshold`` consecutive failures (transport errors, 429 or 5xx) the circuit
+    opens and every request raises :class:`AnglesCircuitOpenError` immediately. Once
+    ``reset_timeout_s`` has elapsed a single probe request is let through (half-open); its
+    outcome closes the circuit again or re-opens it for another timeout. Thread-safe.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout_s:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_request(self, url: Optional[str] = None) -> bool:
+        """Raise while the circuit is open; returns ``True`` if the caller's request is the half-open probe."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return False
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+        raise AnglesCircuitOpenError("Circuit open: Angles server is unavailable", url=url)
+
+    def release_probe(self) -> None:
+        """Give up the half-open probe without an outcome (e.g. it was cancelled), so another can run."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def record_status(self, status_code: int) -> None:
+        if status_code == 429 or status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+def is_rewindable(body: Any) -> bool:
+    """Whether a request body can be sent again on retry."""
+    return (
+        body is None
+        or isinstance(body, (bytes, str, dict, list, tuple))
+        or hasattr(body, "seek")
+        or getattr(body, "rewindable", False)
+    )
+
+
+def rewind(body: Any) -> None:
+    if hasattr(body, "seek"):
+        body.seek(0)
@@ -0,0 +1,495 @@
+"""Durable on-disk spool of pending Angles submissions, with an offline replay engine.
+
+Layout of a spool directory::
+
+    segment-<pid>-<start>-<seq>.jsonl   append-only records: {"id", "kind", "payload", "ts"}
+    acks.log                            one {"id", "result_id"} line per uploaded record
+
+Records are fsync'ed in batches (every ``fsync_every`` records or ``fsync_interval_s``
+seconds), segments are rotated at ``segment_max_bytes`` and deleted once every record in
+them has been acknowledged, the one being written included; ``acks.log`` is then rewritten
+without the acks nothing can refer to any more. Several processes may spool into the same
+directory. Each :class:`Spool` reads the files incrementally, so a replay only parses what
+was written since the previous one.
+
+Screenshot records reference the image by path; the file must still exist at replay time.
+Placeholder ids (``"spool:<record id>"``) returned for spooled screenshots are replaced with
+the server-assigned ``_id`` when executions referencing them are replayed.
+
+Replay from the command line::
+
+    python -m angles_python_client.spool replay /path/to/spool --base-url http://host/rest/api/v1.0/
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import glob
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+from ._concurrency import bounded_map
+from ._serialize import dumps_bytes, jsonable
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_PREFIX = "spool:"
+ACKS_FILE = "acks.log"
+
+# kinds are replayed in this order so screenshot ids exist before executions reference them
+REPLAY_ORDER = ("screenshot", "execution")
+
+
+@dataclass
+class SpoolRecord:
+    id: str
+    kind: str
+    payload: Any
+    ts: float
+    segment: str = ""
+
+
+def placeholder_id(record_id: str) -> str:
+    return PLACEHOLDER_PREFIX + record_id
+
+
+class Spool:
+    """Append-only, segment-rotated write-ahead log of pending uploads. Thread-safe."""
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        segment_max_bytes: int = 16 * 1024 * 1024,
+        fsync_every: int = 64,
+        fsync_interval_s: float = 1.0,
+    ) -> None:
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval_s = fsync_interval_s
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._prefix = f"segment-{os.getpid()}-{int(time.time() * 1000)}"
+        self._seq = 0
+        self._segment: Optional[Any] = None
+        self._segment_size = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        # incremental view of the directory: bytes consumed per file, and what they held
+        self._scan_lock = threading.Lock()
+        self._offsets: Dict[str, int] = {}
+        self._acks_inode: Optional[int] = None
+        self._acked: Dict[str, Optional[str]] = {}
+        self._pending: Dict[str, SpoolRecord] = {}
+        self._ids: Dict[str, Set[str]] = {}  # segment -> ids of the records in it
+        self._appended: Set[str] = set()  # later records of this process may still reference these
+
+    # --- writing ---
+    def append(self, kind: str, payload: Any, *, record_id: Optional[str] = None) -> str:
+        """Durably (modulo fsync batching) record a submission; returns its record id."""
+        record_id = record_id or uuid.uuid4().hex
+        line = dumps_bytes({"id": record_id, "kind": kind, "payload": jsonable(payload), "ts": time.time()}) + b"\n"
+        with self._lock:
+            if self._segment is None or self._segment_size >= self.segment_max_bytes:
+                self._rotate()
+            assert self._segment is not None
+            self._segment.write(line)
+            self._segment_size += len(line)
+            self._unsynced += 1
+            self._appended.add(record_id)
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval_s:
+                self._sync()
+        return record_id
+
+    def _rotate(self) -> None:
+        if self._segment is not None:
+            self._sync()
+            self._segment.close()
+        self._seq += 1
+        path = os.path.join(self.directory, f"{self._prefix}-{self._seq:06d}.jsonl")
+        self._segment = open(path, "ab")
+        self._segment_size = 0
+
+    def _sync(self) -> None:
+        if self._segment is not None and self._unsynced:
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """Force outstanding records to disk."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._segment is not None:
+                self._sync()
+                self._segment.close()
+                self._segment = None
+
+    def ack(self, record_id: str, result_id: Optional[str] = None) -> None:
+        """Mark a record as uploaded. ``result_id`` is the server ``_id`` it was assigned."""
+        line = dumps_bytes({"id": record_id, "result_id": result_id}) + b"\n"
+        # O_APPEND writes of one short line are atomic across processes
+        fd = os.open(os.path.join(self.directory, ACKS_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+        with self._scan_lock:
+            self._acked[record_id] = result_id
+            self._pending.pop(record_id, None)
+
+    # --- reading ---
+    def _refresh(self) -> None:
+        """Read what was appended to acks.log and the segments since the last call (``_scan_lock`` held)."""
+        path = os.path.join(self.directory, ACKS_FILE)
+        try:
+            st: Optional[os.stat_result] = os.stat(path)
+        except FileNotFoundError:
+            st = None
+        inode = st.st_ino if st is not None else None
+        if inode != self._acks_inode or (st is not None and st.st_size < self._offsets.get(ACKS_FILE, 0)):
+            # rewritten by compact(), possibly in another process: read it again from the start
+            self._acked = {k: v for k, v in self._acked.items() if k in self._appended}
+            self._acks_inode, self._offsets[ACKS_FILE] = inode, 0
+        entries, self._offsets[ACKS_FILE] = _read_new(path, self._offsets.get(ACKS_FILE, 0))
+        for entry in entries:
+            self._acked[entry["id"]] = entry.get("result_id")
+            self._pending.pop(entry["id"], None)
+
+        segments = self.segments()
+        for gone in set(self._ids) - set(segments):  # compacted by another process
+            self._forget(gone)
+        for segment in segments:
+            entries, self._offsets[segment] = _read_new(segment, self._offsets.get(segment, 0))
+            ids = self._ids.setdefault(segment, set())
+            for entry in entries:
+                record_id = entry["id"]
+                ids.add(record_id)
+                if record_id in self._acked or record_id in self._pending:
+                    continue
+                self._pending[record_id] = SpoolRecord(
+                    id=record_id, kind=entry["kind"], payload=entry["payload"], ts=entry.get("ts", 0.0), segment=segment
+                )
+
+    def _forget(self, segment: str) -> None:
+        self._offsets.pop(segment, None)
+        self._ids.pop(segment, None)
+        for record_id in [r.id for r in self._pending.values() if r.segment == segment]:
+            del self._pending[record_id]
+
+    def acks(self) -> Dict[str, Optional[str]]:
+        """``record id -> server _id`` for every acknowledged record."""
+        with self._scan_lock:
+            self._refresh()
+            return dict(self._acked)
+
+    def segments(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "segment-*.jsonl")))
+
+    def records(self) -> Iterator[SpoolRecord]:
+        for segment in self.segments():
+            for entry in _read_jsonl(segment):
+                yield SpoolRecord(id=entry["id"], kind=entry["kind"], payload=entry["payload"], ts=entry.get("ts", 0.0), segment=segment)
+
+    def pending(self) -> Iterator[SpoolRecord]:
+        """Unacknowledged records, each id at most once."""
+        with self._scan_lock:
+            self._refresh()
+            pending = list(self._pending.values())
+        return iter(pending)
+
+    def compact(self) -> int:
+        """Delete fully acknowledged segments that no live writer of another process has open.
+
+        This process's open segment is closed and deleted too once everything in it is
+        acknowledged; the next ``append`` starts a new one. acks.log is then rewritten. Run it
+        while no replay of the directory is in progress (``SpoolReplayer.replay`` calls it).
+        """
+        with self._scan_lock:
+            self._refresh()
+            busy = {r.segment for r in self._pending.values()}
+        with self._lock:
+            active = self._segment.name if self._segment is not None else None
+            if self._segment is not None and active not in busy:
+                self._sync()
+                if self._offsets.get(active, 0) == self._segment.tell():  # nothing appended since the refresh
+                    self._segment.close()
+                    self._segment, active = None, None
+        removed = 0
+        with self._scan_lock:
+            for segment in self.segments():
+                if segment == active or segment in busy:
+                    continue
+                owner = os.path.basename(segment).split("-")[1]
+                ours = owner == str(os.getpid())
+                if owner.isdigit() and not ours and _pid_alive(int(owner)):
+                    continue
+                try:
+                    size = os.path.getsize(segment)
+                except OSError:
+                    continue
+                if ours and self._offsets.get(segment, 0) < size:
+                    continue  # rotated after the refresh; not read yet
+                os.remove(segment)
+                self._forget(segment)
+                removed += 1
+            if removed:
+                self._rewrite_acks()
+        return removed
+
+    def _rewrite_acks(self) -> None:
+        # keep the acks of surviving records, of screenshots pending records still refer to,
+        # and of everything this process spooled (its next records may refer to those too)
+        keep = set(self._appended)
+        for ids in self._ids.values():
+            keep |= ids
+        for record in self._pending.values():
+            keep |= _placeholders(record.payload)
+        self._acked = {k: v for k, v in self._acked.items() if k in keep}
+        path = os.path.join(self.directory, ACKS_FILE)
+        data = b"".join(dumps_bytes({"id": k, "result_id": v}) + b"\n" for k, v in self._acked.items())
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=ACKS_FILE, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self._acks_inode, self._offsets[ACKS_FILE] = os.stat(path).st_ino, len(data)
+
+
+def _read_new(path: str, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+    """Complete lines of ``path`` after byte ``offset``, and the offset just past them."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return [], offset
+    with f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1  # a torn tail is read again next time
+    entries = []
+    for line in data[:end].splitlines():
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            logger.warning("Skipping corrupt spool line in %s", path)
+    return entries, offset + end
+
+
+def _read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # torn tail of a segment still being written
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning("Skipping corrupt spool line in %s", path)
+
+
+def _substitute(value: Any, ids: Dict[str, Optional[str]]) -> Any:
+    if isinstance(value, str) and value.startswith(PLACEHOLDER_PREFIX):
+        return ids.get(value[len(PLACEHOLDER_PREFIX):], value)
+    if isinstance(value, dict):
+        return {k: _substitute(v, ids) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, ids) for v in value]
+    return value
+
+
+def _placeholders(value: Any) -> Set[str]:
+    found: Set[str] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            if item.startswith(PLACEHOLDER_PREFIX):
+                found.add(item[len(PLACEHOLDER_PREFIX):])
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return found
+
+
+@contextlib.contextmanager
+def _directory_lock(directory: str) -> Iterator[None]:
+    if fcntl is None:  # pragma: no cover - Windows
+        yield
+        return
+    with open(os.path.join(directory, "replay.lock"), "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+@dataclass
+class ReplayReport:
+    uploaded: int = 0
+    failed: int = 0
+    errors: List[BaseException] = field(default_factory=list)
+
+
+class SpoolReplayer:
+    """Drains a :class:`Spool` through upload ``handlers`` (``kind -> callable(payload)``)."""
+
+    def __init__(self, spool: Spool, handlers: Dict[str, Callable[[Any], Any]], *, max_workers: int = 4) -> None:
+        self.spool = spool
+        self.handlers = handlers
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+
+    def replay(self) -> ReplayReport:
+        """Upload every pending record once; failures stay in the spool for the next run.
+
+        Replays of the same directory are serialized across threads and (where ``fcntl`` is
+        available) processes, so a record is never uploaded twice.
+        """
+        with self._lock, _directory_lock(self.spool.directory):
+            report = ReplayReport()
+            pending = list(self.spool.pending())
+            pending_ids = {r.id for r in pending}
+            ids = self.spool.acks()
+            kinds = [k for k in REPLAY_ORDER if k in self.handlers] + [k for k in self.handlers if k not in REPLAY_ORDER]
+            for kind in kinds:
+                batch = [r for r in pending if r.kind == kind]
+                for result in bounded_map(lambda r: self._upload(r, ids, pending_ids), batch, max_workers=self.max_workers):
+                    record = result.item
+                    if result.ok:
+                        result_id = result.result.get("_id") if isinstance(result.result, dict) else None
+                        ids[record.id] = result_id
+                        pending_ids.discard(record.id)
+                        self.spool.ack(record.id, result_id)
+                        report.uploaded += 1
+                    else:
+                        report.failed += 1
+                        report.errors.append(result.error)
+            unknown = [r for r in pending if r.kind not in self.handlers]
+            if unknown:
+                logger.warning("No replay handler for %d spooled record(s) of kind(s) %s", len(unknown), sorted({r.kind for r in unknown}))
+            self.spool.compact()
+            return report
+
+    def _upload(self, record: SpoolRecord, ids: Dict[str, Optional[str]], pending_ids: Set[str]) -> Any:
+        payload = _substitute(record.payload, ids)
+        waiting = _placeholders(payload) & pending_ids
+        if waiting:
+            raise RuntimeError(f"Record {record.id} references {len(waiting)} screenshot(s) not uploaded yet")
+        return self.handlers[record.kind](payload)
+
+
+class SpoolUploader:
+    """Background thread replaying a spool every ``interval_s`` seconds (or when poked)."""
+
+    def __init__(self, replayer: SpoolReplayer, *, interval_s: float = 2.0) -> None:
+        self.replayer = replayer
+        self.interval_s = interval_s
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="angles-spool-uploader", daemon=True)
+        self._thread.start()
+
+    def poke(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval_s)
+            self._wake.clear()
+            self._drain()
+
+    def _drain(self) -> ReplayReport:
+        self.replayer.spool.sync()
+        try:
+            return self.replayer.replay()
+        except Exception as e:  # never let the uploader thread die
+            logger.warning("Angles spool replay failed: %s", e)
+            return ReplayReport(failed=1, errors=[e])
+
+    def stop(self, *, drain: bool = True) -> Optional[ReplayReport]:
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join()
+        return self._drain() if drain else None
+
+
+def default_handlers(http: Any) -> Dict[str, Callable[[Any], Any]]:
+    from .requests import ExecutionRequests, ScreenshotRequests
+
+    return {
+        "execution": ExecutionRequests(http).save_execution,
+        "screenshot": ScreenshotRequests(http).save_screenshot,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from .http import AnglesHttpClient
+
+    parser = argparse.ArgumentParser(prog="angles-spool", description="Inspect or replay an Angles upload spool.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    replay = sub.add_parser("replay", help="upload every pending record")
+    replay.add_argument("directory")
+    replay.add_argument("--base-url", default=AnglesHttpClient.base_url)
+    replay.add_argument("--workers", type=int, default=4)
+    replay.add_argument("--timeout", type=float, default=30.0)
+    status = sub.add_parser("status", help="count pending records")
+    status.add_argument("directory")
+    args = parser.parse_args(argv)
+
+    spool = Spool(args.directory)
+    if args.command == "status":
+        counts: Dict[str, int] = {}
+        for record in spool.pending():
+            counts[record.kind] = counts.get(record.kind, 0) + 1
+        print(json.dumps(counts))
+        return 0
+
+    http = AnglesHttpClient(base_url=args.base_url, timeout_s=args.timeout, pool_maxsize=max(10, args.workers))
+    report = SpoolReplayer(spool, default_handlers(http), max_workers=args.workers).replay()
+    print(json.dumps({"uploaded": report.uploaded, "failed": report.failed}))
+    for error in report.errors[:10]:
+        print(f"error: {error}", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
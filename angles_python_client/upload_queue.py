@@ -0,0 +1,237 @@
+"""Bounded background upload queue used by :class:`AnglesReporter`'s non-blocking mode."""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .exceptions import AnglesUploadDroppedError
+
+logger = logging.getLogger(__name__)
+
+
+class Backpressure(str, Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    SPILL = "spill"
+
+
+_Item = Tuple[str, Any, Future]
+
+# stands in for a pending Future in a spilled payload; the Future itself stays in memory
+_FUTURE_KEY = "__angles_future__"
+
+
+def resolve_futures(payload: Any) -> Any:
+    """Replace ``Future`` placeholders (e.g. pending screenshot uploads) with the resolved ``_id``."""
+    if isinstance(payload, Future):
+        try:
+            result = payload.result()
+        except Exception:
+            return None
+        if isinstance(result, dict):
+            return result.get("_id")
+        return result
+    if isinstance(payload, dict):
+        return {k: resolve_futures(v) for k, v in payload.items()}
+    if isinstance(payload, list):
+        return [resolve_futures(v) for v in payload]
+    return payload
+
+
+def _detach_futures(payload: Any, futures: List[Future]) -> Any:
+    """Replace ``Future`` placeholders with ``{_FUTURE_KEY: index}`` markers, collecting them in ``futures``."""
+    if isinstance(payload, Future):
+        futures.append(payload)
+        return {_FUTURE_KEY: len(futures) - 1}
+    if isinstance(payload, dict):
+        return {k: _detach_futures(v, futures) for k, v in payload.items()}
+    if isinstance(payload, list):
+        return [_detach_futures(v, futures) for v in payload]
+    return payload
+
+
+def _attach_futures(payload: Any, futures: List[Future]) -> Any:
+    """Inverse of :func:`_detach_futures`."""
+    if isinstance(payload, dict):
+        if len(payload) == 1 and _FUTURE_KEY in payload:
+            return futures[payload[_FUTURE_KEY]]
+        return {k: _attach_futures(v, futures) for k, v in payload.items()}
+    if isinstance(payload, list):
+        return [_attach_futures(v, futures) for v in payload]
+    return payload
+
+
+class UploadQueue:
+    """Bounded FIFO drained by a pool of worker threads.
+
+    ``handlers`` maps a submission kind (``"execution"``, ``"screenshot"``, ...) to the blocking
+    callable that uploads it. Payloads should already be JSON-shaped so they can be spilled to
+    disk when ``backpressure`` is :attr:`Backpressure.SPILL`.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[[Any], Any]],
+        *,
+        max_size: int = 1000,
+        workers: int = 2,
+        backpressure: Backpressure = Backpressure.BLOCK,
+        spill_dir: Optional[str] = None,
+        close_timeout_s: Optional[float] = 30.0,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        backpressure = Backpressure(backpressure)
+        if backpressure is Backpressure.SPILL and not spill_dir:
+            raise ValueError("spill_dir is required when backpressure is 'spill'")
+
+        self.handlers = dict(handlers)
+        self.max_size = max_size
+        self.backpressure = backpressure
+        self.spill_dir = spill_dir
+        self.close_timeout_s = close_timeout_s
+
+        self._items: Deque[_Item] = deque()
+        self._spilled: Deque[Tuple[str, Future, List[Future]]] = deque()
+        self._spill_seq = itertools.count()
+        self._pending = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        self._threads: List[threading.Thread] = []
+        for i in range(workers):
+            t = threading.Thread(target=self._worker, name=f"angles-upload-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        atexit.register(self._atexit)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items) + len(self._spilled)
+
+    @property
+    def pending(self) -> int:
+        """Submissions queued or currently uploading."""
+        with self._cond:
+            return self._pending
+
+    def submit(self, kind: str, payload: Any) -> "Future[Any]":
+        if kind not in self.handlers:
+            raise ValueError(f"No upload handler registered for {kind!r}")
+        fut: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("UploadQueue is closed")
+            if len(self._items) >= self.max_size or self._spilled:
+                self._apply_backpressure(kind, payload, fut)
+            else:
+                self._items.append((kind, payload, fut))
+            self._pending += 1
+            self._cond.notify_all()
+        return fut
+
+    def _apply_backpressure(self, kind: str, payload: Any, fut: Future) -> None:
+        # called with self._cond held
+        if self.backpressure is Backpressure.BLOCK:
+            while len(self._items) >= self.max_size and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                raise RuntimeError("UploadQueue is closed")
+            self._items.append((kind, payload, fut))
+        elif self.backpressure is Backpressure.DROP_OLDEST:
+            _, _, dropped = self._items.popleft()
+            self._pending -= 1
+            dropped.set_exception(AnglesUploadDroppedError("Upload dropped: queue full"))
+            self._items.append((kind, payload, fut))
+        else:
+            # pending futures (e.g. screenshots still queued) are not resolved here: that would
+            # wait, with the lock held, on a worker that needs the lock to make progress
+            futures: List[Future] = []
+            path = self._spill(kind, _detach_futures(payload, futures))
+            self._spilled.append((path, fut, futures))
+
+    def _spill(self, kind: str, payload: Any) -> str:
+        assert self.spill_dir is not None
+        path = os.path.join(self.spill_dir, f"{os.getpid()}-{next(self._spill_seq):012d}.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"kind": kind, "payload": payload}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        return path
+
+    def _next_item(self) -> Optional[_Item]:
+        # called with self._cond held
+        while True:
+            if self._items:
+                item = self._items.popleft()
+                self._cond.notify_all()
+                return item
+            if self._spilled:
+                path, fut, futures = self._spilled.popleft()
+                with open(path, encoding="utf-8") as f:
+                    record = json.load(f)
+                os.remove(path)
+                payload = _attach_futures(record["payload"], futures) if futures else record["payload"]
+                return record["kind"], payload, fut
+            if self._closed:
+                return None
+            self._cond.wait()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                item = self._next_item()
+            if item is None:
+                return
+            kind, payload, fut = item
+            if fut.set_running_or_notify_cancel():
+                try:
+                    fut.set_result(self.handlers[kind](resolve_futures(payload)))
+                except BaseException as e:
+                    logger.warning("Angles %s upload failed: %s", kind, e)
+                    fut.set_exception(e)
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted upload has finished. Returns ``False`` on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush outstanding uploads, then stop the workers. Idempotent."""
+        drained = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if drained:
+            for t in self._threads:
+                t.join(timeout)
+        atexit.unregister(self._atexit)
+        return drained
+
+    def _atexit(self) -> None:
+        if not self.close(self.close_timeout_s):
+            logger.warning("Angles upload queue closed with %d uploads still pending", self.pending)
@@ -0,0 +1,73 @@
+"""Time and memory to decode a large build report: plain dicts vs eager models vs lazy models.
+
+Each variant parses the same JSON body and then reads every execution's title and status, as a
+report summary would. Run with ``python benchmarks/bench_models.py [executions]``.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from angles_python_client.lazy_models import decode, lazy
+from angles_python_client.models import BuildReport
+
+
+def report_body(executions: int, actions: int = 5, steps: int = 20) -> bytes:
+    def step(i: int) -> dict:
+        return {"name": f"step {i}", "status": "PASS", "info": "ok", "timestamp": "2024-05-01T10:00:00.000Z"}
+
+    def execution(i: int) -> dict:
+        return {
+            "_id": f"e{i}",
+            "title": f"test {i}",
+            "status": "PASS",
+            "start": "2024-05-01T10:00:00.000Z",
+            "end": "2024-05-01T10:00:05.000Z",
+            "actions": [{"name": f"action {a}", "status": "PASS", "steps": [step(s) for s in range(steps)]} for a in range(actions)],
+        }
+
+    suites = [{"name": f"suite {s}", "status": "PASS", "executions": [execution(i) for i in range(s, executions, 10)]} for s in range(10)]
+    return json.dumps({"_id": "b1", "name": "bench", "status": "PASS", "start": "2024-05-01T10:00:00.000Z", "suites": suites}).encode()
+
+
+def summarise_dicts(body: bytes) -> int:
+    report = json.loads(body)
+    return sum(1 for suite in report["suites"] for e in suite["executions"] if e["title"] and e["status"] == "PASS")
+
+
+def summarise_eager(body: bytes) -> int:
+    report = decode(json.loads(body), BuildReport)
+    return sum(1 for suite in report.suites for e in suite.executions if e.title and e.status == "PASS")
+
+
+def summarise_lazy(body: bytes) -> int:
+    report = lazy(json.loads(body), BuildReport)
+    return sum(1 for suite in report.suites for e in suite.executions if e.title and e.status == "PASS")
+
+
+def run(label: str, fn: Callable[[bytes], Any], body: bytes) -> None:
+    start = time.perf_counter()
+    fn(body)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>6}: {elapsed * 1000:8.1f} ms, peak {peak / 2**20:7.1f} MiB")
+
+
+def main() -> None:
+    executions = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    body = report_body(executions)
+    print(f"report: {executions} executions, {len(body) / 2**20:.1f} MiB of JSON")
+    run("dicts", summarise_dicts, body)
+    run("eager", summarise_eager, body)
+    run("lazy", summarise_lazy, body)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Per-test overhead of the pytest plugin.
+
+Drives the plugin's hooks for a passing test (setup/call/teardown, each with its report) the way
+pytest calls them, and reports two costs separately:
+
+* the time a test spends in the plugin's hooks, i.e. what ``--angles`` adds to the test's own
+  thread. Batches handed to the upload queue are only collected while this is measured;
+* the CPU the upload threads then spend encoding and posting each execution, to a session that
+  answers instantly. In CPython that work competes with the tests for the GIL, so on a busy
+  single core it shows up in wall time as well.
+
+Both are measured for a plain session, where the upload threads post to Angles, and for a
+pytest-xdist worker, where they pass executions to an in-process
+:class:`~angles_python_client.aggregator.AggregatorServer` (Unix only). The budget is 50 µs
+per test on the test's thread in either mode; the script exits non-zero above it.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_pytest_plugin.py [tests]``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Optional, Tuple
+
+from angles_python_client.aggregator import AggregatorServer
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.pytest_plugin import AnglesPlugin, TestRecorder
+from angles_python_client.reporter import AnglesReporter
+
+BUDGET_US = 50.0
+BASE_URL = "http://angles.bench/rest/api/v1.0/"
+
+
+class _Response:
+    status_code = 200
+    content = json.dumps({"_id": "bench"}).encode()
+
+    def json(self):
+        return {"_id": "bench"}
+
+
+class _NoopSession:
+    def request(self, method, url, **kwargs):
+        return _Response()
+
+
+def _report(when: str) -> SimpleNamespace:
+    return SimpleNamespace(when=when, passed=True, failed=False, duration=0.000123, longrepr=None)
+
+
+def record(recorder: TestRecorder, tests: int) -> float:
+    """Runs ``tests`` passing tests through the recorder's hooks; returns µs per test."""
+    setup, call, teardown = _report("setup"), _report("call"), _report("teardown")
+    start = time.perf_counter()
+    for i in range(tests):
+        nodeid = f"tests/test_bench.py::test_noop[{i}]"
+        recorder.pytest_runtest_logstart(nodeid, None)
+        recorder.pytest_runtest_setup(None)
+        recorder.pytest_runtest_logreport(setup)
+        recorder.pytest_runtest_call(None)
+        recorder.pytest_runtest_logreport(call)
+        recorder.pytest_runtest_teardown(None, None)
+        recorder.pytest_runtest_logreport(teardown)
+        recorder.pytest_runtest_logfinish(nodeid, None)
+    elapsed = time.perf_counter() - start
+    recorder.flush()
+    return elapsed / tests * 1e6
+
+
+def start_session(socket_path: Optional[str] = None) -> AnglesPlugin:
+    """Runs the plugin's session start as pytest would, as an xdist worker when given a socket."""
+    options = {"angles_build_id": "bench", "angles_upload_workers": 1, "angles_batch_size": 100}
+    pluginmanager = SimpleNamespace(has_plugin=lambda name: False, register=lambda plugin, name: None)
+    config = SimpleNamespace(getoption=options.get, pluginmanager=pluginmanager)
+    if socket_path is not None:
+        config.workerinput = {"angles_build_id": "bench", "angles_socket": socket_path}
+    reporter = AnglesReporter(base_url=BASE_URL, session=_NoopSession())
+    plugin = AnglesPlugin(config, reporter)
+    plugin.pytest_sessionstart(None)
+    return plugin
+
+
+def measure(plugin: AnglesPlugin, tests: int) -> Tuple[float, float]:
+    """µs per test on the test's thread and on the upload threads; ends the session."""
+    queue, recorder = plugin.upload_queue, plugin.recorder
+    assert queue is not None and recorder is not None
+
+    # 1. the test's thread: batches are dropped as soon as they are handed over
+    queue.handlers["angles-plugin-executions"] = lambda batch: 0
+    test_us = record(recorder, tests)
+    queue.flush()
+
+    # 2. the upload threads, timed on their own over a smaller sample
+    batches: list = []
+    queue.handlers["angles-plugin-executions"] = lambda batch: batches.append(batch) or 0
+    sample = max(tests // 10, 1)
+    record(recorder, sample)
+    queue.flush()
+    start = time.perf_counter()
+    for batch in batches:
+        plugin.add_failed_uploads(plugin._upload_batch(batch))
+    upload_us = (time.perf_counter() - start) / sample * 1e6
+    plugin.pytest_sessionfinish(None)
+    return test_us, upload_us
+
+
+def main() -> None:
+    tests = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    ok = True
+    modes = ["direct", "aggregator"] if hasattr(socket, "AF_UNIX") else ["direct"]
+    for mode in modes:
+        if mode == "direct":
+            plugin = start_session()
+            test_us, upload_us = measure(plugin, tests)
+        else:
+            with tempfile.TemporaryDirectory(prefix="angles-bench-") as directory:
+                http = AnglesHttpClient(base_url=BASE_URL, session=_NoopSession())
+                server = AggregatorServer(os.path.join(directory, "aggregator.sock"), http).start()
+                plugin = start_session(server.socket_path)
+                test_us, upload_us = measure(plugin, tests)
+                plugin.add_failed_uploads(server.stop()["failed"])
+        print(f"{mode}:")
+        print(f"   test thread: {test_us:6.1f} µs/test (budget {BUDGET_US:.0f} µs)")
+        print(f"upload threads: {upload_us:6.1f} µs/test")
+        ok = ok and test_us <= BUDGET_US and plugin.failed_uploads == 0
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
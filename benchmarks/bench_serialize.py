@@ -0,0 +1,71 @@
+"""Compare the compiled jsonable() against the previous asdict()-based implementation.
+
+Run with ``python benchmarks/bench_serialize.py [steps_per_action]``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime as _dt
+import sys
+import timeit
+from enum import Enum
+from typing import Any, Mapping
+
+from angles_python_client._serialize import jsonable
+from angles_python_client.models import Action, Step, StepStates
+from angles_python_client.models.requests import CreateExecution
+
+
+def legacy_jsonable(obj: Any) -> Any:
+    """The pre-compiled implementation, kept here as the baseline."""
+    if obj is None:
+        return None
+    if isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (_dt.datetime, _dt.date)):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {k: legacy_jsonable(v) for k, v in dataclasses.asdict(obj).items() if v is not None}
+    if isinstance(obj, Mapping):
+        return {str(k): legacy_jsonable(v) for k, v in obj.items() if v is not None}
+    if isinstance(obj, (list, tuple, set)):
+        return [legacy_jsonable(v) for v in obj]
+    return obj
+
+
+def build_execution(actions: int = 20, steps_per_action: int = 500) -> CreateExecution:
+    now = _dt.datetime.now()
+    return CreateExecution(
+        title="bench",
+        suite="bench",
+        build="build-id",
+        actions=[
+            Action(
+                name=f"action-{a}",
+                start=now,
+                steps=[
+                    Step(name="INFO", info=f"step {s}", status=StepStates.INFO, timestamp=now)
+                    for s in range(steps_per_action)
+                ],
+            )
+            for a in range(actions)
+        ],
+    )
+
+
+def main() -> None:
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    execution = build_execution(steps_per_action=steps)
+    assert jsonable(execution) == legacy_jsonable(execution)
+    total_steps = 20 * steps
+    for name, fn in (("legacy asdict", legacy_jsonable), ("compiled", jsonable)):
+        runs = 5
+        best = min(timeit.repeat(lambda: fn(execution), number=1, repeat=runs))
+        print(f"{name:>14}: {best * 1000:8.1f} ms for {total_steps} steps ({total_steps / best:,.0f} steps/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Memory and throughput of AnglesReporter.add_step with StepLog vs a plain List[Step].
+
+Run with ``python benchmarks/bench_steps.py [steps]``.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from angles_python_client.models import StepStates
+from angles_python_client.reporter import AnglesReporter
+
+
+def run(steps: int, compact: bool) -> None:
+    reporter = AnglesReporter()
+    reporter.set_current_build("bench")
+    reporter.start_test("bench", "bench")
+    reporter.add_action("soak")
+    if not compact:
+        reporter.current_action.steps = []
+    messages = [f"message {i % 1000}" for i in range(1000)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(steps):
+        reporter.add_step("INFO", None, None, messages[i % 1000], StepStates.INFO, None)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    label = "StepLog" if compact else "List[Step]"
+    print(f"{label:>10}: {current / steps:6.1f} B/step, {steps / elapsed:>12,.0f} steps/s (traced)")
+
+
+def main() -> None:
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    run(steps, compact=False)
+    run(steps, compact=True)
+
+
+if __name__ == "__main__":
+    main()
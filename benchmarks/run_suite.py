@@ -0,0 +1,216 @@
+"""Benchmark suite for the client's hot paths, against an in-process stub Angles server.
+
+Measures ``add_step`` throughput, ``jsonable`` on a large ``CreateExecution``, ``save_execution``
+latency and throughput from concurrent threads, screenshot upload throughput and the memory
+held per 100k steps, and prints the results as JSON.
+
+Every metric is checked against ``thresholds.json`` (a floor for rates, a ceiling for
+latencies and memory) and, with ``--baseline``, against a previous result file: a metric more
+than ``--tolerance`` worse than its baseline is a regression. The script exits non-zero on any
+regression, so it can gate CI::
+
+    PYTHONPATH=. python benchmarks/run_suite.py --output bench.json
+    PYTHONPATH=. python benchmarks/run_suite.py --baseline bench.json --tolerance 0.2
+
+``--quick`` shrinks every workload for a smoke run; its numbers are noisier.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from bench_serialize import build_execution
+from stub_server import StubAngles
+
+from angles_python_client._serialize import jsonable
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.models import StepStates
+from angles_python_client.models.requests import StoreScreenshot
+from angles_python_client.reporter import AnglesReporter
+
+THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+# metric -> True when higher is better
+METRICS: Dict[str, bool] = {
+    "add_step_steps_per_s": True,
+    "jsonable_steps_per_s": True,
+    "save_execution_per_s": True,
+    "save_execution_p50_ms": False,
+    "save_execution_p99_ms": False,
+    "screenshot_upload_mb_per_s": True,
+    "memory_mib_per_100k_steps": False,
+}
+
+
+def _best_of(repeat: int, fn: Callable[[], float]) -> float:
+    return min(fn() for _ in range(repeat))
+
+
+def _execution(reporter: AnglesReporter, actions: int, steps: int) -> Any:
+    reporter.start_test("bench", "bench")
+    for a in range(actions):
+        reporter.add_action(f"action {a}")
+        for s in range(steps):
+            reporter.pass_step(f"step {s}", "expected", "actual", f"{a}.{s}")
+    execution, reporter.current_execution, reporter.current_action = reporter.current_execution, None, None
+    return execution
+
+
+def bench_add_step(steps: int) -> Dict[str, float]:
+    def run() -> float:
+        reporter = AnglesReporter()
+        reporter.set_current_build("bench")
+        reporter.start_test("bench", "bench")
+        reporter.add_action("bench")
+        add_step = reporter.add_step
+        start = time.perf_counter()
+        for i in range(steps):
+            add_step("INFO", None, None, "message", StepStates.INFO, None)
+        return time.perf_counter() - start
+
+    return {"add_step_steps_per_s": steps / _best_of(3, run)}
+
+
+def bench_jsonable(steps_per_action: int) -> Dict[str, float]:
+    execution = build_execution(steps_per_action=steps_per_action)
+
+    def run() -> float:
+        start = time.perf_counter()
+        jsonable(execution)
+        return time.perf_counter() - start
+
+    return {"jsonable_steps_per_s": 20 * steps_per_action / _best_of(3, run)}
+
+
+def bench_save_execution(base_url: str, executions: int, concurrency: int) -> Dict[str, float]:
+    http = AnglesHttpClient(base_url=base_url, pool_maxsize=concurrency)
+    reporter = AnglesReporter(http=http)
+    reporter.set_current_build("bench")
+    execution = _execution(reporter, actions=5, steps=20)
+    latencies: List[float] = []
+
+    def save(_: int) -> None:
+        start = time.perf_counter()
+        reporter.executions.save_execution(execution)
+        latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(save, range(concurrency)))  # warm up the connection pool
+        latencies.clear()
+        start = time.perf_counter()
+        list(pool.map(save, range(executions)))
+        elapsed = time.perf_counter() - start
+    http.session.close()
+    latencies.sort()
+    return {
+        "save_execution_per_s": executions / elapsed,
+        "save_execution_p50_ms": statistics.median(latencies) * 1000,
+        "save_execution_p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def bench_screenshots(base_url: str, count: int, size_mib: int, concurrency: int) -> Dict[str, float]:
+    reporter = AnglesReporter(http=AnglesHttpClient(base_url=base_url, pool_maxsize=concurrency))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "screenshot.png")
+        with open(path, "wb") as f:
+            f.write(os.urandom(size_mib * 2**20))
+        now = _dt.datetime.now()
+        uploads = [StoreScreenshot(buildId="bench", view="desktop", timestamp=now, filePath=path) for _ in range(count)]
+        start = time.perf_counter()
+        results = list(reporter.screenshots.save_screenshots(uploads, max_workers=concurrency))
+        elapsed = time.perf_counter() - start
+    reporter.http.session.close()
+    assert all(r.ok for r in results), [r.error for r in results if not r.ok]
+    return {"screenshot_upload_mb_per_s": count * size_mib / elapsed}
+
+
+def bench_memory(steps: int) -> Dict[str, float]:
+    reporter = AnglesReporter()
+    reporter.set_current_build("bench")
+    reporter.start_test("bench", "bench")
+    reporter.add_action("bench")
+    messages = [f"message {i}" for i in range(1000)]
+    tracemalloc.start()
+    for i in range(steps):
+        reporter.add_step("INFO", None, None, messages[i % 1000], StepStates.INFO, None)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"memory_mib_per_100k_steps": current / steps * 100_000 / 2**20}
+
+
+def run_suite(quick: bool = False) -> Dict[str, float]:
+    scale = 10 if quick else 1
+    metrics: Dict[str, float] = {}
+    metrics.update(bench_add_step(500_000 // scale))
+    metrics.update(bench_jsonable(500 // scale))
+    metrics.update(bench_memory(100_000 // scale))
+    with StubAngles() as stub:
+        metrics.update(bench_save_execution(stub.base_url, 2000 // scale, concurrency=8))
+        metrics.update(bench_screenshots(stub.base_url, 40 // scale, size_mib=2, concurrency=4))
+    return metrics
+
+
+def regressions(metrics: Dict[str, float], thresholds: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, float]], tolerance: float) -> List[str]:
+    found = []
+    for name, value in metrics.items():
+        limits = thresholds.get(name, {})
+        if "min" in limits and value < limits["min"]:
+            found.append(f"{name}: {value:.4g} below threshold {limits['min']:.4g}")
+        if "max" in limits and value > limits["max"]:
+            found.append(f"{name}: {value:.4g} above threshold {limits['max']:.4g}")
+        previous = (baseline or {}).get(name)
+        if previous:
+            change = (value - previous) / previous if METRICS[name] else (previous - value) / previous
+            if change < -tolerance:
+                found.append(f"{name}: {value:.4g} is {-change:.0%} worse than baseline {previous:.4g}")
+    return found
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="also write the results to this file")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs the baseline (default: 0.25)")
+    parser.add_argument("--thresholds", default=THRESHOLDS, help="absolute limits per metric (default: benchmarks/thresholds.json)")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads, for a smoke run")
+    args = parser.parse_args(argv)
+
+    with open(args.thresholds, encoding="utf-8") as f:
+        thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["metrics"]
+
+    metrics = run_suite(quick=args.quick)
+    found = regressions(metrics, thresholds, baseline, args.tolerance)
+    result = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "quick": args.quick,
+        "metrics": {name: round(value, 3) for name, value in metrics.items()},
+        "regressions": found,
+    }
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
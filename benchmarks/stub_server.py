@@ -0,0 +1,117 @@
+"""In-process stand-in for the Angles API, used by the benchmark suite.
+
+Accepts builds, executions and screenshots (JSON, chunked or multipart bodies), reads every
+byte of the request and answers at once with a small JSON body, optionally after ``delay_s`` to
+model server latency. Connections are kept alive, as a real server's would be, so the client's
+pooling is exercised.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+API_PATH = "/rest/api/v1.0/"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are separate writes
+    server: "_Server"
+
+    def _read_body(self) -> int:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            total = 0
+            while True:
+                size = int(self.rfile.readline().split(b";", 1)[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return total
+                total += len(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get("Content-Length") or 0)
+        remaining = length
+        while remaining:
+            remaining -= len(self.rfile.read(min(remaining, 1 << 20)))
+        return length
+
+    def _answer(self, payload: Any) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        received = self._read_body()
+        stub = self.server.stub
+        stub.record(received)
+        if stub.delay_s:
+            stub.wait(stub.delay_s)
+        resource = self.path[len(API_PATH):].strip("/").split("/", 1)[0]
+        self._answer({"_id": f"{resource}-{next(stub.ids)}"})
+
+    def do_GET(self) -> None:
+        self.server.stub.record(0)
+        self._answer({"_id": "stub"})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+    stub: "StubAngles"
+
+
+class StubAngles:
+    """Threaded HTTP server on an ephemeral localhost port; use as a context manager."""
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.delay_s = delay_s
+        self.ids = itertools.count(1)
+        self.requests = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "server not started"
+        return f"http://127.0.0.1:{self._server.server_port}{API_PATH}"
+
+    def record(self, received: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += received
+
+    def wait(self, seconds: float) -> None:
+        self._stopped.wait(seconds)
+
+    def start(self) -> "StubAngles":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-angles", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._stopped.set()
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def __enter__(self) -> "StubAngles":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -0,0 +1,117 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+from angles_python_client.aggregator import AggregatorClient, AggregatorServer
+from angles_python_client.exceptions import AnglesApiError
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.reporter import AnglesReporter
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status_code = status
+        self.content = json.dumps(payload).encode()
+        self.text = self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    def __init__(self, build_status=200):
+        self.build_status = build_status
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        if (headers or {}).get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        body = json.loads(data) if data else None
+        path = url.rsplit("/", 2)[-2] if url.endswith("/") else url.rsplit("/", 1)[-1]
+        with self.lock:
+            self.calls.append((method, path, body))
+        if path == "build":
+            return FakeResponse(self.build_status, {"_id": "b1", "name": body["name"]})
+        return FakeResponse(200, {"_id": f"e{len(self.calls)}"})
+
+
+def _server(tmp_path, session, **kwargs):
+    http = AnglesHttpClient(base_url="http://angles.test/", session=session, compression="gzip")
+    return AggregatorServer(str(tmp_path / "agg.sock"), http, **kwargs)
+
+
+def test_workers_share_one_build_and_batched_uploads(tmp_path):
+    session = FakeSession()
+    server = _server(tmp_path, session, batch_size=4, flush_interval_s=0.05).start()
+    barrier = threading.Barrier(8)
+
+    def worker(n):
+        reporter = AnglesReporter()
+        reporter.enable_aggregator(server.socket_path)
+        barrier.wait()
+        build = reporter.start_build("nightly", "team", "qa", "web")
+        assert build["_id"] == "b1"
+        for t in range(3):
+            reporter.start_test(f"test {n}.{t}", "suite")
+            reporter.info("x" * 500)
+            assert reporter.save_test() == {"_id": None, "queued": True}
+        reporter.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert server.stop() == {"uploaded": 24, "failed": 0, "pending": 0}
+    assert [c[1] for c in session.calls].count("build") == 1
+    titles = sorted(c[2]["title"] for c in session.calls if c[1] == "execution")
+    assert titles == sorted(f"test {n}.{t}" for n in range(8) for t in range(3))
+
+
+def test_errors_reach_the_worker(tmp_path):
+    with _server(tmp_path, FakeSession(build_status=500)) as server:
+        reporter = AnglesReporter()
+        reporter.enable_aggregator(server.socket_path)
+        with pytest.raises(AnglesApiError) as excinfo:
+            reporter.start_build("nightly", "team", "qa", "web")
+        assert excinfo.value.status_code == 500
+        reporter.close()
+
+
+def test_refuses_to_replace_a_live_aggregator(tmp_path):
+    with _server(tmp_path, FakeSession()):
+        with pytest.raises(OSError):
+            _server(tmp_path, FakeSession()).start()
+
+
+def test_screenshots_are_sent_with_absolute_paths(tmp_path, monkeypatch):
+    with _server(tmp_path, FakeSession()) as server:
+        server.screenshots.save_screenshot = lambda payload: {"_id": payload["filePath"]}
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "shot.png").write_bytes(b"png")
+        reporter = AnglesReporter()
+        reporter.enable_aggregator(server.socket_path)
+        reporter.set_current_build("b1")
+
+        assert reporter.save_screenshot("shot.png", view="home") == {"_id": str(tmp_path / "shot.png")}
+        with pytest.raises(ValueError):
+            server.save_screenshot({"filePath": "shot.png"})
+        reporter.close()
+
+
+def test_executions_arriving_after_stop_are_rejected(tmp_path):
+    session = FakeSession()
+    server = _server(tmp_path, session).start()
+    client = AggregatorClient(server.socket_path)
+    assert client.save_execution({"title": "before"}) == {"_id": None, "queued": True}
+
+    assert server.stop() == {"uploaded": 1, "failed": 0, "pending": 0}
+    with pytest.raises(AnglesApiError) as excinfo:
+        client.save_execution({"title": "after"})  # connection opened before stop()
+    assert excinfo.value.status_code == 503
+    client.close()
+    assert [c[2]["title"] for c in session.calls if c[1] == "execution"] == ["before"]
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+from angles_python_client import AnglesReporter, AsyncAnglesHttpClient, AsyncAnglesReporter
+from angles_python_client.async_http import AsyncTransport
+from angles_python_client.exceptions import AnglesApiError
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode() if payload is not None else b""
+        self.text = self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class RecordingTransport(AsyncTransport):
+    def __init__(self, responder):
+        self.calls = []
+        self.responder = responder
+
+    async def send(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        await asyncio.sleep(0)
+        return self.responder(method, url, kwargs)
+
+
+def test_async_reporter_round_trip():
+    def responder(method, url, kwargs):
+        if url.endswith("/build"):
+            return FakeResponse(payload={"_id": "b1", **json.loads(kwargs["data"])})
+        return FakeResponse(payload={"_id": "e1", "title": json.loads(kwargs["data"])["title"]})
+
+    transport = RecordingTransport(responder)
+
+    async def run():
+        reporter = AsyncAnglesReporter(base_url="http://angles.test/rest/api/v1.0/", transport=transport)
+        build = await reporter.start_build("run", "team", "env", "component")
+        reporter.start_test("test1", "suite1")
+        reporter.info("hello")
+        saved = await reporter.save_test()
+        return build, saved
+
+    build, saved = asyncio.run(run())
+
+    assert build["_id"] == "b1"
+    assert saved == {"_id": "e1", "title": "test1"}
+    method, url, kwargs = transport.calls[-1]
+    assert (method, url) == ("POST", "http://angles.test/rest/api/v1.0/execution/")
+    body = json.loads(kwargs["data"])
+    assert body["build"] == "b1"
+    assert body["actions"][0]["steps"][0]["info"] == "hello"
+
+
+def test_async_client_raises_on_error_status():
+    transport = RecordingTransport(lambda m, u, k: FakeResponse(status_code=500, payload={"error": "boom"}))
+    client = AsyncAnglesHttpClient(transport=transport)
+
+    with pytest.raises(AnglesApiError) as excinfo:
+        asyncio.run(client.request("GET", "team"))
+    assert excinfo.value.status_code == 500
+
+
+def test_async_requests_run_concurrently_on_one_loop():
+    transport = RecordingTransport(lambda m, u, k: FakeResponse(payload=[]))
+    reporter = AsyncAnglesReporter(transport=transport)
+
+    async def run():
+        return await asyncio.gather(*(reporter.teams.get_teams() for _ in range(50)))
+
+    assert asyncio.run(run()) == [[]] * 50
+    assert len(transport.calls) == 50
+
+
+def test_async_reporter_has_the_same_state_as_the_sync_one():
+    reporter = AsyncAnglesReporter(transport=AsyncTransport())
+    assert set(vars(reporter)) == set(vars(AnglesReporter()))
+    assert reporter.flush() is True
@@ -0,0 +1,79 @@
+import json
+
+from angles_python_client.baseline_index import BaselineIndex
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.models.requests import ScreenshotPlatform
+from angles_python_client.models.screenshot import Screenshot
+from angles_python_client.requests import BaselineRequests
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+CHROME = {"platformName": "mac", "browserName": "chrome"}
+IPHONE = {"platformName": "ios", "deviceName": "iPhone 15"}
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+        self.baselines = [
+            {"_id": "b1", "view": "home", "platform": CHROME, "screenWidth": 1280, "screenHeight": 800, "screenshot": "s1"},
+            {"_id": "b2", "view": "home", "platform": IPHONE, "screenshot": {"_id": "s2"}},
+        ]
+
+    def request(self, method, url, data=None, **kwargs):
+        self.calls.append((method, url))
+        if method == "GET":
+            return FakeResponse(self.baselines)
+        if method == "POST":
+            body = json.loads(data)
+            return FakeResponse({"_id": "b3", "view": body["view"], "platform": CHROME, "screenWidth": 800, "screenHeight": 600})
+        if method == "PUT":
+            return FakeResponse({"_id": "b1", **json.loads(data)})
+        return FakeResponse({"message": "deleted"})
+
+
+def _index():
+    session = FakeSession()
+    baselines = BaselineRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+    return session, baselines, BaselineIndex(baselines)
+
+
+def test_resolve_many_screenshots_with_one_request():
+    session, _, index = _index()
+    screenshots = [
+        {"view": "home", "platform": CHROME, "width": 1280, "height": 800},
+        Screenshot(view="home", platform=ScreenshotPlatform(platformName="ios", deviceName="iPhone 15"), width=1, height=2),
+        {"view": "home", "platform": CHROME, "width": 1024, "height": 800},
+    ] * 1000
+
+    resolved = index.resolve(screenshots)
+
+    assert [b and b["_id"] for b in resolved[:3]] == ["b1", "b2", None]
+    assert session.calls == [("GET", "http://angles.test/baseline")]
+
+
+def test_writes_keep_the_index_coherent():
+    session, baselines, index = _index()
+    new_shot = {"view": "login", "platform": CHROME, "width": 800, "height": 600}
+    assert index.get(new_shot) is None
+
+    baselines.set_baseline({"_id": "s9", "view": "login"})
+    assert index.get(new_shot)["_id"] == "b3"
+
+    baselines.delete_baseline("b3")
+    assert index.get(new_shot) is None
+    assert len([c for c in session.calls if c[0] == "GET"]) == 1
+
+    # a partial response cannot be placed, so the index reloads on next use
+    baselines.update_baseline("b1", ignore_boxes=[])
+    index.get(new_shot)
+    assert len([c for c in session.calls if c[0] == "GET"]) == 2
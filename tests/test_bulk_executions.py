@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import pytest
+
+from angles_python_client.async_http import AsyncAnglesHttpClient, AsyncTransport
+from angles_python_client.async_requests import AsyncExecutionRequests
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.models.requests import CreateExecution
+from angles_python_client.requests import ExecutionRequests
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode()
+        self.text = self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    def __init__(self, bulk_status=200):
+        self.bulk_status = bulk_status
+        self.calls = []
+
+    def request(self, method, url, data=None, **kwargs):
+        body = json.loads(data)
+        self.calls.append((method, url, body))
+        if url.endswith("execution/bulk"):
+            if self.bulk_status != 200:
+                return FakeResponse(self.bulk_status, {"message": "nope"})
+            return FakeResponse(200, [{"_id": f"id-{e['title']}"} for e in body])
+        if body["title"] == "t3":
+            return FakeResponse(500, {"message": "boom"})
+        return FakeResponse(200, {"_id": f"id-{body['title']}"})
+
+
+def _executions(n):
+    return (CreateExecution(title=f"t{i}", suite="s", build="b") for i in range(n))
+
+
+def test_pipelined_results_are_in_input_order_with_per_item_errors():
+    session = FakeSession()
+    requests = ExecutionRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+
+    results = requests.save_executions(_executions(10), max_in_flight=4)
+
+    assert [r.index for r in results] == list(range(10))
+    assert [r.ok for r in results] == [i != 3 for i in range(10)]
+    assert results[0].result == {"_id": "id-t0"}
+    assert results[3].error.status_code == 500
+
+
+def test_bulk_endpoint_batches_requests():
+    session = FakeSession()
+    requests = ExecutionRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+
+    results = requests.save_executions(_executions(25), batch_size=10, bulk_endpoint="execution/bulk")
+
+    assert len(session.calls) == 3
+    assert [r.result["_id"] for r in results] == [f"id-t{i}" for i in range(25)]
+
+
+@pytest.mark.parametrize("status", [404, 405])
+def test_falls_back_when_bulk_endpoint_is_missing(status):
+    session = FakeSession(bulk_status=status)
+    requests = ExecutionRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+
+    results = requests.save_executions(_executions(5), batch_size=2, bulk_endpoint="execution/bulk")
+    assert [r.index for r in results] == list(range(5))
+    assert sum(1 for m, url, _ in session.calls if url.endswith("execution/")) == 5
+
+    session.calls.clear()
+    requests.save_executions(_executions(2), bulk_endpoint="execution/bulk")
+    assert all(url.endswith("execution/") for _, url, _ in session.calls)
+
+
+def test_failed_probe_is_reported_per_item():
+    session = FakeSession(bulk_status=500)
+    requests = ExecutionRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+
+    results = requests.save_executions(_executions(5), batch_size=2, bulk_endpoint="execution/bulk")
+
+    assert [r.index for r in results] == list(range(5))
+    assert all(r.error.status_code == 500 for r in results)
+    assert len(session.calls) == 3  # every batch was tried
+    assert requests._bulk_supported is None
+
+
+def test_failed_probe_is_reported_per_item_async():
+    session = FakeSession(bulk_status=500)
+
+    class Transport(AsyncTransport):
+        async def send(self, method, url, **kwargs):
+            return session.request(method, url, **kwargs)
+
+    requests = AsyncExecutionRequests(AsyncAnglesHttpClient(base_url="http://angles.test/", transport=Transport()))
+    results = asyncio.run(requests.save_executions(_executions(5), batch_size=2, bulk_endpoint="execution/bulk"))
+
+    assert [r.index for r in results] == list(range(5))
+    assert all(r.error.status_code == 500 for r in results)
+    assert len(session.calls) == 3
+    assert requests._bulk_supported is None
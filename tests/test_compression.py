@@ -0,0 +1,100 @@
+import asyncio
+import gzip
+import json
+
+from angles_python_client._compression import choose_codec
+from angles_python_client.async_http import AsyncAnglesHttpClient, AsyncTransport
+from angles_python_client.async_requests import AsyncExecutionRequests
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.requests import ExecutionRequests
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.content = b"{}"
+        self.text = "{}"
+        self.headers = {}
+
+    def json(self):
+        return {}
+
+    def close(self):
+        pass
+
+
+class RecordingSession:
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.calls = []
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        self.calls.append((url, data, dict(headers)))
+        return FakeResponse(self.statuses.pop(0) if self.statuses else 200)
+
+
+BIG = {"steps": [{"name": "INFO", "info": "same text"}] * 200}
+
+
+def test_choose_codec_longest_prefix_wins():
+    endpoints = {"execution": "gzip", "execution/history": None}
+    assert choose_codec("execution/", None, endpoints) == "gzip"
+    assert choose_codec("/execution/history", "gzip", endpoints) is None
+    assert choose_codec("team", "gzip", endpoints) == "gzip"
+
+
+def test_large_json_bodies_are_gzipped_for_configured_endpoints():
+    session = RecordingSession()
+    client = AnglesHttpClient(session=session, compression_endpoints={"execution": "gzip"})
+
+    client.request("POST", "execution/", json=BIG)
+    client.request("POST", "team", json=BIG)
+    client.request("POST", "execution/", json={"tiny": True})
+
+    (_, body, headers), (_, plain, plain_headers), (_, tiny, tiny_headers) = session.calls
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body)) == BIG
+    assert len(body) < len(plain) / 10
+    assert "Content-Encoding" not in plain_headers
+    assert "Content-Encoding" not in tiny_headers
+
+
+def test_unsupported_media_type_falls_back_to_plain_body():
+    session = RecordingSession(statuses=[415])
+    client = AnglesHttpClient(session=session, compression="gzip")
+
+    client.request("POST", "execution/", json=BIG)
+    client.request("POST", "execution/", json=BIG)
+
+    assert [("Content-Encoding" in h) for _, _, h in session.calls] == [True, False, False]
+    assert json.loads(session.calls[1][1]) == BIG
+
+
+def test_json_bodies_keep_their_content_type_with_custom_default_headers():
+    session = RecordingSession()
+    client = AnglesHttpClient(session=session, default_headers={"Authorization": "Bearer t"})
+    requests = ExecutionRequests(client)
+
+    client.request("POST", "execution/", json={"title": "t"})
+    requests.save_execution({"title": "t"}, stream=True)
+
+    assert [headers.get("Content-Type") for _, _, headers in session.calls] == ["application/json"] * 2
+    assert all(headers["Authorization"] == "Bearer t" for _, _, headers in session.calls)
+
+
+def test_async_json_bodies_keep_their_content_type_with_custom_default_headers():
+    sent = []
+
+    class Transport(AsyncTransport):
+        async def send(self, method, url, *, headers=None, **kwargs):
+            sent.append(headers)
+            return type("Response", (), {"status_code": 200, "content": b"{}", "json": lambda self: {}})()
+
+    client = AsyncAnglesHttpClient(transport=Transport(), default_headers={"Authorization": "Bearer t"})
+
+    async def main():
+        await client.request("POST", "execution/", json={"title": "t"})
+        await AsyncExecutionRequests(client).save_execution({"title": "t"}, stream=True)
+
+    asyncio.run(main())
+    assert [headers.get("Content-Type") for headers in sent] == ["application/json"] * 2
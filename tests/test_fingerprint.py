@@ -0,0 +1,102 @@
+import struct
+import threading
+import zlib
+
+from angles_python_client.fingerprint import FingerprintIndex, image_size
+from angles_python_client.reporter import AnglesReporter
+from angles_python_client.requests import baseline_key
+
+
+def _png(width, height, fill):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\x00" + bytes([fill]) * width for _ in range(height))
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+def _reporter(baseline_image):
+    reporter = AnglesReporter(base_url="http://angles.test/rest/api/v1.0/")
+    calls = {"baseline": [], "upload": 0, "image": 0}
+
+    def get_baseline(query):
+        calls["baseline"].append(query)
+        return [{"_id": "base-1", "screenshot": {"_id": "shot-base"}}]
+
+    def get_image(screenshot_id):
+        calls["image"] += 1
+        return baseline_image
+
+    def upload(store):
+        calls["upload"] += 1
+        return {"_id": f"shot-{calls['upload']}"}
+
+    reporter.baselines.get_baseline_for_screenshot = get_baseline
+    reporter.screenshots.get_screenshot_image = get_image
+    reporter.screenshots.save_screenshot = upload
+    reporter.screenshots.get_baseline_compare = lambda screenshot_id: {"misMatchPercentage": 12.5}
+    reporter.set_current_build("build-1")
+    return reporter, calls
+
+
+def test_png_size_is_read_from_the_header():
+    assert image_size(_png(7, 3, 0)) == (7, 3)
+    assert image_size(b"not an image") is None
+
+
+def test_unchanged_screenshots_are_not_uploaded(tmp_path):
+    reporter, calls = _reporter(_png(4, 2, 10))
+    reporter.enable_fingerprint_index(path=str(tmp_path / "fingerprints.json"))
+    same, changed = tmp_path / "same.png", tmp_path / "changed.png"
+    same.write_bytes(_png(4, 2, 10))
+    changed.write_bytes(_png(4, 2, 200))
+
+    first = reporter.save_screenshot(str(same), view="home")
+    second = reporter.save_screenshot(str(same), view="home")
+    third = reporter.save_screenshot(str(changed), view="home")
+
+    assert first == second == {"_id": "shot-base", "unchanged": True}
+    assert third == {"_id": "shot-1"}
+    assert calls["upload"] == 1 and calls["image"] == 1 and len(calls["baseline"]) == 1
+    assert calls["baseline"][0]["width"] == 4 and calls["baseline"][0]["height"] == 2
+    assert reporter.compare_screenshot_against_baseline("shot-base")["misMatchPercentage"] == 0.0
+    assert reporter.compare_screenshot_against_baseline("shot-1")["misMatchPercentage"] == 12.5
+
+    reporter.close()
+    warm = FingerprintIndex(str(tmp_path / "fingerprints.json"))
+    key = baseline_key({"view": "home", "width": 4, "height": 2})
+    assert warm.get(key)[1].screenshot_id == "shot-base"
+
+
+def test_slots_without_a_baseline_upload_normally(tmp_path):
+    reporter, calls = _reporter(None)
+    reporter.baselines.get_baseline_for_screenshot = lambda query: calls["baseline"].append(query) or []
+    assert reporter.enable_fingerprint_index(ttl_s=60).ttl_s == 60
+    image = tmp_path / "a.png"
+    image.write_bytes(_png(2, 2, 0))
+
+    reporter.save_screenshot(str(image), view="home")
+    reporter.save_screenshot(str(image), view="home")
+
+    assert calls["upload"] == 2 and len(calls["baseline"]) == 1
+
+
+def test_background_uploads_check_fingerprints_on_the_upload_thread(tmp_path):
+    reporter, calls = _reporter(_png(4, 2, 10))
+    lookups = []
+    get_baseline = reporter.baselines.get_baseline_for_screenshot
+    reporter.baselines.get_baseline_for_screenshot = lambda query: lookups.append(threading.current_thread()) or get_baseline(query)
+    reporter.enable_fingerprint_index()
+    reporter.enable_background_uploads(workers=1)
+    image = tmp_path / "same.png"
+    image.write_bytes(_png(4, 2, 10))
+
+    future = reporter.save_screenshot(str(image), view="home")
+
+    assert future.result(timeout=5) == {"_id": "shot-base", "unchanged": True}
+    assert lookups and threading.current_thread() not in lookups
+    assert reporter.compare_screenshot_against_baseline("shot-base")["misMatchPercentage"] == 0.0
+    reporter.close()
+    reporter.reset_state()
+    assert reporter.compare_screenshot_against_baseline("shot-base")["misMatchPercentage"] == 12.5
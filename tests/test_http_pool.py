@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.requests import TeamRequests
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    peers = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.peers.add(self.client_address)
+        body = b"[]"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _KeepAliveHandler.peers = set()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    srv.daemon_threads = True
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_port}/"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_pool_settings_are_applied_to_the_session():
+    client = AnglesHttpClient(pool_connections=3, pool_maxsize=32, pool_block=True)
+    adapter = client.session.get_adapter("https://angles.example/")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block is True
+
+
+def test_keep_alive_off_sends_connection_close():
+    assert AnglesHttpClient(keep_alive=False).default_headers["Connection"] == "close"
+    assert "Connection" not in AnglesHttpClient().default_headers
+
+    shared = {"Authorization": "Bearer t"}
+    assert AnglesHttpClient(keep_alive=False, default_headers=shared).default_headers["Connection"] == "close"
+    assert shared == {"Authorization": "Bearer t"}
+
+
+def test_shared_client_reuses_a_bounded_set_of_connections(server):
+    client = AnglesHttpClient(base_url=server, pool_maxsize=4, pool_block=True)
+    teams = TeamRequests(client)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: teams.get_teams(), range(400)))
+
+    assert results == [[]] * 400
+    assert 1 <= len(_KeepAliveHandler.peers) <= 4
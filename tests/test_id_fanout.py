@@ -0,0 +1,101 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from angles_python_client.async_http import AsyncAnglesHttpClient, AsyncTransport
+from angles_python_client.async_requests import AsyncScreenshotRequests
+from angles_python_client.exceptions import AnglesApiError
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.requests import BuildRequests, ScreenshotRequests
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode()
+        self.text = self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    def __init__(self, key="screenshotIds", fail_on=None):
+        self.key = key
+        self.fail_on = fail_on
+        self.urls = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, params=None, **kwargs):
+        prepared = requests.Request(method, url, params=params).prepare().url
+        ids = params[self.key].split(",")
+        with self.lock:
+            self.urls.append(prepared)
+        # later chunks answer first, so ordering has to be restored
+        time.sleep(0.02 / len(self.urls))
+        if self.fail_on in ids:
+            return FakeResponse({"message": "boom"}, 500)
+        if self.key == "buildIds":
+            return FakeResponse({"count": len(ids), "builds": [{"_id": i} for i in ids]})
+        return FakeResponse([{"_id": i} for i in ids])
+
+
+IDS = [f"{i:024x}" for i in range(500)]
+
+
+def test_long_id_lists_are_split_under_the_url_limit_and_merged_in_order():
+    session = FakeSession()
+    shots = ScreenshotRequests(AnglesHttpClient(base_url="http://angles.test/rest/api/v1.0/", session=session))
+
+    result = shots.get_screenshots(IDS, max_url_length=1000)
+
+    assert [s["_id"] for s in result] == IDS
+    assert len(session.urls) > 1
+    assert all(len(url) <= 1000 for url in session.urls)
+
+
+def test_builds_are_merged_into_one_paged_response():
+    session = FakeSession(key="buildIds")
+    builds = BuildRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+
+    result = builds.get_builds("team-1", IDS[:250], max_ids_per_request=100, max_url_length=10_000)
+
+    assert result["count"] == 250
+    assert [b["_id"] for b in result["builds"]] == IDS[:250]
+    assert len(session.urls) == 3 and all("teamId=team-1" in url for url in session.urls)
+
+
+def test_streaming_variant_yields_every_item_and_raises_chunk_errors():
+    session = FakeSession(key="buildIds")
+    builds = BuildRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+    assert sorted(b["_id"] for b in builds.iter_builds_by_id("team-1", IDS, max_ids_per_request=50)) == IDS
+
+    failing = ScreenshotRequests(AnglesHttpClient(base_url="http://angles.test/", session=FakeSession(fail_on=IDS[300])))
+    with pytest.raises(AnglesApiError):
+        failing.get_screenshots(IDS, max_ids_per_request=100)
+
+
+def test_small_lists_make_a_single_request():
+    session = FakeSession()
+    ScreenshotRequests(AnglesHttpClient(base_url="http://angles.test/", session=session)).get_screenshots(IDS[:3])
+    assert len(session.urls) == 1
+
+
+def test_async_get_screenshots_fans_out():
+    calls = []
+
+    class Transport(AsyncTransport):
+        async def send(self, method, url, *, params=None, **kwargs):
+            calls.append(params)
+            return FakeResponse([{"_id": i} for i in params["screenshotIds"].split(",")])
+
+    async def run():
+        shots = AsyncScreenshotRequests(AsyncAnglesHttpClient(base_url="http://angles.test/", transport=Transport()))
+        return await shots.get_screenshots(IDS, max_ids_per_request=64)
+
+    assert [s["_id"] for s in asyncio.run(run())] == IDS
+    assert len(calls) == 8
@@ -0,0 +1,101 @@
+import asyncio
+import os
+
+from angles_python_client.async_http import AsyncAnglesHttpClient, AsyncTransport
+from angles_python_client.async_requests import AsyncScreenshotRequests
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.image_cache import ImageCache
+from angles_python_client.requests import BaselineRequests, ScreenshotRequests
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, content):
+        self.content = content
+
+    def json(self):
+        return {}
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, params=None, **kwargs):
+        self.calls.append((method, url, params))
+        return FakeResponse(b"PNG:" + url.encode())
+
+
+def test_images_are_downloaded_once_per_key(tmp_path):
+    session = FakeSession()
+    http = AnglesHttpClient(base_url="http://angles.test/", session=session, image_cache=ImageCache(str(tmp_path)))
+    shots = ScreenshotRequests(http)
+
+    assert shots.get_screenshot_image("s1") == b"PNG:http://angles.test/screenshot/s1/image"
+    assert shots.get_screenshot_image("s1") == b"PNG:http://angles.test/screenshot/s1/image"
+    shots.get_baseline_compare_image("s1", cache=True)
+    shots.get_baseline_compare_image("s1", cache=True)
+    shots.get_baseline_compare_image("s1", cache=False)
+    assert len(session.calls) == 3
+
+
+def test_getters_return_bytes_and_streams_use_the_mapping(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    cache.put("screenshot/a", b"png" * 1000)
+    shots = ScreenshotRequests(AnglesHttpClient(base_url="http://angles.test/", session=FakeSession(), image_cache=cache))
+
+    image = shots.get_screenshot_image("a")
+    assert type(image) is bytes and image.startswith(b"png")
+    with cache.open("screenshot/a") as view:
+        assert isinstance(view, memoryview) and view.readonly and view[:3] == b"png"
+    assert b"".join(shots.iter_screenshot_image("a", chunk_size=1024)) == image
+    assert cache.get("screenshot/missing") is None
+
+
+def test_baseline_changes_drop_cached_compare_images(tmp_path):
+    session = FakeSession()
+    http = AnglesHttpClient(base_url="http://angles.test/", session=session, image_cache=ImageCache(str(tmp_path)))
+    shots, baselines = ScreenshotRequests(http), BaselineRequests(http)
+
+    shots.get_screenshot_image("s1")
+    shots.get_baseline_compare_image("s1")
+    baselines.update_baseline("b1", screenshot_id="s2")
+    shots.get_screenshot_image("s1")
+    shots.get_baseline_compare_image("s1")
+    gets = [c[1] for c in session.calls if c[0] == "GET"]
+    assert gets == ["http://angles.test/screenshot/s1/image"] + ["http://angles.test/screenshot/s1/baseline/compare/image/"] * 2
+
+
+def test_lru_eviction_keeps_recently_read_images(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=250)
+    cache.put("screenshot/a", b"a" * 100)
+    cache.put("screenshot/b", b"b" * 100)
+    path_a, path_b = cache._path("screenshot/a"), cache._path("screenshot/b")
+    os.utime(path_a, (1, 1))
+    os.utime(path_b, (2, 2))
+    with cache.open("screenshot/a") as view:
+        assert bytes(view[:3]) == b"aaa"
+    cache.put("screenshot/c", b"c" * 100)
+
+    assert "screenshot/a" in cache and "screenshot/c" in cache
+    assert "screenshot/b" not in cache
+    assert cache.get("screenshot/missing") is None
+
+
+def test_async_client_uses_the_image_cache(tmp_path):
+    calls = []
+
+    class Transport(AsyncTransport):
+        async def send(self, method, url, **kwargs):
+            calls.append(url)
+            return FakeResponse(b"img")
+
+    async def run():
+        http = AsyncAnglesHttpClient(base_url="http://angles.test/", transport=Transport(), image_cache=ImageCache(str(tmp_path)))
+        shots = AsyncScreenshotRequests(http)
+        return [await shots.get_screenshot_image("s1") for _ in range(3)]
+
+    assert asyncio.run(run()) == [b"img"] * 3
+    assert len(calls) == 1
@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from angles_python_client.image_diff import CompareJob, compare_images, compare_many  # noqa: E402
+from angles_python_client.models.ignore_box import IgnoreBox  # noqa: E402
+
+
+def _png(pixels):
+    buf = io.BytesIO()
+    Image.fromarray(np.asarray(pixels, dtype=np.uint8), "RGBA").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _solid(height, width, value=0):
+    return np.full((height, width, 4), value, dtype=np.uint8)
+
+
+def test_identical_images_match():
+    image = _png(_solid(10, 10, 7))
+    result = compare_images(image, image)
+    assert result.isSameDimensions
+    assert result.misMatchPercentage == 0.0
+
+
+def test_mismatch_percentage_and_ignore_boxes(tmp_path):
+    base = _solid(10, 10)
+    changed = base.copy()
+    changed[0:2, 0:5] = 255  # 10 of 100 pixels
+
+    assert compare_images(_png(base), _png(changed)).misMatchPercentage == 10.0
+    ignored = compare_images(_png(base), _png(changed), ignore_boxes=[IgnoreBox(left=0, top=0, right=5, bottom=2)])
+    assert ignored.misMatchPercentage == 0.0
+    assert compare_images(_png(base), _png(changed), ignore_boxes=[{"left": 0, "top": 0, "right": 3, "bottom": 2}]).misMatchPercentage == 4.0
+
+    diff = tmp_path / "diff.png"
+    compare_images(_png(base), _png(changed), diff_path=str(diff))
+    with Image.open(diff) as img:
+        assert img.getpixel((0, 0)) == (255, 0, 255, 255)
+
+
+def test_different_dimensions_count_the_missing_area():
+    result = compare_images(_png(_solid(10, 10)), _png(_solid(10, 5)))
+    assert not result.isSameDimensions
+    assert result.misMatchPercentage == 50.0
+
+
+def test_compare_many_uses_a_process_pool():
+    same = _png(_solid(4, 4))
+    other = _png(_solid(4, 4, 255))
+    results = sorted(compare_many([CompareJob(same, same), CompareJob(same, other)], max_workers=2), key=lambda r: r.index)
+    assert [r.result.misMatchPercentage for r in results] == [0.0, 100.0]
+
+
+def test_reporter_local_compare_uses_baseline_ignore_boxes(monkeypatch):
+    from angles_python_client.reporter import AnglesReporter
+    from angles_python_client.requests import BaselineRequests
+
+    base = _solid(10, 10)
+    changed = base.copy()
+    changed[0:2, 0:5] = 255
+    images = {"base-shot": _png(base), "new-shot": _png(changed)}
+    reporter = AnglesReporter(base_url="http://angles.test/rest/api/v1.0/")
+    reporter.screenshots.get_screenshot = lambda sid: {"_id": sid, "view": "home", "width": 10, "height": 10}
+    reporter.screenshots.get_screenshot_image = images.__getitem__
+    baseline = {"screenshot": {"_id": "base-shot"}, "ignoreBoxes": [{"left": 0, "top": 0, "right": 5, "bottom": 1}]}
+    monkeypatch.setattr(BaselineRequests, "get_baseline_for_screenshot", lambda self, shot: [baseline])
+
+    result = reporter.compare_screenshot_against_baseline("new-shot", local=True)
+
+    assert result["misMatchPercentage"] == 5.0
+    assert result["isSameDimensions"] is True
@@ -0,0 +1,86 @@
+import json
+
+from angles_python_client._serialize import jsonable
+from angles_python_client.journal import LocalExecutionJournal
+from angles_python_client.reporter import AnglesReporter
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    def __init__(self):
+        self.bodies = []
+
+    def request(self, method, url, data=None, **kwargs):
+        self.bodies.append(json.loads(b"".join(data)))
+        return FakeResponse({"_id": "e1"})
+
+
+def _run_test(reporter, actions=5, steps=3):
+    reporter.set_current_build("b1")
+    reporter.start_test("checkout", "shop")
+    for a in range(actions):
+        reporter.add_action(f"action {a}")
+        for s in range(steps):
+            reporter.info(f"{a}.{s}")
+        # only the open action is held in memory
+        assert reporter.current_execution.actions == [reporter.current_action]
+
+
+def test_incremental_execution_is_uploaded_whole_on_save(tmp_path):
+    session = FakeSession()
+    reporter = AnglesReporter(base_url="http://angles.test/", session=session)
+    reporter.enable_incremental(directory=str(tmp_path), max_actions=2)
+
+    _run_test(reporter)
+    reporter.update_test_name("checkout (retried)")
+    assert len(list(tmp_path.iterdir())) == 1
+
+    assert reporter.save_test() == {"_id": "e1"}
+    (body,) = session.bodies
+    assert body["title"] == "checkout (retried)" and body["build"] == "b1"
+    assert [a["name"] for a in body["actions"]] == [f"action {a}" for a in range(5)]
+    assert [s["info"] for s in body["actions"][4]["steps"]] == ["4.0", "4.1", "4.2"]
+    assert reporter.current_execution is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_actions_are_appended_in_batches(tmp_path):
+    appended = []
+
+    class Journal(LocalExecutionJournal):
+        def append(self, key, actions):
+            appended.append([a["name"] for a in actions])
+            super().append(key, actions)
+
+    reporter = AnglesReporter(base_url="http://angles.test/")
+    reporter.enable_incremental(Journal(str(tmp_path), jsonable), max_actions=2, max_delay_s=3600)
+    _run_test(reporter)
+
+    assert appended == [["action 0", "action 1"], ["action 2", "action 3"]]
+    assert len(reporter.save_test()["actions"]) == 5
+    assert appended[-1] == ["action 4"]
+
+
+def test_recover_uploads_journals_left_by_a_crash(tmp_path):
+    reporter = AnglesReporter(base_url="http://angles.test/")
+    reporter.enable_incremental(LocalExecutionJournal(str(tmp_path), jsonable), max_actions=1)
+    _run_test(reporter, actions=3)
+    # the process dies here, before save_test()
+
+    uploaded = []
+    journal = LocalExecutionJournal(str(tmp_path), lambda body: uploaded.append(jsonable(body)) or {"_id": "e9"})
+    (result,) = journal.recover()
+
+    assert result.ok and result.result == {"_id": "e9"}
+    assert uploaded[0]["title"] == "checkout"
+    assert [a["name"] for a in uploaded[0]["actions"]] == ["action 0", "action 1"]
+    assert journal.pending() == []
@@ -0,0 +1,108 @@
+import asyncio
+import datetime as dt
+import json
+
+from angles_python_client.async_http import AsyncAnglesHttpClient, AsyncTransport
+from angles_python_client.async_requests import AsyncBuildRequests
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.lazy_models import LazyList, decode, lazy
+from angles_python_client.models import Build, BuildReport, ExecutionStates, Step, StepStates
+from angles_python_client.requests import BuildRequests
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+REPORT = {
+    "_id": "b1",
+    "name": "nightly",
+    "status": "PASS",
+    "start": "2024-05-01T10:00:00.000Z",
+    "environment": {"_id": "env", "name": "qa"},
+    "suites": [
+        {
+            "name": "login",
+            "status": "FAIL",
+            "executions": [
+                {
+                    "_id": "e1",
+                    "title": "bad password",
+                    "build": "b1",
+                    "actions": [
+                        {"name": "open", "steps": [{"name": "click", "status": "PASS", "timestamp": "2024-05-01T10:00:01Z"}]},
+                    ],
+                }
+            ],
+        }
+    ],
+    "createdAt": "2024-05-01T10:00:00.000Z",
+}
+
+
+class FakeSession:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def request(self, method, url, **kwargs):
+        return FakeResponse(self.payload)
+
+
+def test_fields_decode_on_first_access():
+    report = lazy(json.loads(json.dumps(REPORT)), BuildReport)
+
+    assert report._cache is None
+    assert report.name == "nightly" and report._cache is None
+    assert report.start == dt.datetime(2024, 5, 1, 10, 0, tzinfo=dt.timezone.utc)
+    assert report.status is ExecutionStates.PASS
+    assert report.environment.name == "qa"
+
+    execution = report.suites[0].executions[0]
+    assert execution.build == "b1"  # an unpopulated reference stays an id
+    step = execution.actions[0].steps[0]
+    assert step.status is StepStates.PASS and step.timestamp.second == 1
+    assert report.suites[0].executions[0] is execution
+
+
+def test_lazy_matches_eager_decode():
+    report = lazy(REPORT, BuildReport)
+    eager = decode(REPORT, BuildReport)
+
+    assert report.to_model() == eager
+    assert eager.suites[0].executions[0].actions[0].steps[0] == Step(
+        name="click", status=StepStates.PASS, timestamp=dt.datetime(2024, 5, 1, 10, 0, 1, tzinfo=dt.timezone.utc)
+    )
+
+
+def test_typed_responses_flag():
+    raw = BuildRequests(AnglesHttpClient(base_url="http://angles.test/", session=FakeSession(REPORT)))
+    assert raw.get_build_report("b1") == REPORT
+
+    typed = BuildRequests(AnglesHttpClient(base_url="http://angles.test/", session=FakeSession(REPORT), typed_responses=True))
+    report = typed.get_build_report("b1")
+    assert type(report).__name__ == "LazyBuildReport"
+    assert report.raw == REPORT
+
+    builds = BuildRequests(AnglesHttpClient(base_url="http://angles.test/", session=FakeSession({"count": 1, "builds": [REPORT]}), typed_responses=True))
+    page = builds.get_builds_with_filters("team")
+    assert page.count == 1 and isinstance(page.builds, LazyList) and page.builds[0].name == "nightly"
+    assert [b._id for b in builds.iter_builds("team")] == ["b1"]
+
+
+def test_async_typed_responses():
+    class Transport(AsyncTransport):
+        async def send(self, method, url, **kwargs):
+            return FakeResponse([REPORT])
+
+    async def run():
+        builds = AsyncBuildRequests(AsyncAnglesHttpClient(base_url="http://angles.test/", transport=Transport(), typed_responses=True))
+        return await builds.get_builds("team")
+
+    builds = asyncio.run(run())
+    assert isinstance(builds, LazyList) and builds[0].to_model() == decode(REPORT, Build)
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from urllib.parse import urlparse
+
+from angles_python_client._pagination import PageSizer
+from angles_python_client.async_http import AsyncAnglesHttpClient, AsyncTransport
+from angles_python_client.async_requests import AsyncExecutionRequests
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.requests import BuildRequests
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self.content = json.dumps(payload).encode()
+        self.text = self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _page(params, total, key, cap=None):
+    skip, limit = int(params["skip"]), int(params["limit"])
+    limit = min(limit, cap) if cap else limit
+    return {"count": total, key: [{"_id": str(i)} for i in range(skip, min(total, skip + limit))]}
+
+
+class FakeSession:
+    def __init__(self, total, key="builds", cap=None):
+        self.total, self.key, self.cap = total, key, cap
+        self.calls = []
+
+    def request(self, method, url, params=None, **kwargs):
+        self.calls.append(dict(params))
+        return FakeResponse(_page(params, self.total, self.key, self.cap))
+
+
+def test_iter_builds_walks_every_page_and_grows_page_size():
+    session = FakeSession(total=1234)
+    builds = BuildRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+
+    ids = [b["_id"] for b in builds.iter_builds("team-1", ["env"], page_size=10)]
+
+    assert ids == [str(i) for i in range(1234)]
+    limits = [c["limit"] for c in session.calls]
+    assert limits[0] == 10 and max(limits) > 10
+    assert all(c["teamId"] == "team-1" and c["environmentIds"] == "env" for c in session.calls)
+
+
+def test_iter_builds_adopts_server_page_cap():
+    session = FakeSession(total=250, cap=100)
+    builds = BuildRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+
+    assert len(list(builds.iter_builds("team-1", page_size=50, prefetch=False))) == 250
+    assert [c["skip"] for c in session.calls] == [0, 50, 150]
+
+
+def test_iter_builds_stops_fetching_when_abandoned():
+    session = FakeSession(total=10_000)
+    builds = BuildRequests(AnglesHttpClient(base_url="http://angles.test/", session=session))
+
+    it = builds.iter_builds("team-1", page_size=10)
+    assert next(it)["_id"] == "0"
+    it.close()
+    assert len(session.calls) <= 2
+
+
+def test_page_sizer_shrinks_on_slow_pages():
+    sizer = PageSizer(100, min_size=10, max_size=1000, target_latency_s=0.5)
+    sizer.observe(2.0, 100, 100, True)
+    assert sizer.size == 50
+    sizer.observe(0.01, 50, 50, True)
+    assert sizer.size == 100
+
+
+def test_async_iter_execution_history():
+    class Transport(AsyncTransport):
+        async def send(self, method, url, *, params=None, **kwargs):
+            assert urlparse(url).path.endswith("execution/e1/history")
+            return FakeResponse(_page(params, 75, "executions"))
+
+    async def run():
+        executions = AsyncExecutionRequests(AsyncAnglesHttpClient(base_url="http://angles.test/", transport=Transport()))
+        return [e["_id"] async for e in executions.iter_execution_history("e1", page_size=20)]
+
+    assert asyncio.run(run()) == [str(i) for i in range(75)]
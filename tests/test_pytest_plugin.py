@@ -0,0 +1,172 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from angles_python_client.aggregator import AggregatorServer
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.pytest_plugin import AnglesPlugin
+from angles_python_client.reporter import AnglesReporter, angles_reporter
+
+pytest_plugins = ["pytester"]
+
+EXAMPLE = """
+import pytest
+from angles_python_client import angles_reporter
+
+
+@pytest.fixture
+def broken():
+    raise RuntimeError("no database")
+
+
+def test_ok():
+    angles_reporter.info("inside the test")
+
+
+def test_fails():
+    assert 1 == 2
+
+
+@pytest.mark.skip(reason="not today")
+def test_skipped():
+    pass
+
+
+def test_error(broken):
+    pass
+"""
+
+
+class _StubAngles(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).received.append((self.path, body))
+        payload = json.dumps({"_id": "build-1" if self.path.endswith("/build") else "e"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def angles_url():
+    _StubAngles.received = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _StubAngles)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    base_url = angles_reporter.http.base_url
+    yield f"http://127.0.0.1:{srv.server_port}/rest/api/v1.0/"
+    angles_reporter.set_base_url(base_url)
+    angles_reporter.reset_state()
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_session_is_reported_as_a_build(pytester, angles_url):
+    pytester.makepyfile(test_example=EXAMPLE)
+    result = pytester.runpytest_inprocess(
+        "-p", "angles_python_client.pytest_plugin", "--angles", "--angles-url", angles_url,
+        "--angles-team", "team", "--angles-environment", "qa", "--angles-component", "web",
+    )
+    result.assert_outcomes(passed=1, failed=1, skipped=1, errors=1)
+
+    (build_path, build), *executions = _StubAngles.received
+    assert build_path.endswith("/build") and build["name"] == pytester.path.name
+    by_title = {e["title"]: e for _, e in executions}
+    assert sorted(by_title) == ["test_error", "test_fails", "test_ok", "test_skipped"]
+    assert all(e["build"] == "build-1" and e["suite"] == "test_example.py" for e in by_title.values())
+
+    ok = by_title["test_ok"]
+    assert [a["name"] for a in ok["actions"]] == ["setup", "call", "teardown"]
+    assert [s["status"] for s in ok["actions"][1]["steps"]] == ["INFO", "PASS"]
+    assert ok["actions"][1]["steps"][0]["info"] == "inside the test"
+    assert by_title["test_fails"]["actions"][1]["steps"][0]["status"] == "FAIL"
+    assert "assert 1 == 2" in by_title["test_fails"]["actions"][1]["steps"][0]["info"]
+    assert [a["name"] for a in by_title["test_error"]["actions"]] == ["setup", "teardown"]
+    assert by_title["test_skipped"]["actions"][0]["steps"][0]["info"] == "skipped: not today"
+
+
+def test_plugin_is_inert_without_flag(pytester, angles_url):
+    pytester.makepyfile(test_example="def test_ok():\n    pass\n")
+    result = pytester.runpytest_inprocess("-p", "angles_python_client.pytest_plugin", "--angles-url", angles_url)
+    result.assert_outcomes(passed=1)
+    assert _StubAngles.received == []
+
+
+def test_missing_build_details_is_a_usage_error(pytester, angles_url):
+    pytester.makepyfile(test_example=EXAMPLE)
+    result = pytester.runpytest_inprocess("-p", "angles_python_client.pytest_plugin", "--angles", "--angles-url", angles_url)
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+
+def test_xdist_workers_hand_executions_to_the_aggregator_in_batches(angles_url, tmp_path):
+    server = AggregatorServer(str(tmp_path / "agg.sock"), AnglesHttpClient(base_url=angles_url)).start()
+    options = {"angles_upload_workers": 1, "angles_batch_size": 10}
+    config = SimpleNamespace(
+        getoption=options.get,
+        workerinput={"angles_build_id": "build-1", "angles_socket": server.socket_path},
+        pluginmanager=SimpleNamespace(register=lambda plugin, name: None),
+    )
+    reporter = AnglesReporter()
+    plugin = AnglesPlugin(config, reporter)
+    plugin.pytest_sessionstart(None)
+    senders = []
+    save_execution = reporter.aggregator.save_execution
+    reporter.aggregator.save_execution = lambda payload: senders.append(threading.current_thread()) or save_execution(payload)
+
+    recorder = plugin.recorder
+    for i in range(25):
+        recorder.pytest_runtest_logstart(f"test_example.py::test_{i}", None)
+        recorder.pytest_runtest_logreport(SimpleNamespace(when="call", passed=True, failed=False, duration=0.001, longrepr=None))
+        recorder.pytest_runtest_logfinish(f"test_example.py::test_{i}", None)
+    plugin.pytest_sessionfinish(None)
+
+    assert server.stop() == {"uploaded": 25, "failed": 0, "pending": 0}
+    assert len(senders) == 25 and threading.current_thread() not in senders
+    titles = sorted(e["title"] for _, e in _StubAngles.received)
+    assert titles == sorted(f"test_{i}" for i in range(25))
+    assert plugin.failed_uploads == 0
+
+
+def test_failures_counted_from_many_upload_threads_add_up():
+    plugin = AnglesPlugin(SimpleNamespace(getoption=lambda name: None), AnglesReporter())
+    threads = [threading.Thread(target=lambda: [plugin.add_failed_uploads(1) for _ in range(10_000)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert plugin.failed_uploads == 40_000
+
+
+def test_fixture_returns_the_plugins_reporter(pytester, angles_url):
+    pytester.makeconftest(
+        """
+from angles_python_client.pytest_plugin import AnglesPlugin
+from angles_python_client.reporter import AnglesReporter
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(AnglesPlugin(config, AnglesReporter()), "angles-reporter")
+"""
+    )
+    pytester.makepyfile(
+        test_example="""
+from angles_python_client import angles_reporter
+
+
+def test_logs(angles):
+    assert angles is not angles_reporter
+    assert angles.current_execution.title == "test_logs"
+"""
+    )
+    result = pytester.runpytest_inprocess("-p", "angles_python_client.pytest_plugin", "--angles-url", angles_url, "--angles-build-id", "b1")
+    result.assert_outcomes(passed=1)
@@ -1,3 +1,8 @@
+import asyncio
+import json
+import threading
+
+from angles_python_client.context_reporter import AsyncContextLocalReporter, ContextLocalReporter
 from angles_python_client.reporter import AnglesReporter, angles_reporter
 
 
@@ -27,3 +32,72 @@ def test_direct_instances_keep_independent_state():
     assert a is not b
     assert a.current_build["_id"] == "build-a"
     assert b.current_build["_id"] == "build-b"
+
+
+class _Response:
+    status_code = 200
+    content = b'{"_id": "e"}'
+
+    def json(self):
+        return {"_id": "e"}
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bodies = []
+
+    def request(self, method, url, data=None, **kwargs):
+        with self.lock:
+            self.bodies.append(json.loads(data))
+        return _Response()
+
+
+def test_context_local_reporter_runs_tests_on_many_threads():
+    session = _RecordingSession()
+    reporter = ContextLocalReporter(base_url="https://angles.example/rest/api/v1.0/", session=session)
+    reporter.set_current_build("build-1")
+    barrier = threading.Barrier(8)
+
+    def run(n):
+        reporter.start_test(f"test {n}", "suite")
+        barrier.wait()
+        for i in range(50):
+            reporter.add_action(f"action {n}.{i}")
+            reporter.info(f"{n}")
+        reporter.save_test()
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(b["title"] for b in session.bodies) == sorted(f"test {n}" for n in range(8))
+    for body in session.bodies:
+        n = body["title"].split()[1]
+        assert len(body["actions"]) == 50
+        assert all(a["name"].startswith(f"action {n}.") and a["steps"][0]["info"] == n for a in body["actions"])
+        assert body["build"] == "build-1"
+    assert reporter.current_execution is None
+
+
+def test_async_context_local_reporter_isolates_tasks():
+    reporter = AsyncContextLocalReporter(base_url="https://angles.example/rest/api/v1.0/")
+    reporter.set_current_build("build-1")
+
+    async def run(n):
+        reporter.start_test(f"test {n}", "suite")
+        for i in range(3):
+            reporter.add_action(f"action {i}")
+            await asyncio.sleep(0)
+            reporter.info(str(n))
+        return reporter.current_execution
+
+    async def main():
+        return await asyncio.gather(*(run(n) for n in range(5)))
+
+    executions = asyncio.run(main())
+    assert [e.title for e in executions] == [f"test {n}" for n in range(5)]
+    assert all(len(e.actions) == 3 for e in executions)
+    assert reporter.current_execution is None
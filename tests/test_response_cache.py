@@ -0,0 +1,162 @@
+import json
+
+import pytest
+
+from angles_python_client.exceptions import AnglesApiError
+from angles_python_client.cache import DiskCacheBackend, MemoryCacheBackend, ResponseCache
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.requests import AnglesRequests, TeamRequests
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode() if payload is not None else b""
+        self.text = self.content.decode()
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+        self.teams = [{"_id": "t1", "name": "one"}]
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.calls.append((method, url, dict(headers or {})))
+        etag = f'"{len(self.teams[0]["name"])}"'
+        if method == "GET" and url.endswith("/team"):
+            if headers.get("If-None-Match") == etag:
+                return FakeResponse(304, headers={"ETag": etag})
+            return FakeResponse(200, self.teams, {"ETag": etag})
+        if method == "PUT":
+            self.teams[0]["name"] = json.loads(kwargs["data"])["name"]
+            return FakeResponse(200, self.teams[0])
+        return FakeResponse(200, {"version": "1"})
+
+
+class Clock:
+    now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(cache):
+    session = FakeSession()
+    return session, AnglesHttpClient(base_url="http://angles.test/", session=session, response_cache=cache)
+
+
+def test_fresh_entries_are_served_without_a_request():
+    session, http = _client(ResponseCache())
+    teams = TeamRequests(http)
+
+    first = teams.get_teams()
+    first[0]["name"] = "mutated by caller"
+    assert teams.get_teams() == [{"_id": "t1", "name": "one"}]
+    assert len(session.calls) == 1
+
+
+def test_expired_entries_are_revalidated_with_etag():
+    clock = Clock()
+    session, http = _client(ResponseCache(ttls={"team": 10}, clock=clock))
+    teams = TeamRequests(http)
+
+    teams.get_teams()
+    clock.now += 11
+    assert teams.get_teams() == [{"_id": "t1", "name": "one"}]
+    assert session.calls[1][2]["If-None-Match"] == '"3"'
+    teams.get_teams()
+    assert len(session.calls) == 2  # the 304 refreshed the TTL
+
+
+def test_writes_invalidate_the_resource():
+    session, http = _client(ResponseCache())
+    teams = TeamRequests(http)
+
+    teams.get_teams()
+    teams.update_team("t1", "renamed")
+    assert teams.get_teams()[0]["name"] == "renamed"
+    assert [c[0] for c in session.calls] == ["GET", "PUT", "GET"]
+
+
+def test_uncached_endpoints_always_hit_the_server():
+    session, http = _client(ResponseCache(ttls={"team": 60}))
+    versions = AnglesRequests(http)
+    versions.get_versions()
+    versions.get_versions()
+    assert len(session.calls) == 2
+
+
+def test_memory_backend_evicts_least_recently_used():
+    cache = ResponseCache(MemoryCacheBackend(max_entries=2))
+    for name in ("a", "b"):
+        cache.store(cache.key(f"team/{name}"), b"1", None, 60)
+    cache.lookup(cache.key("team/a"))
+    cache.store(cache.key("team/c"), b"1", None, 60)
+    assert cache.lookup(cache.key("team/b"))[0] is None
+    assert cache.lookup(cache.key("team/a"))[1]
+
+
+def test_disk_backend_is_shared_between_clients(tmp_path):
+    first_session, first = _client(ResponseCache(DiskCacheBackend(str(tmp_path))))
+    second_session, second = _client(ResponseCache(DiskCacheBackend(str(tmp_path))))
+
+    TeamRequests(first).get_teams()
+    assert TeamRequests(second).get_teams() == [{"_id": "t1", "name": "one"}]
+    assert second_session.calls == []
+
+    TeamRequests(second).update_team("t1", "renamed")
+    TeamRequests(first).get_teams()
+    assert len(first_session.calls) == 2
+
+
+def test_disk_backend_evicts_above_a_high_water_mark(tmp_path, monkeypatch):
+    backend = DiskCacheBackend(str(tmp_path), max_entries=10)
+    scans = []
+    files = backend._files
+    monkeypatch.setattr(backend, "_files", lambda: scans.append(1) or files())
+    cache = ResponseCache(backend, ttls={"team": 60})
+    for i in range(11):
+        cache.store(("team", str(i)), b"[]", None, 60)
+    assert len(scans) == 1  # the initial count only
+    cache.store(("team", "11"), b"[]", None, 60)
+    assert len(scans) == 2 and len(files()) == 10
+
+
+def test_writes_to_uncacheable_resources_leave_the_disk_cache_alone(tmp_path, monkeypatch):
+    backend = DiskCacheBackend(str(tmp_path), max_entries=10)
+    cache = ResponseCache(backend, ttls={"team": 60, "environment": 60})
+    cache.store(("team", "a"), b"[]", None, 60)
+    cache.store(("environment", "a"), b"[]", None, 60)
+    deleted = []
+    delete_resource = backend.delete_resource
+    monkeypatch.setattr(backend, "delete_resource", lambda resource: deleted.append(resource) or delete_resource(resource))
+
+    cache.invalidate("execution/")
+    cache.invalidate("team/t1")
+
+    assert deleted == ["team"]
+    assert backend._count == 1 and cache.lookup(("environment", "a"))[0] is not None
+
+
+def test_failed_cache_writes_do_not_fail_the_request(tmp_path, monkeypatch):
+    session, http = _client(ResponseCache(DiskCacheBackend(str(tmp_path))))
+
+    def full_disk(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr("angles_python_client.cache.tempfile.mkstemp", full_disk)
+    assert TeamRequests(http).get_teams() == [{"_id": "t1", "name": "one"}]
+
+
+def test_304_without_a_conditional_request_is_an_error():
+    class Session:
+        def request(self, method, url, **kwargs):
+            return FakeResponse(304)
+
+    client = AnglesHttpClient(base_url="http://angles.test/", session=Session())
+    with pytest.raises(AnglesApiError):
+        client.request("GET", "build/b1")
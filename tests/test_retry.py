@@ -0,0 +1,156 @@
+import asyncio
+import json
+
+import pytest
+import requests
+
+from angles_python_client.async_http import AsyncAnglesHttpClient, AsyncTransport
+from angles_python_client.exceptions import AnglesApiError, AnglesCircuitOpenError
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.retry import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode() if payload is not None else b""
+        self.text = self.content.decode()
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+class ScriptedSession:
+    """Replays a list of responses/exceptions, one per call."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(method)
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _client(script, **kwargs):
+    delays = []
+    policy = RetryPolicy(max_attempts=3, sleep=delays.append, **kwargs)
+    session = ScriptedSession(script)
+    return AnglesHttpClient(session=session, retry_policy=policy), session, delays
+
+
+def test_get_is_retried_on_5xx_and_honours_retry_after():
+    client, session, delays = _client([
+        FakeResponse(503, headers={"Retry-After": "2"}),
+        FakeResponse(502),
+        FakeResponse(200, {"ok": True}),
+    ])
+    assert client.request("GET", "team").json() == {"ok": True}
+    assert len(session.calls) == 3
+    assert delays[0] == 2.0
+    assert 0 <= delays[1] <= 1.0
+
+
+def test_post_is_not_retried_after_the_server_may_have_processed_it():
+    client, session, _ = _client([FakeResponse(502), FakeResponse(200, {})])
+    with pytest.raises(AnglesApiError) as excinfo:
+        client.request("POST", "execution/", json={})
+    assert excinfo.value.status_code == 502
+    assert len(session.calls) == 1
+
+    client, session, _ = _client([requests.exceptions.ReadTimeout("slow"), FakeResponse(200, {})])
+    with pytest.raises(AnglesApiError):
+        client.request("POST", "execution/", json={})
+    assert len(session.calls) == 1
+
+
+def test_post_is_retried_when_it_never_reached_the_server():
+    client, session, _ = _client([
+        requests.exceptions.ConnectTimeout("connect"),
+        FakeResponse(429),
+        FakeResponse(201, {"_id": "e1"}),
+    ])
+    assert client.request("POST", "execution/", json={}).json() == {"_id": "e1"}
+    assert len(session.calls) == 3
+
+
+def test_idempotency_key_makes_post_retryable():
+    client, session, _ = _client([FakeResponse(504), FakeResponse(200, {})])
+    client.request("POST", "execution/", json={}, headers={"Idempotency-Key": "abc"})
+    assert len(session.calls) == 2
+
+
+def test_circuit_breaker_fast_fails_then_probes():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=10, clock=lambda: now[0])
+    session = ScriptedSession([FakeResponse(500), FakeResponse(500), FakeResponse(200, {})])
+    client = AnglesHttpClient(session=session, circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(AnglesApiError):
+            client.request("GET", "team")
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(AnglesCircuitOpenError):
+        client.request("GET", "team")
+    assert len(session.calls) == 2
+
+    now[0] = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    client.request("GET", "team")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_half_open_probe_lets_the_next_request_probe():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=10, clock=lambda: now[0])
+    responses = [FakeResponse(500), None, FakeResponse(200, {})]
+
+    class Transport(AsyncTransport):
+        async def send(self, method, url, **kwargs):
+            response = responses.pop(0)
+            if response is None:
+                await asyncio.sleep(10)
+            return response
+
+    async def run():
+        client = AsyncAnglesHttpClient(transport=Transport(), circuit_breaker=breaker)
+        with pytest.raises(AnglesApiError):
+            await client.request("GET", "team")
+        now[0] = 10
+        probe = asyncio.ensure_future(client.request("GET", "team"))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        await client.request("GET", "team")
+
+    asyncio.run(run())
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_failing_outside_the_transport_is_released():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=10, clock=lambda: now[0])
+    session = ScriptedSession([FakeResponse(500), ValueError("bad body"), FakeResponse(200, {})])
+    client = AnglesHttpClient(session=session, circuit_breaker=breaker)
+
+    with pytest.raises(AnglesApiError):
+        client.request("GET", "team")
+    now[0] = 10
+    with pytest.raises(ValueError):
+        client.request("GET", "team")
+    client.request("GET", "team")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("garbage") is None
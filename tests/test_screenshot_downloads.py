@@ -0,0 +1,129 @@
+import asyncio
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from angles_python_client.async_http import AsyncAnglesHttpClient, ThreadedTransport
+from angles_python_client.async_requests import AsyncScreenshotRequests
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.requests import ScreenshotRequests
+
+IMAGE = bytes(range(256)) * 4000
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+    truncate_first = False
+    honour_range = True
+
+    def do_GET(self):
+        cls = type(self)
+        cls.requests_seen.append((self.path, self.headers.get("Range")))
+        start = 0
+        match = re.match(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        if match and cls.honour_range:
+            start = int(match.group(1))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(IMAGE) - 1}/{len(IMAGE)}")
+        else:
+            self.send_response(200)
+        body = IMAGE[start:]
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if cls.truncate_first:
+            cls.truncate_first = False
+            self.wfile.write(body[: len(body) // 3])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _ImageHandler.requests_seen = []
+    _ImageHandler.truncate_first = False
+    _ImageHandler.honour_range = True
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_port}/"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_iter_screenshot_image_streams_in_chunks(server):
+    shots = ScreenshotRequests(AnglesHttpClient(base_url=server))
+    chunks = list(shots.iter_screenshot_image("s1", chunk_size=8192))
+    assert b"".join(chunks) == IMAGE
+    assert max(len(c) for c in chunks) <= 8192
+
+
+def test_download_resumes_after_a_dropped_connection(server, tmp_path):
+    _ImageHandler.truncate_first = True
+    shots = ScreenshotRequests(AnglesHttpClient(base_url=server))
+
+    path = shots.download_screenshot_image("s1", str(tmp_path))
+
+    assert path == str(tmp_path / "s1.png")
+    assert (tmp_path / "s1.png").read_bytes() == IMAGE
+    assert _ImageHandler.requests_seen[0][1] is None
+    assert _ImageHandler.requests_seen[1][1].startswith("bytes=")
+    assert not (tmp_path / "s1.png.part").exists()
+
+
+def test_resume_from_partial_file_when_server_ignores_range(server, tmp_path):
+    _ImageHandler.honour_range = False
+    (tmp_path / "s1.png.part").write_bytes(IMAGE[:1000])
+    shots = ScreenshotRequests(AnglesHttpClient(base_url=server))
+
+    shots.download_screenshot_image("s1", str(tmp_path / "s1.png"))
+
+    assert (tmp_path / "s1.png").read_bytes() == IMAGE
+
+
+def test_download_screenshots_in_bulk(server, tmp_path):
+    shots = ScreenshotRequests(AnglesHttpClient(base_url=server))
+    results = list(shots.download_screenshots([f"s{i}" for i in range(6)], str(tmp_path / "out"), max_workers=3))
+
+    assert all(r.ok for r in results)
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [f"s{i}.png" for i in range(6)]
+    list(shots.download_screenshots(["s0"], str(tmp_path / "out")))
+    assert len(_ImageHandler.requests_seen) == 6
+
+
+def _async_shots(base_url):
+    return AsyncScreenshotRequests(AsyncAnglesHttpClient(base_url=base_url, transport=ThreadedTransport()))
+
+
+def test_async_iter_screenshot_image_streams_in_chunks(server):
+    async def main():
+        return [chunk async for chunk in _async_shots(server).iter_screenshot_image("s1", chunk_size=8192)]
+
+    chunks = asyncio.run(main())
+    assert b"".join(chunks) == IMAGE
+    assert max(len(c) for c in chunks) <= 8192
+
+
+def test_async_download_resumes_and_exports_in_bulk(server, tmp_path):
+    _ImageHandler.truncate_first = True
+    shots = _async_shots(server)
+
+    async def main():
+        path = await shots.download_screenshot_image("s1", str(tmp_path))
+        results = [r async for r in shots.download_screenshots(["s1", "s2", "s3"], str(tmp_path), max_workers=2)]
+        return path, results
+
+    path, results = asyncio.run(main())
+    assert path == str(tmp_path / "s1.png")
+    assert all(r.ok for r in results) and sorted(r.item for r in results) == ["s1", "s2", "s3"]
+    assert (tmp_path / "s1.png").read_bytes() == (tmp_path / "s3.png").read_bytes() == IMAGE
+    assert _ImageHandler.requests_seen[1][1].startswith("bytes=")
+    assert len(_ImageHandler.requests_seen) == 4  # s1 again is skipped
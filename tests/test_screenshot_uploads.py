@@ -0,0 +1,104 @@
+import asyncio
+import email.parser
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from angles_python_client._multipart import MultipartFileEncoder
+from angles_python_client.async_http import AsyncAnglesHttpClient, ThreadedTransport
+from angles_python_client.async_requests import AsyncScreenshotRequests
+from angles_python_client.http import AnglesHttpClient
+from angles_python_client.models.requests import StoreScreenshot
+from angles_python_client.requests import ScreenshotRequests
+
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    uploads = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        message = email.parser.BytesParser().parsebytes(
+            b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body
+        )
+        parts = {p.get_param("name", header="content-disposition"): p for p in message.get_payload()}
+        self.uploads.append(parts)
+        payload = json.dumps({"_id": parts["view"].get_payload()}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _UploadHandler.uploads = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _UploadHandler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_port}/"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_encoder_length_matches_body(tmp_path):
+    image = tmp_path / "shot.png"
+    image.write_bytes(b"\x89PNG" + bytes(range(256)) * 1000)
+    encoder = MultipartFileEncoder({"view": "home", "buildId": "b"}, "screenshot", str(image))
+
+    chunks = []
+    while True:
+        chunk = encoder.read(4096)
+        if not chunk:
+            break
+        assert len(chunk) <= 4096
+        chunks.append(chunk)
+    assert len(b"".join(chunks)) == len(encoder)
+
+    encoder.seek(0)
+    assert encoder.read() == b"".join(chunks)
+    encoder.close()
+
+
+def test_save_screenshots_streams_every_file(server, tmp_path):
+    stores = []
+    for i in range(6):
+        path = tmp_path / f"shot-{i}.png"
+        path.write_bytes(bytes([i]) * (50_000 + i))
+        stores.append(StoreScreenshot(buildId="b1", view=f"view-{i}", timestamp="2024-01-01T00:00:00", filePath=str(path), tags=["t"]))
+
+    requests = ScreenshotRequests(AnglesHttpClient(base_url=server))
+    results = list(requests.save_screenshots(stores, max_workers=3))
+
+    assert sorted(r.index for r in results) == list(range(6))
+    assert all(r.ok and r.result == {"_id": f"view-{r.index}"} for r in results)
+    by_view = {parts["view"].get_payload(): parts for parts in _UploadHandler.uploads}
+    shot = by_view["view-2"]["screenshot"]
+    assert shot.get_filename() == "shot-2.png"
+    assert shot.get_content_type() == "image/png"
+    assert shot.get_payload(decode=True) == bytes([2]) * 50_002
+    assert by_view["view-2"]["tags"].get_payload() == '["t"]'
+
+
+def test_async_save_screenshot_streams_the_file(server, tmp_path, monkeypatch):
+    path = tmp_path / "shot.png"
+    path.write_bytes(b"\x89PNG" + bytes(range(256)) * 400)
+    store = StoreScreenshot(buildId="b1", view="home", timestamp="2024-01-01T00:00:00", filePath=str(path))
+    bodies = []
+    request = ThreadedTransport.send
+
+    async def send(self, method, url, **kwargs):
+        bodies.append((kwargs["data"], kwargs["files"]))
+        return await request(self, method, url, **kwargs)
+
+    monkeypatch.setattr(ThreadedTransport, "send", send)
+    shots = AsyncScreenshotRequests(AsyncAnglesHttpClient(base_url=server, transport=ThreadedTransport()))
+
+    assert asyncio.run(shots.save_screenshot(store)) == {"_id": "home"}
+    assert isinstance(bodies[0][0], MultipartFileEncoder) and bodies[0][1] is None
+    assert _UploadHandler.uploads[0]["screenshot"].get_payload(decode=True) == path.read_bytes()
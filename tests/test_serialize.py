@@ -0,0 +1,82 @@
+import datetime as dt
+
+from angles_python_client._serialize import json_bytes, jsonable
+from angles_python_client.models import Action, Platform, Step, StepStates
+from angles_python_client.models.requests import CreateExecution
+
+
+def test_nested_execution_drops_none_and_converts_values():
+    ts = dt.datetime(2024, 5, 1, 12, 30)
+    execution = CreateExecution(
+        title="t",
+        suite="s",
+        build="b",
+        actions=[Action(name="a", start=ts, steps=[Step(name="INFO", info="hi", status=StepStates.INFO, timestamp=ts)])],
+        platforms=[Platform(platformName="Android", screenWidth=1080)],
+        meta={"k": 1, "skip": None, 3: (1, 2)},
+    )
+
+    assert jsonable(execution) == {
+        "title": "t",
+        "suite": "s",
+        "build": "b",
+        "actions": [{"name": "a", "start": "2024-05-01T12:30:00", "steps": [
+            {"name": "INFO", "info": "hi", "status": "INFO", "timestamp": "2024-05-01T12:30:00"},
+        ]}],
+        "platforms": [{"platformName": "Android", "screenWidth": 1080}],
+        "meta": {"k": 1, "3": [1, 2]},
+    }
+    assert json_bytes(execution).startswith(b'{"title":"t"')
+
+
+def test_plain_objects_and_custom_hook():
+    class Plain:
+        def __init__(self):
+            self.a = 1
+            self.b = None
+
+    class Custom:
+        def __jsonable__(self):
+            return [StepStates.PASS]
+
+    assert jsonable(Plain()) == {"a": 1}
+    assert jsonable(Custom()) == ["PASS"]
+    assert jsonable(dt.date(2024, 1, 2)) == "2024-01-02"
+
+
+def _large_execution():
+    from angles_python_client.models import StepLog
+
+    steps = StepLog()
+    for i in range(2000):
+        steps.add("INFO", None, None, f"line {i} ✓", StepStates.INFO)
+    return CreateExecution(
+        title="big",
+        suite="s",
+        build="b",
+        actions=[Action(name="a", steps=steps), Action(name="b", steps=[Step(name="x", status=StepStates.PASS)])],
+        meta={"nested": {"list": [1, None, {"k": "v"}]}},
+    )
+
+
+def test_iter_json_matches_json_bytes_in_small_chunks():
+    from angles_python_client._serialize import iter_json
+
+    execution = _large_execution()
+    chunks = list(iter_json(execution, chunk_size=1024))
+
+    assert len(chunks) > 10
+    assert b"".join(chunks) == json_bytes(execution)
+
+
+def test_json_stream_gzip_round_trip():
+    import gzip
+    import json
+
+    from angles_python_client._serialize import JsonStream
+
+    execution = _large_execution()
+    stream = JsonStream(execution, compress="gzip")
+    first = gzip.decompress(b"".join(stream))
+    assert json.loads(first) == jsonable(execution)
+    assert gzip.decompress(b"".join(stream)) == first  # re-iterable for retries
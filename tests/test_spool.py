@@ -0,0 +1,134 @@
+import json
+import os
+
+from angles_python_client.reporter import AnglesReporter
+from angles_python_client.spool import Spool, SpoolReplayer, main, placeholder_id
+
+
+def test_pending_ack_and_compact(tmp_path):
+    spool = Spool(str(tmp_path), segment_max_bytes=1, fsync_every=1)
+    ids = [spool.append("execution", {"n": i}) for i in range(3)]
+    assert len(spool.segments()) == 3
+    assert [r.payload["n"] for r in spool.pending()] == [0, 1, 2]
+
+    spool.ack(ids[0], "exec-0")
+    spool.ack(ids[1], "exec-1")
+    assert [r.id for r in spool.pending()] == [ids[2]]
+    assert spool.acks()[ids[0]] == "exec-0"
+    # the segment still open for writing is closed and removed too once acknowledged
+    spool.ack(ids[2])
+    assert spool.compact() == 3
+    assert spool.segments() == [] and spool.acks() == {i: r for i, r in zip(ids, ["exec-0", "exec-1", None])}
+    later = spool.append("execution", {"n": 3})
+    assert [r.id for r in spool.pending()] == [later] and len(spool.segments()) == 1
+    spool.close()
+
+
+def test_replay_substitutes_screenshot_ids_and_keeps_failures(tmp_path):
+    spool = Spool(str(tmp_path))
+    shot = spool.append("screenshot", {"filePath": "a.png"})
+    broken = spool.append("screenshot", {"filePath": "b.png"})
+    spool.append("execution", {"steps": [{"screenshot": placeholder_id(shot)}]})
+    waiting = spool.append("execution", {"steps": [{"screenshot": placeholder_id(broken)}]})
+    spool.sync()
+
+    posted = []
+
+    def save_screenshot(payload):
+        if payload["filePath"] == "b.png":
+            raise ConnectionError("down")
+        return {"_id": "shot-1"}
+
+    handlers = {"screenshot": save_screenshot, "execution": lambda p: posted.append(p) or {"_id": "exec-1"}}
+    report = SpoolReplayer(spool, handlers).replay()
+
+    assert (report.uploaded, report.failed) == (2, 2)
+    assert posted == [{"steps": [{"screenshot": "shot-1"}]}]
+    assert {r.id for r in spool.pending()} == {broken, waiting}
+
+    # a second run uploads nothing twice
+    handlers["screenshot"] = lambda p: {"_id": "shot-2"}
+    report = SpoolReplayer(spool, handlers).replay()
+    assert (report.uploaded, report.failed) == (2, 0)
+    assert posted[1] == {"steps": [{"screenshot": "shot-2"}]}
+    assert list(spool.pending()) == []
+
+
+def test_reporter_spools_and_uploads_on_close(tmp_path):
+    reporter = AnglesReporter(base_url="http://angles.test/rest/api/v1.0/")
+    posted = []
+    reporter.screenshots.save_screenshot = lambda payload: {"_id": "shot-1"}
+    reporter.executions.save_execution = lambda payload: posted.append(payload) or {"_id": "exec-1"}
+    reporter.enable_spool(str(tmp_path / "spool"), interval_s=60)
+    reporter.set_current_build("build-1")
+
+    reporter.start_test("t", "s")
+    shot = reporter.save_screenshot(str(tmp_path / "a.png"), view="home")
+    assert shot["spooled"] and shot["_id"].startswith("spool:")
+    reporter.info_with_screenshot("look", shot["_id"])
+    reporter.save_test()
+
+    assert reporter.close()
+    assert posted[0]["actions"][0]["steps"][0]["screenshot"] == "shot-1"
+
+
+def test_cli_status_counts_pending(tmp_path, capsys):
+    spool = Spool(str(tmp_path))
+    spool.append("execution", {})
+    spool.append("screenshot", {})
+    spool.close()
+
+    assert main(["status", str(tmp_path)]) == 0
+    assert json.loads(capsys.readouterr().out) == {"execution": 1, "screenshot": 1}
+
+
+def test_spooled_screenshot_paths_are_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reporter = AnglesReporter(base_url="http://angles.test/rest/api/v1.0/")
+    reporter.enable_spool(str(tmp_path / "spool"), upload=False)
+    reporter.set_current_build("build-1")
+
+    reporter.save_screenshot("shots/a.png", view="home")
+
+    reporter.spool.sync()
+    (record,) = reporter.spool.pending()
+    assert record.payload["filePath"] == str(tmp_path / "shots" / "a.png")
+    reporter.close()
+
+
+def test_replays_only_read_what_was_appended_since(tmp_path, monkeypatch):
+    from angles_python_client import spool as spool_module
+
+    spool = Spool(str(tmp_path), fsync_every=1)
+    for i in range(50):
+        spool.ack(spool.append("execution", {"n": i}), f"exec-{i}")
+    assert list(spool.pending()) == []
+    parsed = []
+    read_new = spool_module._read_new
+    monkeypatch.setattr(spool_module, "_read_new", lambda path, offset: parsed.extend(read_new(path, offset)[0]) or read_new(path, offset))
+
+    spool.append("execution", {"n": 50})
+    assert [r.payload["n"] for r in spool.pending()] == [50]
+    assert [entry["payload"]["n"] for entry in parsed] == [50]
+    spool.close()
+
+
+def test_compact_prunes_acks_but_keeps_referenced_screenshots(tmp_path):
+    first = Spool(str(tmp_path), segment_max_bytes=1, fsync_every=1)
+    shot = first.append("screenshot", {"filePath": "/a.png"})
+    done = first.append("execution", {"title": "done"})
+    first.append("execution", {"steps": [{"screenshot": placeholder_id(shot)}]})
+    first.ack(shot, "shot-1")
+    first.ack(done, "exec-1")
+    first.close()
+
+    second = Spool(str(tmp_path))  # e.g. the next run
+    assert second.compact() == 2
+    assert second.acks() == {shot: "shot-1"}
+    with open(os.path.join(str(tmp_path), "acks.log"), encoding="utf-8") as f:
+        assert [json.loads(line)["id"] for line in f] == [shot]
+
+    uploads = []
+    report = SpoolReplayer(second, {"execution": uploads.append}).replay()
+    assert report.uploaded == 1 and uploads == [{"steps": [{"screenshot": "shot-1"}]}]
+    assert second.segments() == [] and second.acks() == {}  # nothing left to refer to
@@ -0,0 +1,47 @@
+import datetime as dt
+
+from angles_python_client._serialize import jsonable
+from angles_python_client.models import Step, StepLog, StepStates
+from angles_python_client.reporter import AnglesReporter
+
+
+def test_reporter_steps_keep_their_public_shape():
+    reporter = AnglesReporter()
+    reporter.set_current_build("b")
+    reporter.start_test("t", "s")
+    reporter.info("one")
+    reporter.pass_step("check", expected="1", actual="1", info="ok")
+    reporter.error_with_screenshot("bad", "shot-1")
+
+    steps = reporter.current_action.steps
+    assert isinstance(steps, StepLog)
+    assert len(steps) == 3
+    assert steps[1].name == "check" and steps[1].status is StepStates.PASS
+    assert steps[-1].screenshot == "shot-1"
+    assert steps[0].timestamp <= steps[1].timestamp <= steps[2].timestamp <= dt.datetime.now() + dt.timedelta(seconds=1)
+
+    encoded = jsonable(reporter.current_execution)["actions"][0]["steps"]
+    assert encoded == jsonable(list(steps))
+    assert encoded[0] == {"name": "INFO", "info": "one", "status": "INFO", "timestamp": steps[0].timestamp.isoformat()}
+
+
+def test_append_round_trips_steps():
+    ts = dt.datetime(2024, 1, 1, 8, 0, 0, 123456)
+    aware = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    original = [
+        Step(name="A", status=StepStates.FAIL, timestamp=ts, expected="x", actual="y"),
+        Step(name="B", status="CUSTOM", timestamp=aware),
+        Step(name="C"),
+    ]
+    log = StepLog(original)
+
+    assert log == original
+    assert log[0:2] == original[0:2]
+    assert jsonable(log) == jsonable(original)
+
+
+def test_more_than_256_distinct_statuses():
+    log = StepLog()
+    for i in range(300):
+        log.add("custom", None, None, None, f"STATUS-{i}")
+    assert log[299].status == "STATUS-299"
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+from angles_python_client.exceptions import AnglesUploadDroppedError
+from angles_python_client.reporter import AnglesReporter
+from angles_python_client.upload_queue import Backpressure, UploadQueue
+
+
+def test_flush_waits_for_all_uploads():
+    seen = []
+    queue = UploadQueue({"execution": seen.append}, workers=3)
+    futures = [queue.submit("execution", {"n": i}) for i in range(20)]
+
+    assert queue.flush(timeout=5)
+    assert all(f.done() for f in futures)
+    assert sorted(p["n"] for p in seen) == list(range(20))
+    assert queue.close(timeout=5)
+
+
+def test_drop_oldest_fails_the_dropped_future():
+    gate = threading.Event()
+    queue = UploadQueue({"x": lambda p: gate.wait(5) and p}, max_size=1, workers=1, backpressure=Backpressure.DROP_OLDEST)
+    first = queue.submit("x", 1)  # picked up by the worker and blocked on the gate
+    while len(queue):
+        time.sleep(0.001)
+    second = queue.submit("x", 2)
+    third = queue.submit("x", 3)
+    gate.set()
+    queue.close(timeout=5)
+
+    assert first.result() == 1
+    with pytest.raises(AnglesUploadDroppedError):
+        second.result()
+    assert third.result() == 3
+
+
+def test_spill_to_disk_preserves_every_submission(tmp_path):
+    gate = threading.Event()
+    seen = []
+
+    def handler(payload):
+        gate.wait(5)
+        seen.append(payload["n"])
+
+    queue = UploadQueue({"x": handler}, max_size=2, workers=1, backpressure=Backpressure.SPILL, spill_dir=str(tmp_path))
+    futures = [queue.submit("x", {"n": i}) for i in range(10)]
+    assert any(p.suffix == ".json" for p in tmp_path.iterdir())
+    gate.set()
+
+    assert queue.close(timeout=5)
+    assert all(f.exception() is None for f in futures)
+    assert sorted(seen) == list(range(10))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spill_keeps_pending_screenshot_futures(tmp_path):
+    gate = threading.Event()
+    posted = []
+
+    def screenshot(payload):
+        gate.wait(5)
+        return {"_id": "shot-1"}
+
+    queue = UploadQueue(
+        {"screenshot": screenshot, "execution": posted.append},
+        max_size=1,
+        workers=1,
+        backpressure=Backpressure.SPILL,
+        spill_dir=str(tmp_path / "spill"),
+    )
+    shot = queue.submit("screenshot", {"view": "home"})
+    queue.submit("screenshot", {"view": "cart"})  # fills the queue
+    done = threading.Event()
+    threading.Thread(target=lambda: queue.submit("execution", {"steps": [{"screenshot": shot}]}) and done.set()).start()
+    assert done.wait(2), "submit blocked on the pending screenshot"
+    gate.set()
+
+    assert queue.close(timeout=5)
+    assert posted == [{"steps": [{"screenshot": "shot-1"}]}]
+
+
+def test_reporter_background_mode_resolves_screenshot_futures(tmp_path):
+    reporter = AnglesReporter(base_url="http://angles.test/rest/api/v1.0/")
+    posted = []
+    reporter.screenshots.save_screenshot = lambda payload: {"_id": "shot-1"}
+    reporter.executions.save_execution = lambda payload: posted.append(payload) or {"_id": "exec-1"}
+    reporter.enable_background_uploads(workers=1)
+    reporter.set_current_build("build-1")
+
+    reporter.start_test("t", "s")
+    shot = reporter.save_screenshot(str(tmp_path / "a.png"), view="home")
+    reporter.info_with_screenshot("look", shot)
+    saved = reporter.save_test()
+
+    assert saved.result(timeout=5) == {"_id": "exec-1"}
+    assert posted[0]["actions"][0]["steps"][0]["screenshot"] == "shot-1"
+    assert reporter.close(timeout=5)